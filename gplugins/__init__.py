@@ -3,9 +3,9 @@
 __version__ = "1.3.4"
 
 import pathlib
+from typing import TYPE_CHECKING
 
-from gplugins.common.utils import plot, port_symmetries
-from gplugins.common.utils.get_effective_indices import get_effective_indices
+from gplugins.common.utils.lazy import attach
 
 home = pathlib.Path.home()
 cwd = pathlib.Path.cwd()
@@ -21,3 +21,17 @@ class Paths:
 PATH = Paths()
 
 __all__ = ["get_effective_indices", "plot", "port_symmetries"]
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        "get_effective_indices": "gplugins.common.utils.get_effective_indices:get_effective_indices",
+        "plot": "gplugins.common.utils.plot",
+        "port_symmetries": "gplugins.common.utils.port_symmetries",
+    },
+    exports=__all__,
+)
+
+if TYPE_CHECKING:
+    from gplugins.common.utils import plot, port_symmetries
+    from gplugins.common.utils.get_effective_indices import get_effective_indices
@@ -1,28 +1,197 @@
+import contextlib
+import functools
+import hashlib
 import os
+import pathlib
 import pickle
-from collections.abc import Callable
+import tempfile
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
 from typing import Any
 
+try:
+    import fcntl
+except ModuleNotFoundError:  # Windows
+    fcntl = None
 
-def disk_memoize(filename: str, overwrite: bool = False) -> Callable:
-    # Check if cache file exists and load it, otherwise start with an empty cache
-    if os.path.exists(filename):
-        with open(filename, "rb") as f:
-            cache: dict[tuple[Any] | frozenset[tuple[str, Any]], Any] = pickle.load(f)
-    else:
-        cache = {}
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class DiskCache:
+    """Sharded on-disk cache with one pickle file per key.
+
+    Writes are atomic (temp file + rename) and guarded by a cross-process file
+    lock, so several workers can share the same cache directory. The total size
+    of the entries is kept in a `.nbytes` file updated under the lock, so a
+    write does not scan the cache. When `max_bytes` is set and a write takes
+    the total over it, least recently used entries are evicted.
+
+    Args:
+        dirpath: cache directory.
+        max_bytes: maximum total size of the cache in bytes. None for unbounded.
+    """
+
+    def __init__(self, dirpath: str | pathlib.Path, max_bytes: int | None = None):
+        """Initializes the cache directory."""
+        self.dirpath = pathlib.Path(dirpath)
+        self.dirpath.mkdir(exist_ok=True, parents=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(*args: Any, **kwargs: Any) -> str:
+        """Returns a hash for the function arguments."""
+        data = pickle.dumps((args, sorted(kwargs.items())), pickle.HIGHEST_PROTOCOL)
+        return hashlib.sha256(data).hexdigest()
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.dirpath / key[:2] / f"{key}.pkl"
+
+    def _read_nbytes(self) -> int:
+        """Returns the tracked total size, scanning the entries if it is missing.
+
+        Call with the lock held.
+        """
+        try:
+            return int((self.dirpath / ".nbytes").read_text())
+        except (FileNotFoundError, ValueError):
+            return self.nbytes()
+
+    def _write_nbytes(self, total: int) -> None:
+        """Stores the tracked total size. Call with the lock held."""
+        (self.dirpath / ".nbytes").write_text(str(max(total, 0)))
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """Holds a thread lock and an exclusive cross-process lock on the cache."""
+        with self._lock, open(self.dirpath / ".lock", "a+b") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def __contains__(self, key: str) -> bool:
+        """Returns True if key is cached."""
+        return self._path(key).exists()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Returns the cached value for key or default."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)  # mark as recently used
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Atomically writes value for key and evicts entries if needed."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+            with self.lock():
+                total = self._read_nbytes()
+                with contextlib.suppress(FileNotFoundError):
+                    total -= path.stat().st_size
+                os.replace(tmp, path)
+                total += path.stat().st_size
+                if self.max_bytes is not None and total > self.max_bytes:
+                    total = self._evict(self.max_bytes)
+                self._write_nbytes(total)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(tmp)
+            raise
+
+    def nbytes(self) -> int:
+        """Returns the total size of cached entries in bytes, scanning the cache."""
+        return sum(path.stat().st_size for path in self.dirpath.glob("*/*.pkl"))
+
+    def evict(self, max_bytes: int) -> int:
+        """Deletes least recently used entries until the cache fits in max_bytes.
+
+        Returns the number of evicted entries.
+        """
+        evictions = self.stats.evictions
+        with self.lock():
+            self._write_nbytes(self._evict(max_bytes))
+        return self.stats.evictions - evictions
+
+    def _evict(self, max_bytes: int) -> int:
+        """Evicts entries and returns the remaining size. Call with the lock held."""
+        entries = []
+        for path in self.dirpath.glob("*/*.pkl"):
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+        self.stats.evictions += evicted
+        return total
+
+    def clear(self) -> None:
+        """Deletes all entries."""
+        with self.lock():
+            for path in self.dirpath.glob("*/*.pkl"):
+                path.unlink(missing_ok=True)
+            self._write_nbytes(0)
+
+
+def disk_memoize(
+    dirpath: str | pathlib.Path,
+    overwrite: bool = False,
+    max_bytes: int | None = None,
+) -> Callable:
+    """Memoizes a function on disk, storing one file per set of arguments.
+
+    Safe to share across a process pool. The wrapped function exposes the
+    underlying `cache` and its hit/miss counters as `cache.stats`.
+
+    Args:
+        dirpath: cache directory.
+        overwrite: recompute and overwrite cached values.
+        max_bytes: maximum cache size in bytes, evicting least recently used entries.
+    """
+    cache = DiskCache(dirpath, max_bytes=max_bytes)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
         def memoized_function(*args: Any, **kwargs: Any) -> Any:
-            key = (args, frozenset(kwargs.items()))
-            if key not in cache or overwrite:
-                result = func(*args, **kwargs)
-                cache[key] = result
-                with open(filename, "wb") as f:
-                    pickle.dump(cache, f)
-                return result
-            return cache[key]
+            key = cache.get_key(func.__module__, func.__qualname__, *args, **kwargs)
+            if not overwrite:
+                missing = object()
+                result = cache.get(key, default=missing)
+                if result is not missing:
+                    cache.stats.hits += 1
+                    return result
+            cache.stats.misses += 1
+            result = func(*args, **kwargs)
+            cache.set(key, result)
+            return result
 
+        memoized_function.cache = cache
         return memoized_function
 
     return decorator
@@ -31,9 +200,11 @@ def disk_memoize(filename: str, overwrite: bool = False) -> Callable:
 if __name__ == "__main__":
     import numpy as np
 
-    @disk_memoize("fibonacci_cache3.pkl")
+    @disk_memoize("fibonacci_cache3", max_bytes=2**20)
     def fibonacci(n, version="v1"):
         print(f"computing fibonacci({n})")
         return np.arange(n) if version == "v1" else np.arange(n) ** 2
 
     print(fibonacci(4))
+    print(fibonacci(4))
+    print(fibonacci.cache.stats)
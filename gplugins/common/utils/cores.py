@@ -0,0 +1,31 @@
+"""Core pinning for process pool workers."""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+
+def pin_pool_worker(counter: Any, cores_per_worker: int) -> None:
+    """Pins the calling pool worker to its own cores_per_worker cores.
+
+    Use as pool initializer with a shared `multiprocessing.Value("i", 0)`
+    counter, which gives each worker a slot. Workers beyond the number of
+    available cores wrap around. Also sets OMP_NUM_THREADS for solvers that
+    read it.
+
+    Args:
+        counter: shared integer, incremented by each worker.
+        cores_per_worker: number of cores for each worker.
+    """
+    with counter.get_lock():
+        slot = counter.value
+        counter.value += 1
+    os.environ["OMP_NUM_THREADS"] = str(cores_per_worker)
+    if hasattr(os, "sched_setaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+        cores = {
+            cpus[(slot * cores_per_worker + i) % len(cpus)]
+            for i in range(cores_per_worker)
+        }
+        os.sched_setaffinity(0, cores)
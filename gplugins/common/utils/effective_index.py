@@ -0,0 +1,221 @@
+"""Effective index (2.5D) reduction of a component and its layer stack.
+
+The component is split into in-plane regions with the same vertical profile
+(set of layer stack levels). Each region is replaced by a slab with the
+effective index of the fundamental mode of its vertical profile, so a 2D
+simulation of the reduced component approximates the 3D one.
+
+The reduction is solved at a single wavelength, so the slab indices are not
+dispersive, and for one slab polarization: "te" (E parallel to the film)
+matches 2D simulations with in-plane E (Hz), "tm" matches out-of-plane E (Ez).
+
+.. code::
+
+    import gdsfactory as gf
+    from gdsfactory.pdk import get_layer_stack
+    from gplugins.common.utils.effective_index import get_effective_index_component
+
+    c, layer_stack, neffs = get_effective_index_component(
+        gf.components.straight(cross_section="rib"),
+        layer_stack=get_layer_stack(),
+        get_index=lambda name, wavelength: {"si": 3.47, "sio2": 1.44}[name],
+        wavelength=1.55,
+    )
+    neffs  # {'core': 2.84..., 'slab90': 2.09...}
+
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable
+from typing import Literal
+
+import gdsfactory as gf
+import numpy as np
+from gdsfactory.technology import LayerLevel, LayerStack
+from kfactory import kdb
+
+from gplugins.common.utils.get_effective_indices import get_effective_indices
+
+effective_index_layer = 1000
+
+
+@functools.cache
+def get_slab_effective_index(
+    core_material: float,
+    nsubstrate: float,
+    clad_materialding: float,
+    thickness: float,
+    wavelength: float,
+    polarization: Literal["te", "tm"] = "te",
+    mode: int = 0,
+) -> float:
+    """Returns the effective index of a slab mode, or the highest cladding index below cutoff.
+
+    Cached, as the same slabs are solved for every region and sweep point.
+
+    Args:
+        core_material: Refractive index of the core material.
+        nsubstrate: Refractive index of the substrate.
+        clad_materialding: Refractive index of the cladding.
+        thickness: Thickness of the film in um.
+        wavelength: Wavelength in um.
+        polarization: Either "te" or "tm".
+        mode: mode number, 0 for the fundamental mode.
+    """
+    neffs = sorted(
+        get_effective_indices(
+            core_material=core_material,
+            nsubstrate=nsubstrate,
+            clad_materialding=clad_materialding,
+            thickness=thickness,
+            wavelength=wavelength,
+            polarization=polarization,
+        ),
+        reverse=True,
+    )
+    return neffs[mode] if mode < len(neffs) else max(nsubstrate, clad_materialding)
+
+
+def get_effective_index_component(
+    component: gf.Component,
+    layer_stack: LayerStack,
+    get_index: Callable[[str, float], float],
+    wavelength: float,
+    clad_material: str = "sio2",
+    substrate_material: str | None = None,
+    polarization: Literal["te", "tm"] = "te",
+    mode: int = 0,
+) -> tuple[gf.Component, LayerStack, dict[str, float]]:
+    """Returns the effective index reduction of a component.
+
+    Only layer stack levels with a higher index than the cladding and substrate
+    are considered. The vertical profile of each region is approximated by a
+    film of its highest index material, as thick as the z extent of the levels
+    of that material, between the substrate and the cladding.
+
+    Regions are drawn on layers `(effective_index_layer + i, 0)`, one level
+    each in the returned layer stack, named after the level that sets the
+    film top (so the waveguide core keeps its name) with material
+    `neff_<name>`. The returned levels share zmin and thickness, so any z
+    cut through them is a 2D simulation plane. The component bounding box is
+    kept on `(effective_index_layer, 0)`, which has no level. Ports are moved
+    to the layer of the region at their center.
+
+    Args:
+        component: to reduce.
+        layer_stack: to reduce.
+        get_index: returns the refractive index of a material name at a wavelength (um).
+        wavelength: to solve the slab modes at (um).
+        clad_material: above the film.
+        substrate_material: below the film. Defaults to clad_material.
+        polarization: of the slab modes, "te" for E parallel to the film.
+        mode: slab mode number.
+
+    Returns:
+        component, layer_stack and the effective index of each level.
+    """
+    substrate_material = substrate_material or clad_material
+    nsubstrate = get_index(substrate_material, wavelength)
+    nclad = get_index(clad_material, wavelength)
+    nbackground = max(nclad, nsubstrate)
+
+    levels = {}
+    for name, level in layer_stack.layers.items():
+        if not level.material or level.thickness is None or level.zmin is None:
+            continue
+        region = level.layer.get_shapes(component)
+        if region.is_empty():
+            continue
+        index = get_index(level.material, wavelength)
+        if index > nbackground:
+            levels[name] = (region.merged(), index)
+
+    # split the component into regions with the same set of levels
+    profiles: list[tuple[kdb.Region, frozenset[str]]] = []
+    for name, (region, _) in levels.items():
+        covered = kdb.Region()
+        split = []
+        for profile_region, names in profiles:
+            covered += profile_region
+            split.append((profile_region & region, names | {name}))
+            split.append((profile_region - region, names))
+        split.append((region - covered, frozenset({name})))
+        profiles = [(r, names) for r, names in split if not r.is_empty()]
+
+    films: dict[tuple[str, float], tuple[kdb.Region, str]] = {}
+    for region, names in profiles:
+        material_index = max(levels[name][1] for name in names)
+        core = [name for name in names if levels[name][1] == material_index]
+        thickness = 0.0
+        zmax = -np.inf
+        for z0, z1 in sorted(sorted(_zrange(layer_stack, name)) for name in core):
+            thickness += max(z1 - max(z0, zmax), 0)
+            zmax = max(zmax, z1)
+        top = max(core, key=lambda name: max(_zrange(layer_stack, name)))
+        key = (layer_stack.layers[top].material, round(thickness, 6))
+        if key in films:
+            films[key] = (films[key][0] + region, films[key][1])
+        else:
+            films[key] = (region, top)
+
+    if not films:
+        raise ValueError(
+            f"No layer of {component.name!r} has a higher index than the cladding "
+            "and substrate"
+        )
+
+    c = gf.Component()
+    background = c.kcl.layer(effective_index_layer, 0)
+    c.shapes(background).insert(component.bbox())
+
+    reduced_layers = {}
+    neffs = {}
+    film_thickness = max(thickness for _, thickness in films)
+    for i, ((material, thickness), (region, name)) in enumerate(films.items(), 1):
+        while name in reduced_layers:
+            name = f"{name}_{i}"
+        layer = (effective_index_layer + i, 0)
+        c.shapes(c.kcl.layer(*layer)).insert(region.merged())
+        reduced_layers[name] = LayerLevel(
+            layer=layer,
+            thickness=film_thickness,
+            zmin=0,
+            material=f"neff_{name}",
+            mesh_order=i,
+        )
+        neffs[name] = get_slab_effective_index(
+            core_material=get_index(material, wavelength),
+            nsubstrate=nsubstrate,
+            clad_materialding=nclad,
+            thickness=thickness,
+            wavelength=wavelength,
+            polarization=polarization,
+            mode=mode,
+        )
+
+    for port in component.ports:
+        x, y = port.center
+        point = kdb.Region(
+            kdb.DBox(x - 1e-3, y - 1e-3, x + 1e-3, y + 1e-3).to_itype(component.kcl.dbu)
+        )
+        layer = (effective_index_layer, 0)
+        for i, (region, _) in enumerate(films.values(), 1):
+            if not (region & point).is_empty():
+                layer = (effective_index_layer + i, 0)
+        c.add_port(
+            name=port.name,
+            center=port.center,
+            width=port.width,
+            orientation=port.orientation,
+            layer=layer,
+            port_type=port.port_type,
+        )
+    return c, LayerStack(layers=reduced_layers), neffs
+
+
+def _zrange(layer_stack: LayerStack, name: str) -> tuple[float, float]:
+    """Returns the (zmin, zmax) of a layer stack level."""
+    level = layer_stack.layers[name]
+    return level.zmin, level.zmin + level.thickness
@@ -6,7 +6,7 @@ from typing import Any, Literal, cast
 
 import numpy as np
 import numpy.typing as npt
-from scipy.optimize import fsolve
+from scipy.optimize import brentq
 
 
 def get_effective_indices(
@@ -81,25 +81,25 @@ def get_effective_indices(
     def objective(
         e_eff: npt.NDArray[np.floating[Any]],
     ) -> npt.NDArray[np.floating[Any]]:
-        return 1 / np.tan(k_f(e_eff) * thickness) - (
-            k_f(e_eff) ** 2 - k_s(e_eff) * k_c(e_eff)
-        ) / (k_f(e_eff) * (k_s(e_eff) + k_c(e_eff)))
+        # the phase across the film is not scaled by epsilon for TM
+        phase = k_0 * np.sqrt(epsilon_core - e_eff) * thickness
+        return 1 / np.tan(phase) - (k_f(e_eff) ** 2 - k_s(e_eff) * k_c(e_eff)) / (
+            k_f(e_eff) * (k_s(e_eff) + k_c(e_eff))
+        )
 
     # scan roughly for indices
     # use a by 1e-10 smaller search area to avoid division by zero
     x = np.linspace(
-        min(epsilon_substrate, epsilon_cladding) + 1e-10, epsilon_core - 1e-10, 1000
+        max(epsilon_substrate, epsilon_cladding) + 1e-10, epsilon_core - 1e-10, 1000
     )
-    indices_temp = x[np.abs(objective(x)) < 0.1]
-    if not len(indices_temp):
-        return []
-
-    # and then use fsolve to get exact indices
-    indices_temp = cast(npt.NDArray[np.floating[Any]], fsolve(objective, indices_temp))
+    y = objective(x)
 
+    # and then use brentq to get exact indices between samples of opposite sign
     indices: list[float] = []
-    for index in indices_temp:
-        if not any(np.isclose(index, i, atol=1e-5) for i in indices):
+    for i in np.flatnonzero(np.sign(y[:-1]) != np.sign(y[1:])):
+        index = brentq(objective, x[i], x[i + 1])
+        # the poles of the cotangent also change sign
+        if abs(objective(index)) < 1e-3:
             indices.append(index)
 
     return cast(list[float], np.sqrt(indices).tolist())
@@ -117,6 +117,19 @@ def test_effective_index() -> None:
     assert np.isclose(neff[0], 2.8494636999424405)
 
 
+def test_effective_index_tm() -> None:
+    neff = get_effective_indices(
+        core_material=3.4777,
+        clad_materialding=1.444,
+        nsubstrate=1.444,
+        thickness=0.22,
+        wavelength=1.55,
+        polarization="tm",
+    )
+    assert len(neff) == 1
+    assert 2.0 < neff[0] < 2.1
+
+
 if __name__ == "__main__":
     print(
         get_effective_indices(
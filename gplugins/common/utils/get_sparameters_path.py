@@ -11,6 +11,14 @@ from gdsfactory.config import GDSDIR_TEMP, PATH
 from gdsfactory.name import clean_value
 from gdsfactory.typings import ComponentSpec, PathType
 
+from gplugins.common.utils.result_store import (
+    ResultStore,
+    get_component_fingerprint,
+    get_result_key,
+)
+
+_stores: dict[str, ResultStore] = {}
+
 
 def get_kwargs_hash(**kwargs) -> str:
     """Returns kwargs parameters hash."""
@@ -20,10 +28,20 @@ def get_kwargs_hash(**kwargs) -> str:
 
 
 def get_component_hash(component: gf.Component) -> str:
-    gdspath = pathlib.Path(component.write_gds())
-    h = hashlib.md5(gdspath.read_bytes()).hexdigest()
-    gdspath.unlink()
-    return h
+    """Returns component geometry hash without writing a GDS to disk."""
+    return get_component_fingerprint(component)
+
+
+def get_sparameters_store(dirpath: PathType | None = PATH.sparameters) -> ResultStore:
+    """Returns the result store shared by all solvers writing to dirpath.
+
+    Args:
+        dirpath: store directory. Defaults to GDSDIR_TEMP / "sparameters".
+    """
+    dirpath = str(pathlib.Path(dirpath or GDSDIR_TEMP / "sparameters").absolute())
+    if dirpath not in _stores:
+        _stores[dirpath] = ResultStore(dirpath)
+    return _stores[dirpath]
 
 
 def _get_sparameters_path(
@@ -31,37 +49,70 @@ def _get_sparameters_path(
     dirpath: PathType | None = PATH.sparameters,
     **kwargs,
 ) -> Path:
-    """Return Sparameters npz filepath hashing simulation settings for \
-            a consistent unique name.
+    """Return Sparameters npz filepath in the result store of dirpath.
+
+    The path is the content address of the component geometry and simulation
+    settings, so any solver run with the same inputs finds the same file.
 
     Args:
         component: component or component factory.
-        dirpath: directory to store sparameters in CSV.
+        dirpath: result store directory.
             Defaults to active Pdk.sparameters_path.
         kwargs: simulation settings.
 
     """
-    dirpath = dirpath or GDSDIR_TEMP / "sparameters"
-    dirpath = pathlib.Path(dirpath)
     component = gf.get_component(component)
+    store = get_sparameters_store(dirpath)
+    return store.path(get_result_key(component, **kwargs))
 
-    dirpath = pathlib.Path(dirpath)
-    dirpath = (
-        dirpath / component.function_name
-        if hasattr(component, "function_name")
-        else dirpath
-    )
 
-    component_hash = get_component_hash(component)
-    kwargs_hash = get_kwargs_hash(**kwargs)
-    simulation_hash = hashlib.md5((component_hash + kwargs_hash).encode()).hexdigest()
+def load_sparameters(filepath: PathType) -> dict[str, np.ndarray] | None:
+    """Returns the Sparameters stored in filepath or None if missing.
 
-    dirpath.mkdir(exist_ok=True, parents=True)
-    return dirpath / f"{component.name}_{simulation_hash}.npz"
+    Paths in a result store are looked up in its manifest.
+
+    Args:
+        filepath: npz file.
+    """
+    store_key = ResultStore.from_path(filepath)
+    if store_key:
+        store, key = store_key
+        return store.get(key)
+    filepath = pathlib.Path(filepath)
+    return dict(np.load(filepath)) if filepath.exists() else None
+
+
+def save_sparameters(
+    filepath: PathType,
+    sp: dict[str, np.ndarray],
+    component: str | None = None,
+    tool: str | None = None,
+    **settings,
+) -> Path:
+    """Writes Sparameters to filepath and returns filepath.
+
+    Paths in a result store are written with :meth:`ResultStore.put`, so they
+    are registered in its manifest for lookup, listing and eviction.
+
+    Args:
+        filepath: npz file.
+        sp: Sparameters.
+        component: component name (informative only).
+        tool: solver name (informative only).
+        settings: simulation settings (informative only).
+    """
+    store_key = ResultStore.from_path(filepath)
+    if store_key:
+        store, key = store_key
+        return store.put(key, sp, component=component, tool=tool, **settings)
+    filepath = pathlib.Path(filepath)
+    filepath.parent.mkdir(exist_ok=True, parents=True)
+    np.savez_compressed(filepath, **sp)
+    return filepath
 
 
-def _get_sparameters_data(**kwargs) -> np.ndarray:
-    """Returns Sparameters data in a pandas DataFrame.
+def _get_sparameters_data(**kwargs) -> dict[str, np.ndarray]:
+    """Returns Sparameters data.
 
     Keyword Args:
         component: component.
@@ -70,7 +121,10 @@ def _get_sparameters_data(**kwargs) -> np.ndarray:
 
     """
     filepath = _get_sparameters_path(**kwargs)
-    return np.load(filepath)
+    sp = load_sparameters(filepath)
+    if sp is None:
+        raise FileNotFoundError(f"No Sparameters stored in {str(filepath)!r}")
+    return sp
 
 
 get_sparameters_path_meow = partial(_get_sparameters_path, tool="meow")
@@ -0,0 +1,91 @@
+"""Lazy attribute loading for packages (PEP 562)."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import types
+from collections.abc import Callable
+from typing import Any
+
+
+def attach(
+    package: str,
+    attrs: dict[str, str],
+    exports: list[str],
+    missing_messages: dict[str, str] | None = None,
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Returns `__getattr__` and `__dir__` for a lazily loaded package.
+
+    Attributes are only imported on first access and then cached in the
+    package namespace. `__all__` stays a literal list in the package, so
+    linters and type checkers see the re-exports, and is checked against attrs.
+    Functions keep their name when the submodule defining them, with the same
+    name, is imported directly.
+
+    Args:
+        package: package name, usually `__name__`.
+        attrs: maps attribute names to `"module"` for submodules or
+            `"module:attribute"` for objects defined in a module.
+        exports: the package `__all__`, the same names as attrs.
+        missing_messages: maps optional dependency names to the message raised
+            when they are not installed.
+
+    .. code::
+
+        __all__ = ["get_effective_indices", "plot"]
+
+        __getattr__, __dir__ = attach(
+            __name__,
+            {
+                "get_effective_indices": "gplugins.common.utils.get_effective_indices:get_effective_indices",
+                "plot": "gplugins.common.utils.plot",
+            },
+            exports=__all__,
+        )
+
+    """
+    if set(exports) != set(attrs):
+        raise ValueError(
+            f"{package}.__all__ does not match its lazy attributes: "
+            f"{sorted(set(exports) ^ set(attrs))}"
+        )
+
+    # importing a submodule binds it on its package, which would shadow the
+    # function of the same name, e.g. gplugins.gmeep.write_sparameters_meep
+    shadowed = {
+        name: target.partition(":")[2]
+        for name, target in attrs.items()
+        if target.startswith(f"{package}.{name}:")
+    }
+    if shadowed:
+
+        class LazyModule(types.ModuleType):
+            def __setattr__(self, name: str, value: Any) -> None:
+                if name in shadowed and isinstance(value, types.ModuleType):
+                    value = getattr(value, shadowed[name])
+                super().__setattr__(name, value)
+
+        sys.modules[package].__class__ = LazyModule
+
+    def __getattr__(name: str) -> Any:
+        if name not in attrs:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        module_name, _, attr = attrs[name].partition(":")
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            missing = (e.name or "").split(".")[0]
+            if missing_messages and missing in missing_messages:
+                raise ModuleNotFoundError(missing_messages[missing], name=e.name) from e
+            raise
+
+        value = getattr(module, attr) if attr else module
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(attrs))
+
+    return __getattr__, __dir__
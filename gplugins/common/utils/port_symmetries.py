@@ -1,3 +1,45 @@
+"""Port symmetries.
+
+`port_symmetries` establish equivalences between S-parameters, so only a
+subset of them need to be simulated. They map a computed S-parameter
+`"out@mode,in@mode"` to the S-parameters that are equal to it.
+
+They can be written by hand, as `port_symmetries_1x1` and
+`port_symmetries_crossing`, or detected from the component geometry with
+`get_symmetries`.
+
+.. code::
+
+    import gdsfactory as gf
+    from gplugins.common.utils.port_symmetries import get_symmetries
+
+    s = get_symmetries(gf.components.mmi1x2())
+    s.port_source_names  # ['o1', 'o2']
+    s.port_symmetries  # {'o1@0,o2@0': ['o1@0,o3@0'], ...}
+    s.get_mirrors(["o1"])  # ('y',)
+
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Sequence
+
+import gdsfactory as gf
+from gdsfactory.typings import PortSymmetries
+from kfactory import kdb
+
+transformations = {
+    "rotate90": kdb.Trans(1, False, 0, 0),
+    "rotate180": kdb.Trans(2, False, 0, 0),
+    "rotate270": kdb.Trans(3, False, 0, 0),
+    "mirror_x": kdb.Trans(2, True, 0, 0),
+    "mirror_y": kdb.Trans(0, True, 0, 0),
+    "mirror_diagonal": kdb.Trans(1, True, 0, 0),
+    "mirror_antidiagonal": kdb.Trans(3, True, 0, 0),
+}
+mirror_axes = {"mirror_x": "x", "mirror_y": "y"}
+
 port_symmetries_1x1 = {
     "o2@0,o1@0": ["o1@0,o2@0"],
 }
@@ -10,6 +52,196 @@ port_symmetries_crossing = {
 }
 
 
+@dataclasses.dataclass(frozen=True)
+class Symmetries:
+    """Geometric symmetries of a component.
+
+    Args:
+        center: (x, y) center of the symmetries in um.
+        port_maps: for each symmetry (see `transformations`), the port that
+            each port is mapped to.
+        port_source_names: smallest set of ports to excite.
+        port_symmetries: S-parameters equal to each S-parameter computed
+            from port_source_names.
+    """
+
+    center: tuple[float, float]
+    port_maps: dict[str, dict[str, str]]
+    port_source_names: list[str]
+    port_symmetries: PortSymmetries
+
+    def get_mirrors(self, port_names: Sequence[str]) -> tuple[str, ...]:
+        """Returns the axes ("x", "y") of the mirror planes through center that map each port to itself.
+
+        A simulation domain can be cut in half by each of these planes when
+        sources are only placed at port_names.
+
+        Args:
+            port_names: excited ports.
+        """
+        return tuple(
+            axis
+            for name, axis in mirror_axes.items()
+            if name in self.port_maps
+            and all(self.port_maps[name][port] == port for port in port_names)
+        )
+
+    def get_tidy3d_symmetry(self, port_names: Sequence[str]) -> tuple[int, int, int]:
+        """Returns the Tidy3D simulation symmetry for sources at port_names.
+
+        In-plane mirrors of the fundamental TE mode are odd (PEC).
+        The z symmetry is not detected and is always 0.
+
+        Args:
+            port_names: excited ports.
+        """
+        mirrors = self.get_mirrors(port_names)
+        return (-1 if "x" in mirrors else 0, -1 if "y" in mirrors else 0, 0)
+
+    def get_tidy3d_element_mappings(
+        self, port_source_names: Sequence[str] | None = None
+    ) -> tuple[tuple[tuple[str, int], tuple[str, int], float], ...]:
+        """Returns Tidy3D ComponentModeler element_mappings for port_symmetries.
+
+        Args:
+            port_source_names: excited ports, defaults to self.port_source_names.
+                Only elements computed from these sources are copied, and only
+                to the S-parameters of the other sources.
+        """
+        port_source_names = set(port_source_names or self.port_source_names)
+        element_mappings = []
+        for key, symmetries in self.port_symmetries.items():
+            element = _parse_element(key)
+            if element[1][0] not in port_source_names:
+                continue
+            element_mappings.extend(
+                (element, symmetry, +1)
+                for symmetry in map(_parse_element, symmetries)
+                if symmetry[1][0] not in port_source_names
+            )
+        return tuple(element_mappings)
+
+
+def _parse_element(key: str) -> tuple[tuple[str, int], tuple[str, int]]:
+    """Returns ((out port, mode), (in port, mode)) for 'out@mode,in@mode'."""
+    return tuple(
+        (port, int(mode))
+        for port, mode in (element.split("@") for element in key.split(","))
+    )
+
+
+def get_symmetries(
+    component: gf.Component,
+    layers: Sequence[tuple[int, int]] | None = None,
+    port_modes: Sequence[int] = (0,),
+    tolerance: float = 1e-3,
+) -> Symmetries:
+    """Returns the mirror and rotation symmetries of a component and its ports.
+
+    Polygons are merged per layer and compared with their transformation
+    about the bounding box center, and ports must be mapped to ports with the
+    same width, layer and type. From the symmetries it derives the smallest set
+    of ports to excite and the `port_symmetries` that fill the rest of the
+    S-parameters.
+
+    Only the fundamental mode maps onto itself with the same sign. Higher
+    order modes can be odd under a mirror, so with any port mode other than 0
+    every port is excited and port_symmetries is empty.
+
+    Args:
+        component: to analyze.
+        layers: to compare. Defaults to all component layers.
+        port_modes: modes of the S-parameters to compute.
+        tolerance: max difference between polygons in um.
+    """
+    dbu = component.kcl.dbu
+    box = component.dbbox()
+    # twice the coordinates about the center, so half-grid centers stay exact
+    cx, cy = round((box.left + box.right) / dbu), round((box.bottom + box.top) / dbu)
+    to_center = kdb.ICplxTrans(2, 0, False, -cx, -cy)
+    # tolerance in the doubled coordinates
+    size = round(2 * tolerance / dbu)
+
+    layer_to_polygons = component.get_polygons(by="tuple")
+    regions = [
+        kdb.Region(polygons).transformed(to_center).merged()
+        for layer, polygons in layer_to_polygons.items()
+        if layers is None or layer in {tuple(i) for i in layers}
+    ]
+
+    def key(point: kdb.Point, vector: kdb.Vector, port: gf.Port) -> tuple:
+        return (
+            point.x,
+            point.y,
+            vector.x,
+            vector.y,
+            port.width,
+            port.layer,
+            port.port_type,
+        )
+
+    ports = {}
+    for port in sorted(component.ports, key=lambda port: port.name):
+        x, y = port.center
+        point = kdb.Point(round(2 * x / dbu) - cx, round(2 * y / dbu) - cy)
+        vector = kdb.DCplxTrans(1, port.orientation, False, 0, 0) * kdb.DVector(1000, 0)
+        vector = kdb.Vector(round(vector.x), round(vector.y))
+        ports[port.name] = (point, vector, port)
+    port_keys = {key(*value): name for name, value in ports.items()}
+
+    port_maps = {}
+    for name, trans in transformations.items():
+        port_map = {
+            port_name: port_keys.get(key(trans * point, trans * vector, port))
+            for port_name, (point, vector, port) in ports.items()
+        }
+        if None in port_map.values():
+            continue
+        if all(
+            (region.transformed(trans) ^ region).sized(-size).is_empty()
+            for region in regions
+        ):
+            port_maps[name] = port_map
+
+    if set(port_modes) != {0}:
+        return Symmetries(
+            center=(cx * dbu / 2, cy * dbu / 2),
+            port_maps=port_maps,
+            port_source_names=list(ports),
+            port_symmetries={},
+        )
+
+    port_source_names = []
+    for port_name in ports:
+        if not any(
+            port_map[port_name] in port_source_names for port_map in port_maps.values()
+        ):
+            port_source_names.append(port_name)
+
+    port_symmetries = {}
+    assigned = set()
+    for port_source_name in port_source_names:
+        for port_name in ports:
+            symmetries = []
+            for port_map in port_maps.values():
+                source = port_map[port_source_name]
+                element = f"{port_map[port_name]}@0,{source}@0"
+                if source not in port_source_names and element not in assigned:
+                    assigned.add(element)
+                    symmetries.append(element)
+            if symmetries:
+                port_symmetries[f"{port_name}@0,{port_source_name}@0"] = sorted(
+                    symmetries
+                )
+
+    return Symmetries(
+        center=(cx * dbu / 2, cy * dbu / 2),
+        port_maps=port_maps,
+        port_source_names=port_source_names,
+        port_symmetries=port_symmetries,
+    )
+
+
 if __name__ == "__main__":
     import numpy as np
 
@@ -0,0 +1,309 @@
+"""Content-addressed store for simulation results.
+
+Results are keyed by a geometry fingerprint of the component plus the normalized
+solver settings, stored as one ``.npz`` per key and indexed in a single SQLite
+manifest so that lookups, listings and eviction do not walk the filesystem.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+import gdsfactory as gf
+import numpy as np
+from gdsfactory.config import GDSDIR_TEMP
+from gdsfactory.serialization import clean_value_json
+from gdsfactory.typings import ComponentSpec, PathType
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    tool TEXT,
+    component TEXT,
+    settings TEXT,
+    path TEXT NOT NULL,
+    nbytes INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+def get_component_fingerprint(component: ComponentSpec) -> str:
+    """Returns a stable hash of the component polygons and ports.
+
+    Polygons are snapped to database units and sorted per layer, so the
+    fingerprint does not depend on instance order and no GDS is written to disk.
+
+    Args:
+        component: component or component spec.
+    """
+    component = gf.get_component(component)
+    scale = 1 / component.kcl.dbu
+    h = hashlib.sha256()
+
+    layer_to_polygons = component.get_polygons_points(by="tuple")
+    for layer in sorted(layer_to_polygons, key=str):
+        h.update(str(layer).encode())
+        polygons = [
+            np.rint(np.asarray(points) * scale).astype(np.int64).tobytes()
+            for points in layer_to_polygons[layer]
+        ]
+        for polygon in sorted(polygons):
+            h.update(polygon)
+
+    for port in sorted(component.ports, key=lambda port: port.name):
+        h.update(
+            f"{port.name}:{port.center}:{port.width}:{port.orientation}:{port.layer}".encode()
+        )
+    return h.hexdigest()
+
+
+def normalize_settings(**settings: Any) -> str:
+    """Returns settings as a canonical JSON string (sorted keys, cleaned values)."""
+    return json.dumps(clean_value_json(settings), sort_keys=True, default=str)
+
+
+def get_result_key(component: ComponentSpec, **settings: Any) -> str:
+    """Returns the content address for a component simulated with settings."""
+    fingerprint = get_component_fingerprint(component)
+    return hashlib.sha256(
+        (fingerprint + normalize_settings(**settings)).encode()
+    ).hexdigest()
+
+
+@dataclass(frozen=True)
+class ResultEntry:
+    key: str
+    tool: str | None
+    component: str | None
+    settings: dict[str, Any]
+    path: pathlib.Path
+    nbytes: int
+    created: float
+    accessed: float
+
+
+class ResultStore:
+    """Shared store of simulation results indexed by a SQLite manifest.
+
+    Args:
+        dirpath: store directory. Defaults to GDSDIR_TEMP / "results".
+
+    .. code::
+
+        store = ResultStore()
+        key = store.key(c, tool="meep", resolution=30)
+        sp = store.get(key)
+        if sp is None:
+            sp = write_sparameters_meep(c, resolution=30)
+            store.put(key, sp, component=c.name, tool="meep", resolution=30)
+
+    """
+
+    def __init__(self, dirpath: PathType | None = None) -> None:
+        """Initializes the store and creates the manifest if needed."""
+        self.dirpath = pathlib.Path(dirpath or GDSDIR_TEMP / "results")
+        self.dirpath.mkdir(exist_ok=True, parents=True)
+        self.manifest = self.dirpath / "manifest.sqlite"
+        with self._connect() as con:
+            con.executescript(_SCHEMA)
+
+    @classmethod
+    def from_path(cls, path: PathType) -> tuple[ResultStore, str] | None:
+        """Returns the store and key of an object path, or None if path is not in a store.
+
+        Args:
+            path: npz path returned by :meth:`path`.
+        """
+        path = pathlib.Path(path)
+        if path.suffix != ".npz" or path.parent.parent.name != "objects":
+            return None
+        dirpath = path.parent.parent.parent
+        if not (dirpath / "manifest.sqlite").exists():
+            return None
+        return cls(dirpath), path.stem
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yields a manifest connection, committed on success and always closed."""
+        with contextlib.closing(sqlite3.connect(self.manifest, timeout=60)) as con:
+            with con:
+                yield con
+
+    def path(self, key: str) -> pathlib.Path:
+        """Returns the npz path of key, whether it is stored or not."""
+        return self.dirpath / "objects" / key[:2] / f"{key}.npz"
+
+    def key(self, component: ComponentSpec, **settings: Any) -> str:
+        """Returns the content address for component and settings."""
+        return get_result_key(component, **settings)
+
+    def __contains__(self, key: str) -> bool:
+        """Returns True if key is in the manifest."""
+        with self._connect() as con:
+            row = con.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        """Returns the number of entries in the manifest."""
+        with self._connect() as con:
+            return con.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        """Returns the stored arrays for key or None if missing."""
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT path FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            path = pathlib.Path(row[0])
+            if not path.exists():
+                con.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            con.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return dict(np.load(path))
+
+    def get_path(self, key: str) -> pathlib.Path | None:
+        """Returns the npz path for key or None if missing."""
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT path FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        return pathlib.Path(row[0]) if row else None
+
+    def put(
+        self,
+        key: str,
+        data: dict[str, np.ndarray],
+        component: str | None = None,
+        tool: str | None = None,
+        **settings: Any,
+    ) -> pathlib.Path:
+        """Writes data for key and registers it in the manifest.
+
+        Args:
+            key: content address from :meth:`key`.
+            data: arrays to store.
+            component: component name (informative only).
+            tool: solver name (informative only).
+            settings: solver settings (informative only).
+        """
+        path = self.path(key)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp.npz")
+        np.savez_compressed(tmp, **data)
+        os.replace(tmp, path)
+
+        now = time.time()
+        with self._connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    tool,
+                    component,
+                    normalize_settings(**settings),
+                    str(path),
+                    path.stat().st_size,
+                    now,
+                    now,
+                ),
+            )
+        return path
+
+    def delete(self, key: str) -> None:
+        """Removes key from the manifest and deletes its file."""
+        path = self.get_path(key)
+        with self._connect() as con:
+            con.execute("DELETE FROM entries WHERE key = ?", (key,))
+        if path:
+            path.unlink(missing_ok=True)
+
+    def entries(self, tool: str | None = None) -> Iterator[ResultEntry]:
+        """Yields manifest entries, optionally filtered by tool."""
+        query = "SELECT * FROM entries"
+        params: tuple[str, ...] = ()
+        if tool is not None:
+            query += " WHERE tool = ?"
+            params = (tool,)
+        with self._connect() as con:
+            rows = con.execute(query, params).fetchall()
+        for key, tool_, component, settings, path, nbytes, created, accessed in rows:
+            yield ResultEntry(
+                key=key,
+                tool=tool_,
+                component=component,
+                settings=json.loads(settings),
+                path=pathlib.Path(path),
+                nbytes=nbytes,
+                created=created,
+                accessed=accessed,
+            )
+
+    def nbytes(self) -> int:
+        """Returns the total size of stored results in bytes."""
+        with self._connect() as con:
+            row = con.execute("SELECT COALESCE(SUM(nbytes), 0) FROM entries")
+            return row.fetchone()[0]
+
+    def evict(
+        self, max_bytes: int | None = None, older_than: float | None = None
+    ) -> list[str]:
+        """Evicts least recently used entries and returns the evicted keys.
+
+        Args:
+            max_bytes: evict until the store is at most this size.
+            older_than: evict entries not accessed in this many seconds.
+        """
+        evicted: list[str] = []
+        with self._connect() as con:
+            if older_than is not None:
+                rows = con.execute(
+                    "SELECT key, path FROM entries WHERE accessed < ?",
+                    (time.time() - older_than,),
+                ).fetchall()
+                evicted += [key for key, _ in rows]
+                for _, path in rows:
+                    pathlib.Path(path).unlink(missing_ok=True)
+                con.executemany(
+                    "DELETE FROM entries WHERE key = ?", [(key,) for key, _ in rows]
+                )
+
+            if max_bytes is not None:
+                total = con.execute(
+                    "SELECT COALESCE(SUM(nbytes), 0) FROM entries"
+                ).fetchone()[0]
+                rows = con.execute(
+                    "SELECT key, path, nbytes FROM entries ORDER BY accessed"
+                ).fetchall()
+                for key, path, nbytes in rows:
+                    if total <= max_bytes:
+                        break
+                    pathlib.Path(path).unlink(missing_ok=True)
+                    con.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    total -= nbytes
+                    evicted.append(key)
+        return evicted
+
+
+if __name__ == "__main__":
+    c = gf.components.mmi1x2()
+    store = ResultStore()
+    key = store.key(c, tool="meep", resolution=30)
+    store.put(key, dict(wavelengths=np.linspace(1.5, 1.6, 3)), component=c.name)
+    print(store.get(key))
+    print(list(store.entries()))
@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from gplugins.common.utils.cache import DiskCache, disk_memoize
+
+
+def _square(x: int) -> int:
+    return x**2
+
+
+def _memoized_square(dirpath: str, x: int) -> int:
+    return disk_memoize(dirpath)(_square)(x)
+
+
+def test_disk_memoize(tmp_path) -> None:
+    calls = []
+
+    @disk_memoize(tmp_path)
+    def f(x, y=1):
+        calls.append((x, y))
+        return x + y
+
+    assert f(1, y=2) == 3
+    assert f(1, y=2) == 3
+    assert f(2) == 3
+    assert calls == [(1, 2), (2, 1)]
+    assert f.cache.stats.hits == 1
+    assert f.cache.stats.misses == 2
+
+
+def test_disk_cache_eviction(tmp_path) -> None:
+    cache = DiskCache(tmp_path, max_bytes=3000)
+    for i in range(10):
+        cache.set(str(i) * 4, b"x" * 1000)
+    assert cache.nbytes() <= 3000
+    assert "9999" in cache
+    assert "0000" not in cache
+    assert cache.stats.evictions > 0
+
+
+def test_disk_memoize_process_pool(tmp_path) -> None:
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(_memoized_square, [str(tmp_path)] * 8, range(8)))
+    assert results == [x**2 for x in range(8)]
+    assert len(list(tmp_path.glob("*/*.pkl"))) == 8
+
+
+def test_disk_cache_tracks_nbytes(tmp_path, monkeypatch) -> None:
+    cache = DiskCache(tmp_path, max_bytes=10_000)
+    cache.set("a" * 4, b"x" * 1000)
+    cache.set("a" * 4, b"x" * 2000)
+    cache.set("b" * 4, b"x" * 1000)
+    assert int((tmp_path / ".nbytes").read_text()) == cache.nbytes()
+
+    # writes under the limit do not scan the cache
+    monkeypatch.setattr(cache, "nbytes", lambda: 1 / 0)
+    monkeypatch.setattr(cache, "_evict", lambda max_bytes: 1 / 0)
+    cache.set("c" * 4, b"x" * 1000)
+
+
+def test_disk_memoize_key_includes_module(tmp_path) -> None:
+    def f(x):
+        return x
+
+    def g(x):
+        return -x
+
+    g.__qualname__ = f.__qualname__
+    g.__module__ = "other_module"
+    assert disk_memoize(tmp_path)(f)(1) == 1
+    assert disk_memoize(tmp_path)(g)(1) == -1
@@ -0,0 +1,65 @@
+import gdsfactory as gf
+import numpy as np
+import pytest
+from gdsfactory.pdk import get_layer_stack
+
+from gplugins.common.utils.effective_index import (
+    effective_index_layer,
+    get_effective_index_component,
+)
+from gplugins.common.utils.get_effective_indices import get_effective_indices
+
+index = {"si": 3.47, "sio2": 1.44}
+
+
+def get_index(name: str, wavelength: float) -> float:
+    return index[name]
+
+
+def test_effective_index_rib() -> None:
+    c = gf.components.straight(cross_section="rib", length=5)
+    reduced, layer_stack, neffs = get_effective_index_component(
+        c, get_layer_stack(), get_index=get_index, wavelength=1.55
+    )
+    assert set(layer_stack.layers) == {"core", "slab90"}
+    assert layer_stack.layers["core"].material == "neff_core"
+    assert neffs["core"] > neffs["slab90"]
+
+    neff = get_effective_indices(
+        core_material=3.47,
+        nsubstrate=1.44,
+        clad_materialding=1.44,
+        thickness=0.22,
+        wavelength=1.55,
+        polarization="te",
+    )
+    assert np.isclose(neffs["core"], max(neff))
+
+    assert reduced.dbbox() == c.dbbox()
+    core_layer = (effective_index_layer + 1, 0)
+    assert [tuple(gf.get_layer_tuple(p.layer)) for p in reduced.ports] == [
+        core_layer,
+        core_layer,
+    ]
+    polygons = reduced.get_polygons(by="tuple")
+    assert len(polygons[core_layer]) == 1
+
+
+def test_effective_index_no_core() -> None:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (1, 0), (1, 1)], layer=(200, 0))
+    with pytest.raises(ValueError):
+        get_effective_index_component(
+            c, get_layer_stack(), get_index=get_index, wavelength=1.55
+        )
+
+
+def test_effective_index_tm() -> None:
+    c = gf.components.straight(length=5)
+    _, _, neffs_te = get_effective_index_component(
+        c, get_layer_stack(), get_index=get_index, wavelength=1.55
+    )
+    _, _, neffs_tm = get_effective_index_component(
+        c, get_layer_stack(), get_index=get_index, wavelength=1.55, polarization="tm"
+    )
+    assert index["sio2"] < neffs_tm["core"] < neffs_te["core"]
@@ -0,0 +1,87 @@
+import importlib
+import json
+import subprocess
+import sys
+
+import pytest
+
+from gplugins.common.utils.lazy import attach
+
+import_time_budget_seconds = 1.0
+heavy_modules = ("matplotlib", "scipy", "meep", "tidy3d", "sax", "femwell", "jax")
+
+
+def _import(module: str) -> dict:
+    code = f"""
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps(dict(elapsed=elapsed, modules=sorted(sys.modules))))
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_import_time_budget() -> None:
+    result = _import("gplugins")
+    assert result["elapsed"] < import_time_budget_seconds, (
+        f"import gplugins took {result['elapsed']:.2f}s, "
+        f"budget is {import_time_budget_seconds}s"
+    )
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "gplugins",
+        "gplugins.gmeep",
+        "gplugins.tidy3d",
+        "gplugins.sax",
+        "gplugins.femwell",
+        "gplugins.modes",
+        "gplugins.meow",
+    ],
+)
+def test_import_is_lazy(module: str) -> None:
+    modules = set(_import(module)["modules"])
+    imported = [name for name in heavy_modules if name in modules]
+    assert not imported, f"import {module} eagerly imported {imported}"
+
+
+def test_attach_checks_exports() -> None:
+    attrs = {"plot": "gplugins.common.utils.plot"}
+    attach("gplugins", attrs, exports=["plot"])
+    with pytest.raises(ValueError):
+        attach("gplugins", attrs, exports=["plot", "missing"])
+
+
+def test_attach_submodule_does_not_shadow_function(tmp_path, monkeypatch) -> None:
+    package = tmp_path / "lazy_package"
+    package.mkdir()
+    (package / "__init__.py").write_text(
+        "from gplugins.common.utils.lazy import attach\n"
+        "__all__ = ['run']\n"
+        "__getattr__, __dir__ = attach(\n"
+        "    __name__, {'run': 'lazy_package.run:run'}, exports=__all__\n"
+        ")\n"
+    )
+    (package / "run.py").write_text("def run():\n    return 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    lazy_package = importlib.import_module("lazy_package")
+    run_module = importlib.import_module("lazy_package.run")
+    assert lazy_package.run is run_module.run
+    assert lazy_package.run() == 1
+
+
+def test_gmeep_version_and_missing_meep_message() -> None:
+    import gplugins.gmeep
+
+    assert gplugins.gmeep.__version__ == "0.0.3"
+    if importlib.util.find_spec("meep") is not None:
+        pytest.skip("meep is installed")
+    with pytest.raises(ModuleNotFoundError, match="conda install"):
+        gplugins.gmeep.write_sparameters_meep  # noqa: B018
@@ -0,0 +1,74 @@
+import gdsfactory as gf
+
+from gplugins.common.utils.port_symmetries import get_symmetries
+
+
+def _assert_complete(component: gf.Component) -> None:
+    """Every S-parameter is computed or copied by port_symmetries."""
+    s = get_symmetries(component)
+    port_names = [port.name for port in component.ports]
+    computed = {f"{i}@0,{j}@0" for i in port_names for j in s.port_source_names}
+    copied = {sym for symmetries in s.port_symmetries.values() for sym in symmetries}
+    assert set(s.port_symmetries) <= computed
+    assert not computed & copied
+    assert computed | copied == {f"{i}@0,{j}@0" for i in port_names for j in port_names}
+
+
+def test_symmetries_straight() -> None:
+    s = get_symmetries(gf.components.straight(length=10))
+    assert set(s.port_maps) == {"rotate180", "mirror_x", "mirror_y"}
+    assert s.port_source_names == ["o1"]
+    assert s.port_symmetries == {
+        "o1@0,o1@0": ["o2@0,o2@0"],
+        "o2@0,o1@0": ["o1@0,o2@0"],
+    }
+    assert s.get_mirrors(["o1"]) == ("y",)
+    assert s.get_tidy3d_symmetry(["o1"]) == (0, -1, 0)
+
+
+def test_symmetries_mmi1x2() -> None:
+    c = gf.components.mmi1x2()
+    s = get_symmetries(c)
+    assert list(s.port_maps) == ["mirror_y"]
+    assert s.port_source_names == ["o1", "o2"]
+    assert s.get_mirrors(["o1"]) == ("y",)
+    assert s.get_mirrors(["o1", "o2"]) == ()
+    _assert_complete(c)
+
+
+def test_symmetries_crossing() -> None:
+    c = gf.components.crossing()
+    s = get_symmetries(c)
+    assert len(s.port_maps) == 7
+    assert s.port_source_names == ["o1"]
+    _assert_complete(c)
+
+
+def test_symmetries_asymmetric() -> None:
+    c = gf.components.taper(width1=0.5, width2=1)
+    s = get_symmetries(c)
+    assert list(s.port_maps) == ["mirror_y"]
+    assert s.port_source_names == ["o1", "o2"]
+    assert s.port_symmetries == {}
+
+
+def test_symmetries_multimode() -> None:
+    s = get_symmetries(gf.components.straight(length=10), port_modes=(0, 1))
+    assert set(s.port_maps) == {"rotate180", "mirror_x", "mirror_y"}
+    assert s.port_source_names == ["o1", "o2"]
+    assert s.port_symmetries == {}
+
+
+def test_symmetries_tidy3d_element_mappings() -> None:
+    s = get_symmetries(gf.components.crossing())
+    assert s.get_tidy3d_element_mappings() == s.get_tidy3d_element_mappings(["o1"])
+    # o2 also runs, so its S-parameters are not copied from o1
+    mappings = s.get_tidy3d_element_mappings(["o1", "o2"])
+    assert mappings
+    assert all(element[1][0] == "o1" for element, _, _ in mappings)
+    assert all(symmetry[1][0] not in {"o1", "o2"} for _, symmetry, _ in mappings)
+
+    # the mmi1x2 mappings are all computed from o2, which does not run
+    assert (
+        get_symmetries(gf.components.mmi1x2()).get_tidy3d_element_mappings(["o1"]) == ()
+    )
@@ -0,0 +1,52 @@
+import gdsfactory as gf
+import numpy as np
+
+from gplugins.common.utils.get_sparameters_path import (
+    get_sparameters_path_meep,
+    get_sparameters_store,
+    load_sparameters,
+    save_sparameters,
+)
+from gplugins.common.utils.result_store import ResultStore, get_component_fingerprint
+
+
+def test_component_fingerprint() -> None:
+    c1 = gf.components.straight(length=10)
+    c2 = gf.components.straight(length=10)
+    c3 = gf.components.straight(length=11)
+    assert get_component_fingerprint(c1) == get_component_fingerprint(c2)
+    assert get_component_fingerprint(c1) != get_component_fingerprint(c3)
+
+
+def test_result_store(tmp_path) -> None:
+    store = ResultStore(tmp_path)
+    c = gf.components.straight(length=10)
+    key = store.key(c, tool="meep", resolution=20)
+    assert key != store.key(c, tool="meep", resolution=30)
+    assert store.get(key) is None
+
+    sp = dict(wavelengths=np.linspace(1.5, 1.6, 3))
+    store.put(key, sp, component=c.name, tool="meep", resolution=20)
+    assert key in store
+    np.testing.assert_allclose(store.get(key)["wavelengths"], sp["wavelengths"])
+    assert [entry.key for entry in store.entries(tool="meep")] == [key]
+
+    assert store.evict(max_bytes=0) == [key]
+    assert len(store) == 0
+
+
+def test_sparameters_path_in_store(tmp_path) -> None:
+    c = gf.components.straight(length=10)
+    filepath = get_sparameters_path_meep(c, dirpath=tmp_path, resolution=20)
+    assert load_sparameters(filepath) is None
+
+    sp = dict(wavelengths=np.linspace(1.5, 1.6, 3))
+    save_sparameters(filepath, sp, component=c.name, tool="meep")
+    np.testing.assert_allclose(
+        load_sparameters(filepath)["wavelengths"], sp["wavelengths"]
+    )
+
+    store = get_sparameters_store(tmp_path)
+    assert [entry.path for entry in store.entries(tool="meep")] == [filepath]
+    assert get_sparameters_path_meep(c, dirpath=tmp_path, resolution=20) == filepath
+    assert get_sparameters_path_meep(c, dirpath=tmp_path, resolution=30) != filepath
@@ -1,5 +1,22 @@
 from __future__ import annotations
 
-from .mode_solver import compute_component_slice_modes, compute_cross_section_modes
+from typing import TYPE_CHECKING
 
-__all__ = ("compute_component_slice_modes", "compute_cross_section_modes")
+from gplugins.common.utils.lazy import attach
+
+__all__ = ["compute_component_slice_modes", "compute_cross_section_modes"]
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        "compute_component_slice_modes": "gplugins.femwell.mode_solver:compute_component_slice_modes",
+        "compute_cross_section_modes": "gplugins.femwell.mode_solver:compute_cross_section_modes",
+    },
+    exports=__all__,
+)
+
+if TYPE_CHECKING:
+    from gplugins.femwell.mode_solver import (
+        compute_component_slice_modes,
+        compute_cross_section_modes,
+    )
@@ -1,53 +1,22 @@
 from __future__ import annotations
 
-try:
-    import meep as mp
-except ModuleNotFoundError as e:
-    print("You need to 'conda install -c conda-forge pymeep=*=mpi_mpich_* nlopt -y'")
-    raise e
+from typing import TYPE_CHECKING
 
-from gdsfactory import logger
-
-from gplugins.common.utils import plot, port_symmetries
-from gplugins.common.utils.get_sparameters_path import get_sparameters_data_meep
-from gplugins.gmeep.get_simulation import get_simulation
-from gplugins.gmeep.meep_adjoint_optimization import (
-    get_meep_adjoint_optimizer,
-    run_meep_adjoint_optimizer,
-)
-from gplugins.gmeep.write_sparameters_grating import (
-    write_sparameters_grating,
-    write_sparameters_grating_batch,
-    write_sparameters_grating_mpi,
-)
-from gplugins.gmeep.write_sparameters_meep import (
-    write_sparameters_meep,
-    write_sparameters_meep_1x1,
-    write_sparameters_meep_1x1_bend90,
-)
-from gplugins.gmeep.write_sparameters_meep_batch import (
-    write_sparameters_meep_batch,
-    write_sparameters_meep_batch_1x1,
-    write_sparameters_meep_batch_1x1_bend90,
-)
-from gplugins.gmeep.write_sparameters_meep_mpi import (
-    write_sparameters_meep_mpi,
-    write_sparameters_meep_mpi_1x1,
-    write_sparameters_meep_mpi_1x1_bend90,
-)
-
-logger.info(f"Meep {mp.__version__!r} installed at {mp.__path__!r}")
+from gplugins.common.utils.lazy import attach
 
 __all__ = [
     "get_meep_adjoint_optimizer",
     "get_simulation",
     "get_sparameters_data_meep",
+    "load_sparameters_grating_sweep",
     "plot",
     "port_symmetries",
+    "run_meep_adjoint_multistart",
     "run_meep_adjoint_optimizer",
     "write_sparameters_grating",
     "write_sparameters_grating_batch",
     "write_sparameters_grating_mpi",
+    "write_sparameters_grating_sweep",
     "write_sparameters_meep",
     "write_sparameters_meep_1x1",
     "write_sparameters_meep_1x1_bend90",
@@ -59,3 +28,66 @@ __all__ = [
     "write_sparameters_meep_mpi_1x1_bend90",
 ]
 __version__ = "0.0.3"
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        "get_meep_adjoint_optimizer": "gplugins.gmeep.meep_adjoint_optimization:get_meep_adjoint_optimizer",
+        "get_simulation": "gplugins.gmeep.get_simulation:get_simulation",
+        "get_sparameters_data_meep": "gplugins.common.utils.get_sparameters_path:get_sparameters_data_meep",
+        "load_sparameters_grating_sweep": "gplugins.gmeep.write_sparameters_grating:load_sparameters_grating_sweep",
+        "plot": "gplugins.common.utils.plot",
+        "port_symmetries": "gplugins.common.utils.port_symmetries",
+        "run_meep_adjoint_multistart": "gplugins.gmeep.meep_adjoint_optimization:run_meep_adjoint_multistart",
+        "run_meep_adjoint_optimizer": "gplugins.gmeep.meep_adjoint_optimization:run_meep_adjoint_optimizer",
+        "write_sparameters_grating": "gplugins.gmeep.write_sparameters_grating:write_sparameters_grating",
+        "write_sparameters_grating_batch": "gplugins.gmeep.write_sparameters_grating:write_sparameters_grating_batch",
+        "write_sparameters_grating_mpi": "gplugins.gmeep.write_sparameters_grating:write_sparameters_grating_mpi",
+        "write_sparameters_grating_sweep": "gplugins.gmeep.write_sparameters_grating:write_sparameters_grating_sweep",
+        "write_sparameters_meep": "gplugins.gmeep.write_sparameters_meep:write_sparameters_meep",
+        "write_sparameters_meep_1x1": "gplugins.gmeep.write_sparameters_meep:write_sparameters_meep_1x1",
+        "write_sparameters_meep_1x1_bend90": "gplugins.gmeep.write_sparameters_meep:write_sparameters_meep_1x1_bend90",
+        "write_sparameters_meep_batch": "gplugins.gmeep.write_sparameters_meep_batch:write_sparameters_meep_batch",
+        "write_sparameters_meep_batch_1x1": "gplugins.gmeep.write_sparameters_meep_batch:write_sparameters_meep_batch_1x1",
+        "write_sparameters_meep_batch_1x1_bend90": "gplugins.gmeep.write_sparameters_meep_batch:write_sparameters_meep_batch_1x1_bend90",
+        "write_sparameters_meep_mpi": "gplugins.gmeep.write_sparameters_meep_mpi:write_sparameters_meep_mpi",
+        "write_sparameters_meep_mpi_1x1": "gplugins.gmeep.write_sparameters_meep_mpi:write_sparameters_meep_mpi_1x1",
+        "write_sparameters_meep_mpi_1x1_bend90": "gplugins.gmeep.write_sparameters_meep_mpi:write_sparameters_meep_mpi_1x1_bend90",
+    },
+    exports=__all__,
+    missing_messages={
+        "meep": "You need to 'conda install -c conda-forge pymeep=*=mpi_mpich_* nlopt -y'"
+    },
+)
+
+if TYPE_CHECKING:
+    from gplugins.common.utils import plot, port_symmetries
+    from gplugins.common.utils.get_sparameters_path import get_sparameters_data_meep
+    from gplugins.gmeep.get_simulation import get_simulation
+    from gplugins.gmeep.meep_adjoint_optimization import (
+        get_meep_adjoint_optimizer,
+        run_meep_adjoint_multistart,
+        run_meep_adjoint_optimizer,
+    )
+    from gplugins.gmeep.write_sparameters_grating import (
+        load_sparameters_grating_sweep,
+        write_sparameters_grating,
+        write_sparameters_grating_batch,
+        write_sparameters_grating_mpi,
+        write_sparameters_grating_sweep,
+    )
+    from gplugins.gmeep.write_sparameters_meep import (
+        write_sparameters_meep,
+        write_sparameters_meep_1x1,
+        write_sparameters_meep_1x1_bend90,
+    )
+    from gplugins.gmeep.write_sparameters_meep_batch import (
+        write_sparameters_meep_batch,
+        write_sparameters_meep_batch_1x1,
+        write_sparameters_meep_batch_1x1_bend90,
+    )
+    from gplugins.gmeep.write_sparameters_meep_mpi import (
+        write_sparameters_meep_mpi,
+        write_sparameters_meep_mpi_1x1,
+        write_sparameters_meep_mpi_1x1_bend90,
+    )
@@ -0,0 +1,108 @@
+"""Cache of port eigenmode wavevectors.
+
+Meep solves the port eigenmodes with MPB for every source and mode monitor of
+every simulation. Ports with the same cross-section share their eigenmodes, so
+the solved wavevectors are cached on disk keyed by the port cross-section
+geometry (in the port frame), the layer stack, materials, frequencies and
+resolution. Cached wavevectors are passed back to Meep as `kpoint_func` and
+`eig_kpoint`, the starting points of the MPB solves, which then converge in
+a few iterations.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+import gdsfactory as gf
+import numpy as np
+from gdsfactory.config import GDSDIR_TEMP
+from gdsfactory.typings import PathType, Port
+from kfactory import kdb
+
+from gplugins.common.utils.cache import DiskCache
+from gplugins.common.utils.result_store import normalize_settings
+
+_caches: dict[str, DiskCache] = {}
+
+
+def get_eigenmode_cache(dirpath: PathType | None = None) -> DiskCache:
+    """Returns the eigenmode cache stored in dirpath.
+
+    Args:
+        dirpath: cache directory. Defaults to GDSDIR_TEMP / "eigenmodes".
+    """
+    dirpath = str(dirpath or GDSDIR_TEMP / "eigenmodes")
+    if dirpath not in _caches:
+        _caches[dirpath] = DiskCache(dirpath)
+    return _caches[dirpath]
+
+
+def get_port_cross_section_hash(
+    component: gf.Component, port: Port, port_margin: float = 2, **settings
+) -> str:
+    """Returns a hash of the component cross-section at a port and settings.
+
+    Polygons are cut with a line across the port, `port.width + 2 * port_margin`
+    wide, and moved to the port frame, so ports with the same cross-section
+    get the same hash regardless of their position and orientation.
+
+    Args:
+        component: component.
+        port: port of the component.
+        port_margin: margin on each side of the port.
+        settings: settings that change the eigenmode (layer stack, materials,
+            frequencies, resolution, mode number ...).
+    """
+    dbu = component.kcl.dbu
+    width = round((port.width + 2 * port_margin) / dbu / 2)
+    x, y = (round(xy / dbu) for xy in port.center)
+    from_port = kdb.ICplxTrans(1, port.orientation, False, x, y)
+    cut = kdb.Region(kdb.Box(-1, -width, 1, width)).transformed(from_port)
+    to_port = from_port.inverted()
+
+    h = hashlib.sha256()
+    layer_to_polygons = component.get_polygons(by="tuple")
+    for layer in sorted(layer_to_polygons, key=str):
+        region = (kdb.Region(layer_to_polygons[layer]) & cut).transformed(to_port)
+        if region.is_empty():
+            continue
+        polygons = sorted(str(polygon) for polygon in region.each())
+        h.update(f"{layer}:{';'.join(polygons)}".encode())
+    h.update(normalize_settings(port_margin=port_margin, **settings).encode())
+    return h.hexdigest()
+
+
+def get_cached_kpoints(
+    cache: DiskCache, key: str, freqs: np.ndarray
+) -> np.ndarray | None:
+    """Returns cached wavevector magnitudes (1/um) at freqs or None.
+
+    Args:
+        cache: eigenmode cache.
+        key: port cross-section hash.
+        freqs: frequencies (1/um), within the cached frequency range.
+    """
+    cached = cache.get(key)
+    freqs = np.atleast_1d(freqs)
+    if cached is None or not (
+        cached["freqs"].min() - 1e-9 <= freqs.min()
+        and freqs.max() <= cached["freqs"].max() + 1e-9
+    ):
+        cache.stats.misses += 1
+        return None
+    cache.stats.hits += 1
+    order = np.argsort(cached["freqs"])
+    return np.interp(freqs, cached["freqs"][order], cached["kpoints"][order])
+
+
+def set_cached_kpoints(
+    cache: DiskCache, key: str, freqs: np.ndarray, kpoints: np.ndarray
+) -> None:
+    """Caches wavevector magnitudes (1/um) solved at freqs (1/um)."""
+    cache.set(
+        key,
+        dict(
+            freqs=np.asarray(freqs, dtype=float),
+            kpoints=np.asarray(kpoints, dtype=float),
+        ),
+    )
@@ -1,15 +1,54 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+
 import gdsfactory as gf
 import meep as mp
 import numpy as np
 from gdsfactory.pdk import get_layer_stack
 from gdsfactory.technology import LayerStack
 from gdsfactory.typings import ComponentSpec, CrossSectionSpec
+from kfactory import kdb
 
+from gplugins.common.utils.cache import CacheStats
 from gplugins.common.utils.parse_layer_stack import order_layer_stack
+from gplugins.common.utils.result_store import get_result_key
 from gplugins.gmeep.get_material import get_material
 
+geometry_cache_size = 32
+geometry_cache_stats = CacheStats()
+_geometry_cache: OrderedDict[str, list[mp.GeometricObject]] = OrderedDict()
+
+
+def clear_geometry_cache() -> None:
+    """Clears the cached Meep geometries and their hit/miss counters."""
+    _geometry_cache.clear()
+    geometry_cache_stats.hits = geometry_cache_stats.misses = 0
+    geometry_cache_stats.evictions = 0
+
+
+def get_merged_polygons_points(
+    component: gf.Component, simplify: float | None = None
+) -> dict[int, list[np.ndarray]]:
+    """Returns merged polygon points per layer index, without holes.
+
+    Args:
+        component: gdsfactory component.
+        simplify: removes vertices closer than simplify (um) to the polygon outline.
+    """
+    dbu = component.kcl.dbu
+    layer_to_polygons = {}
+    for layer, polygons in component.get_polygons().items():
+        region = kdb.Region(polygons)
+        region.merge()
+        if simplify:
+            region = region.smoothed(round(simplify / dbu))
+        layer_to_polygons[layer] = [
+            np.array([(p.x, p.y) for p in polygon.each_point_hull()]) * dbu
+            for polygon in (p.resolved_holes() for p in region.each())
+        ]
+    return layer_to_polygons
+
 
 def get_meep_geometry_from_component(
     component: ComponentSpec,
@@ -18,10 +57,17 @@ def get_meep_geometry_from_component(
     wavelength: float = 1.55,
     is_3d: bool = False,
     dispersive: bool = False,
+    merge_polygons: bool = False,
+    simplify: float | None = None,
+    cache: bool = True,
     **kwargs,
 ) -> list[mp.GeometricObject]:
     """Returns Meep geometry from a gdsfactory component.
 
+    Geometries are cached in memory by component geometry, layer stack and
+    material settings, so simulations of the same component (one per port
+    excitation and sweep point) only build the prisms once.
+
     Args:
         component: gdsfactory component.
         layer_stack: for material layers.
@@ -29,11 +75,31 @@ def get_meep_geometry_from_component(
         wavelength: in um.
         is_3d: renders in 3D.
         dispersive: add dispersion.
+        merge_polygons: merges polygons of each layer before creating prisms.
+        simplify: merges polygons and removes vertices closer than simplify (um)
+            to the outline. Meep geometry initialization scales with vertex count.
+        cache: reuse the geometry of a previous call with the same inputs.
         kwargs: settings.
     """
     component = gf.get_component(component=component, **kwargs)
     layer_stack = layer_stack or get_layer_stack()
 
+    key = get_result_key(
+        component,
+        layer_stack=layer_stack.model_dump_json(),
+        material_name_to_meep=material_name_to_meep,
+        wavelength=wavelength,
+        is_3d=is_3d,
+        dispersive=dispersive,
+        merge_polygons=merge_polygons,
+        simplify=simplify,
+    )
+    if cache and key in _geometry_cache:
+        geometry_cache_stats.hits += 1
+        _geometry_cache.move_to_end(key)
+        return list(_geometry_cache[key])
+    geometry_cache_stats.misses += 1
+
     layer_to_thickness = layer_stack.get_layer_to_thickness()
     layer_to_material = layer_stack.get_layer_to_material()
     layer_to_zmin = layer_stack.get_layer_to_zmin()
@@ -41,7 +107,11 @@ def get_meep_geometry_from_component(
     component_with_booleans = layer_stack.get_component_with_derived_layers(component)
 
     geometry = []
-    layer_to_polygons = component_with_booleans.get_polygons_points()
+    layer_to_polygons = (
+        get_merged_polygons_points(component_with_booleans, simplify=simplify)
+        if merge_polygons or simplify
+        else component_with_booleans.get_polygons_points()
+    )
 
     ordered_layer_stack_keys = order_layer_stack(layer_stack)[::-1]
 
@@ -80,6 +150,13 @@ def get_meep_geometry_from_component(
                             # center=center
                         )
                     )
+
+    if cache:
+        _geometry_cache[key] = geometry
+        if len(_geometry_cache) > geometry_cache_size:
+            _geometry_cache.popitem(last=False)
+            geometry_cache_stats.evictions += 1
+        return list(geometry)
     return geometry
 
 
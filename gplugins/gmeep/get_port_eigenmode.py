@@ -6,6 +6,11 @@ import numpy as np
 from gdsfactory.components import straight
 
 from gplugins.gmeep import get_simulation
+from gplugins.gmeep.eigenmode_cache import (
+    get_cached_kpoints,
+    get_eigenmode_cache,
+    set_cached_kpoints,
+)
 from gplugins.modes.types import Mode
 
 '''
@@ -62,6 +67,8 @@ def get_port_2Dx_eigenmode(
     choose_yz=False,
     y=0,
     z=0,
+    eigenmode_key: str | None = None,
+    eigenmode_cache=True,
 ):
     """NOTE: currently only handles ports normal to x-direction.
 
@@ -73,6 +80,9 @@ def get_port_2Dx_eigenmode(
         choose_yz: whether y-z samples are generated or provided
         y: y array (if choose_yz is True)
         z: z array (if choose_yz is True)
+        eigenmode_key: port cross-section hash from `get_port_cross_section_hash`.
+            If set, a cached wavevector is used as starting point of the solve.
+        eigenmode_cache: eigenmode cache directory, True for the default one.
 
     Returns:
         Mode object compatible with /modes plugin
@@ -104,15 +114,24 @@ def get_port_2Dx_eigenmode(
         sim.init_sim()
         sim_dict["initialized"] = True
 
+    cache = kpoints = None
+    if eigenmode_key and eigenmode_cache:
+        cache = get_eigenmode_cache(
+            None if eigenmode_cache is True else eigenmode_cache
+        )
+        kpoints = get_cached_kpoints(cache, eigenmode_key, fsrc)
+
     eigenmode = sim.get_eigenmode(
         direction=mp.X,
         where=mp.Volume(center=center, size=size),
         band_num=band_num,
         kpoint=mp.Vector3(
-            fsrc * 3.45, 0, 0
+            fsrc * 3.45 if kpoints is None else kpoints[0], 0, 0
         ),  # Hardcoded index for now, pull from simulation eventually
         frequency=fsrc,
     )
+    if cache is not None and eigenmode_key not in cache:
+        set_cached_kpoints(cache, eigenmode_key, [fsrc], [eigenmode.k.norm()])
 
     # The output of this function is slightly different then MPB (there is no mode_solver object)
     # Format like the Mode objects in gdsfactory/simulation/modes to reuse modes' functions
@@ -48,6 +48,9 @@ def get_simulation(
     dispersive: bool = False,
     material_name_to_meep: dict[str, str | float] | None = None,
     continuous_source: bool = False,
+    merge_polygons: bool = False,
+    simplify: float | None = None,
+    port_source_kpoint: float | None = None,
     **settings,
 ) -> dict[str, Any]:
     r"""Returns Simulation dict from gdsfactory Component.
@@ -117,6 +120,12 @@ def get_simulation(
         material_name_to_meep: map layer_stack names with meep material database name
             or refractive index. dispersive materials have a wavelength dependent index.
         continuous_source: if True, defines a continuous source at (wavelength_start + wavelength_stop)/2 instead of the ramped source
+        merge_polygons: merges polygons of each layer before creating prisms.
+        simplify: merges polygons and removes vertices closer than simplify (um)
+            to the outline, to speed up Meep geometry initialization.
+        port_source_kpoint: wavevector magnitude (1/um) of the source eigenmode at the
+            center frequency, used as starting point of the MPB solve.
+            For example a cached value from a previous simulation.
 
     Keyword Args:
         settings: extra simulation settings (resolution, symmetries, etc.)
@@ -207,6 +216,8 @@ def get_simulation(
         wavelength=wavelength,
         is_3d=is_3d,
         dispersive=dispersive,
+        merge_polygons=merge_polygons,
+        simplify=simplify,
     )
 
     freqs = 1 / wavelengths
@@ -252,7 +263,8 @@ def get_simulation(
             eig_band=port_source_mode + 1,
             eig_parity=mp.NO_PARITY if is_3d else mp.EVEN_Y + mp.ODD_Z,
             eig_match_freq=True,
-            eig_kpoint=-1 * mp.Vector3(x=1).rotate(mp.Vector3(z=1), angle_rad),
+            eig_kpoint=-(port_source_kpoint or 1)
+            * mp.Vector3(x=1).rotate(mp.Vector3(z=1), angle_rad),
             direction=direction,
         )
     ]
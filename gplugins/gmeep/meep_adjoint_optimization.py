@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+import functools
+import hashlib
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
 from types import LambdaType
 from typing import Any
 
 import gdsfactory as gf
 import nlopt
 import numpy as np
-from gdsfactory import Component
+from gdsfactory import Component, logger
 from gdsfactory.technology import LayerStack
 from gdsfactory.typings import Layer
 from meep import Block, EigenModeSource, MaterialGrid, Simulation, Vector3, Volume
@@ -15,8 +21,22 @@ from meep.adjoint import DesignRegion, EigenmodeCoefficient, OptimizationProblem
 from meep.visualization import get_2D_dimensions
 from numpy import ndarray
 
+from gplugins.common.utils.cache import CacheStats
+from gplugins.common.utils.cores import pin_pool_worker
 from gplugins.gmeep import get_simulation
 
+# Optimization builder inherited by forked multi-start workers (not picklable)
+_pool_get_optimization: Callable[[], tuple] | None = None
+_pool_kwargs: dict[str, Any] = {}
+
+# OptimizationProblem method timed for each phase of an evaluation
+adjoint_phases = {
+    "geometry": "update_design",
+    "forward": "forward_run",
+    "adjoint": "adjoint_run",
+    "gradient": "calculate_gradient",
+}
+
 
 def get_meep_adjoint_optimizer(
     component: Component,
@@ -185,6 +205,140 @@ def get_meep_adjoint_optimizer(
     return opt
 
 
+class AdjointTimer:
+    """Times the phases of the evaluations of a Meep OptimizationProblem.
+
+    Wraps the geometry update, forward run, adjoint run and gradient
+    calculation methods of opt until `restore` is called.
+
+    Args:
+        opt: OptimizationProblem to time.
+    """
+
+    phases = adjoint_phases
+
+    def __init__(self, opt: OptimizationProblem) -> None:
+        """Wraps the methods of opt."""
+        self.opt = opt
+        self.times = dict.fromkeys(self.phases, 0.0)
+        for phase, method in self.phases.items():
+            if hasattr(opt, method):
+                setattr(opt, method, self._timed(phase, getattr(opt, method)))
+
+    def _timed(self, phase: str, method: Callable) -> Callable:
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.times[phase] += time.perf_counter() - start
+
+        return timed
+
+    def lap(self) -> dict[str, float]:
+        """Returns the seconds spent in each phase since the last lap."""
+        times, self.times = self.times, dict.fromkeys(self.phases, 0.0)
+        return times
+
+    def restore(self) -> None:
+        """Removes the wrappers from opt."""
+        for method in self.phases.values():
+            self.opt.__dict__.pop(method, None)
+
+
+class MemoizedObjective:
+    """nlopt objective that caches values and gradients by design vector.
+
+    nlopt line searches evaluate the same design more than once, the cached
+    value (and gradient, if it was computed) is returned instead of running
+    the forward and adjoint simulations again. Each evaluation is recorded in
+    `history` with its value and timing, and logged.
+
+    Args:
+        cost_function: nlopt objective `f(x, grad) -> value`.
+        cache_size: number of designs to keep, 0 disables memoization.
+        timer: to record the phase timings of each evaluation.
+    """
+
+    def __init__(
+        self,
+        cost_function: Callable[[np.ndarray, np.ndarray], float],
+        cache_size: int = 16,
+        timer: AdjointTimer | None = None,
+    ) -> None:
+        """Wraps cost_function."""
+        self.cost_function = cost_function
+        self.cache_size = cache_size
+        self.timer = timer
+        self.cache: OrderedDict[str, tuple[float, np.ndarray | None]] = OrderedDict()
+        self.stats = CacheStats()
+        self.history: list[dict[str, float]] = []
+
+    def __call__(self, x: np.ndarray, grad: np.ndarray) -> float:
+        """Returns the objective at x and writes its gradient into grad."""
+        key = hashlib.sha256(np.ascontiguousarray(x, dtype=float).tobytes()).hexdigest()
+        cached = self.cache.get(key)
+        if cached is not None and (grad.size == 0 or cached[1] is not None):
+            self.stats.hits += 1
+            self.cache.move_to_end(key)
+            value, gradient = cached
+            if grad.size > 0:
+                grad[:] = gradient
+            return value
+
+        self.stats.misses += 1
+        start = time.perf_counter()
+        value = self.cost_function(x, grad)
+        record = dict(value=float(np.real(value)), total=time.perf_counter() - start)
+        if self.timer:
+            record.update(self.timer.lap())
+        self.history.append(record)
+        logger.info(
+            f"Evaluation {len(self.history)}: "
+            + ", ".join(f"{k}={v:.4g}" for k, v in record.items())
+            + f" (cache hits={self.stats.hits})"
+        )
+
+        if self.cache_size > 0:
+            self.cache[key] = (value, grad.copy() if grad.size > 0 else None)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+                self.stats.evictions += 1
+        return value
+
+
+def _optimize(
+    number_of_params: int,
+    cost_function: Callable,
+    update_variable: np.ndarray,
+    maximize_cost_function: bool = True,
+    algorithm: int = nlopt.LD_MMA,
+    lower_bound: Any = 0,
+    upper_bound: Any = 1,
+    maxeval: int = 10,
+    opt: OptimizationProblem | None = None,
+    cache_size: int = 16,
+) -> tuple[float, MemoizedObjective]:
+    """Runs nlopt in place on update_variable, returns optimum and objective."""
+    timer = AdjointTimer(opt) if opt is not None else None
+    objective = MemoizedObjective(cost_function, cache_size=cache_size, timer=timer)
+    solver = nlopt.opt(algorithm, number_of_params)
+    solver.set_lower_bounds(lower_bound)
+    solver.set_upper_bounds(upper_bound)
+    if maximize_cost_function:
+        solver.set_max_objective(objective)
+    else:
+        solver.set_min_objective(objective)
+    solver.set_maxeval(maxeval)
+    try:
+        update_variable[:] = solver.optimize(update_variable)
+    finally:
+        if timer:
+            timer.restore()
+    return solver.last_optimum_value(), objective
+
+
 def run_meep_adjoint_optimizer(
     number_of_params: int,
     cost_function: LambdaType,
@@ -196,10 +350,15 @@ def run_meep_adjoint_optimizer(
     maxeval: int = 10,
     get_optimized_component: bool = False,
     opt: OptimizationProblem | None = None,
+    cache_size: int = 16,
     **kwargs,
 ) -> ndarray | Component:
     """Run adjoint optimization using Meep.
 
+    The cost function is memoized by design vector for the duration of the
+    call, and each evaluation is logged with its time. If opt is passed, the
+    time is split into geometry update, forward run, adjoint run and gradient.
+
     Args:
         number_of_params: number of parameters to optimize (usually resolution_in_x * resolution_in_y).
         cost_function: cost function to optimize.
@@ -211,7 +370,9 @@ def run_meep_adjoint_optimizer(
         maxeval: maximum number of evaluations.
         get_optimized_component: if True, returns the optimized gdsfactory Component.
             If this is True, the Optimization object used for the optimization must be passed as an argument.
-        opt: OptimizationProblem object used for the optimization. Used only if get_optimized_component is True.
+        opt: OptimizationProblem object used for the optimization.
+            Used for the optimized component and to time the evaluation phases.
+        cache_size: number of evaluated designs to memoize, 0 disables memoization.
 
     Keyword Args:
         fcen: center frequency of the source.
@@ -219,15 +380,18 @@ def run_meep_adjoint_optimizer(
         threshold_offset_from_max: threshold offset from max eps value.
         layer: layer to apply to the optimized component.
     """
-    solver = nlopt.opt(algorithm, number_of_params)
-    solver.set_lower_bounds(lower_bound)
-    solver.set_upper_bounds(upper_bound)
-    if maximize_cost_function:
-        solver.set_max_objective(cost_function)
-    else:
-        solver.set_min_objective(cost_function)
-    solver.set_maxeval(maxeval)
-    update_variable[:] = solver.optimize(update_variable)
+    _optimize(
+        number_of_params=number_of_params,
+        cost_function=cost_function,
+        update_variable=update_variable,
+        maximize_cost_function=maximize_cost_function,
+        algorithm=algorithm,
+        lower_bound=lower_bound,
+        upper_bound=upper_bound,
+        maxeval=maxeval,
+        opt=opt,
+        cache_size=cache_size,
+    )
 
     if get_optimized_component:
         fcen = kwargs.get("fcen", 1 / 1.55)
@@ -241,6 +405,72 @@ def run_meep_adjoint_optimizer(
     return update_variable
 
 
+def _run_pool_start(x0: np.ndarray) -> dict[str, Any]:
+    """Runs one optimization from x0 in a forked multi-start worker."""
+    opt, cost_function = _pool_get_optimization()
+    x = np.array(x0, dtype=float)
+    value, objective = _optimize(
+        number_of_params=x.size,
+        cost_function=cost_function,
+        update_variable=x,
+        opt=opt,
+        **_pool_kwargs,
+    )
+    return dict(x=x, value=value, history=objective.history)
+
+
+def run_meep_adjoint_multistart(
+    get_optimization: Callable[[], tuple[OptimizationProblem | None, Callable]],
+    starts: Sequence[np.ndarray],
+    processes: int | None = None,
+    cores_per_run: int = 1,
+    **kwargs,
+) -> list[dict[str, Any]]:
+    """Runs independent adjoint optimizations from several starting designs.
+
+    Optimizations run concurrently in forked processes, each pinned to its own
+    cores_per_run cores, so they do not compete for the same cores.
+
+    Args:
+        get_optimization: returns a new (OptimizationProblem, cost function)
+            pair, called once per start in its worker. The OptimizationProblem
+            (or None) is used to time the evaluation phases.
+        starts: initial design vectors.
+        processes: number of concurrent optimizations.
+            Defaults to the number of cores // cores_per_run.
+        cores_per_run: cores for each optimization.
+        kwargs: maximize_cost_function, algorithm, lower_bound, upper_bound,
+            maxeval and cache_size, as in run_meep_adjoint_optimizer.
+
+    Returns:
+        for each start, a dict with the optimized design `x`, its `value` and
+            the `history` of evaluations.
+    """
+    global _pool_get_optimization, _pool_kwargs
+    processes = processes or max(1, (os.cpu_count() or 1) // cores_per_run)
+    processes = min(processes, len(starts))
+
+    _pool_get_optimization = get_optimization
+    _pool_kwargs = kwargs
+    try:
+        context = multiprocessing.get_context("fork")
+        counter = context.Value("i", 0)
+        with context.Pool(
+            processes, initializer=pin_pool_worker, initargs=(counter, cores_per_run)
+        ) as pool:
+            results = pool.map(_run_pool_start, starts, chunksize=1)
+    finally:
+        _pool_get_optimization = None
+        _pool_kwargs = {}
+
+    for i, result in enumerate(results):
+        logger.info(
+            f"Start {i}: value={result['value']:.4g} "
+            f"after {len(result['history'])} evaluations"
+        )
+    return results
+
+
 def get_component_from_sim(
     sim: Simulation,
     fcen: float = 1 / 1.55,
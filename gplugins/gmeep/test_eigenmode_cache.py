@@ -0,0 +1,42 @@
+import gdsfactory as gf
+import numpy as np
+
+from gplugins.gmeep.eigenmode_cache import (
+    get_cached_kpoints,
+    get_eigenmode_cache,
+    get_port_cross_section_hash,
+    set_cached_kpoints,
+)
+
+
+def test_port_cross_section_hash() -> None:
+    straight = gf.components.straight(length=3)
+    bend = gf.components.bend_euler()
+    keys = {
+        get_port_cross_section_hash(c, port, resolution=30)
+        for c in (straight, bend)
+        for port in c.ports
+    }
+    # all ports share the strip cross-section
+    assert len(keys) == 1
+
+    wide = gf.components.straight(width=0.6)
+    assert get_port_cross_section_hash(wide, wide.ports[0], resolution=30) not in keys
+    assert (
+        get_port_cross_section_hash(straight, straight.ports[0], resolution=40)
+        not in keys
+    )
+
+
+def test_cached_kpoints(tmp_path) -> None:
+    cache = get_eigenmode_cache(tmp_path)
+    freqs = 1 / np.linspace(1.5, 1.6, 11)
+    assert get_cached_kpoints(cache, "key", freqs) is None
+
+    set_cached_kpoints(cache, "key", freqs, 2.4 * freqs)
+    np.testing.assert_allclose(get_cached_kpoints(cache, "key", freqs), 2.4 * freqs)
+    np.testing.assert_allclose(
+        get_cached_kpoints(cache, "key", np.mean(freqs)), [2.4 * np.mean(freqs)]
+    )
+    assert get_cached_kpoints(cache, "key", 1 / 1.3) is None
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
@@ -0,0 +1,55 @@
+import nlopt
+import numpy as np
+
+from gplugins.gmeep.meep_adjoint_optimization import (
+    MemoizedObjective,
+    run_meep_adjoint_multistart,
+    run_meep_adjoint_optimizer,
+)
+
+evaluations = []
+
+
+def cost_function(x: np.ndarray, grad: np.ndarray) -> float:
+    evaluations.append(x.copy())
+    if grad.size > 0:
+        grad[:] = -2 * (x - 0.3)
+    return -float(np.sum((x - 0.3) ** 2))
+
+
+def test_memoized_objective() -> None:
+    evaluations.clear()
+    objective = MemoizedObjective(cost_function, cache_size=2)
+    x = np.full(3, 0.5)
+    grad = np.zeros(3)
+    value = objective(x, grad)
+    grad_cached = np.zeros(3)
+    assert objective(x.copy(), grad_cached) == value
+    np.testing.assert_allclose(grad_cached, grad)
+    assert len(evaluations) == 1
+    assert objective.stats.hits == 1
+    assert len(objective.history) == 1
+
+
+def test_run_meep_adjoint_optimizer() -> None:
+    evaluations.clear()
+    x = np.full(4, 0.9)
+    run_meep_adjoint_optimizer(4, cost_function, x, maxeval=20)
+    np.testing.assert_allclose(x, 0.3, atol=1e-2)
+    designs = {e.tobytes() for e in evaluations}
+    assert len(designs) == len(evaluations)
+
+
+def get_optimization():
+    return None, cost_function
+
+
+def test_run_meep_adjoint_multistart() -> None:
+    starts = [np.full(2, 0.1), np.full(2, 0.9)]
+    results = run_meep_adjoint_multistart(
+        get_optimization, starts, processes=2, maxeval=20, algorithm=nlopt.LD_MMA
+    )
+    assert len(results) == 2
+    for result in results:
+        np.testing.assert_allclose(result["x"], 0.3, atol=1e-2)
+        assert result["history"]
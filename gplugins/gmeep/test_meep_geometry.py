@@ -0,0 +1,32 @@
+import gdsfactory as gf
+
+from gplugins.gmeep.get_meep_geometry import (
+    clear_geometry_cache,
+    geometry_cache_stats,
+    get_meep_geometry_from_component,
+)
+
+
+def test_geometry_cache() -> None:
+    clear_geometry_cache()
+    c = gf.components.straight(length=2)
+
+    geometry1 = get_meep_geometry_from_component(c)
+    geometry2 = get_meep_geometry_from_component(gf.components.straight(length=2))
+    assert geometry_cache_stats.hits == 1
+    assert geometry_cache_stats.misses == 1
+    assert [g.vertices for g in geometry1] == [g.vertices for g in geometry2]
+
+    get_meep_geometry_from_component(c, wavelength=1.31)
+    assert geometry_cache_stats.misses == 2
+
+
+def test_geometry_simplify() -> None:
+    c = gf.components.bend_circular()
+    geometry = get_meep_geometry_from_component(c, cache=False)
+    simplified = get_meep_geometry_from_component(c, simplify=0.01, cache=False)
+
+    def num_vertices(geometry) -> int:
+        return sum(len(g.vertices) for g in geometry)
+
+    assert num_vertices(simplified) < num_vertices(geometry)
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from gplugins.gmeep.write_sparameters_grating import (
+    load_sparameters_grating_sweep,
+    write_sparameters_grating_sweep,
+)
+
+settings = dict(resolution=10, n_periods=5, wavelength_points=3)
+
+
+def test_write_sparameters_grating_sweep(tmp_path) -> None:
+    filepath = tmp_path / "sweep.nc"
+    ds = write_sparameters_grating_sweep(
+        filepath,
+        fiber_angle_deg=(10.0, 20.0),
+        period=(0.66,),
+        processes=2,
+        dirpath=tmp_path,
+        **settings,
+    )
+    assert dict(ds.sizes) == dict(
+        fiber_angle_deg=2, fiber_xposition=1, period=1, wavelength=3
+    )
+    assert not np.isnan(ds.s12.values).any()
+
+    stored = load_sparameters_grating_sweep(filepath)
+    np.testing.assert_allclose(stored.s12.values, ds.s12.values)
+
+    # resume only runs the new period
+    ds2 = write_sparameters_grating_sweep(
+        filepath,
+        fiber_angle_deg=(10.0, 20.0),
+        period=(0.66, 0.68),
+        processes=1,
+        dirpath=tmp_path,
+        **settings,
+    )
+    assert ds2.sizes["period"] == 2
+    np.testing.assert_allclose(ds2.s12.sel(period=0.66).values, ds.s12[:, :, 0].values)
+
+    with pytest.raises(ValueError):
+        write_sparameters_grating_sweep(filepath, dirpath=tmp_path, resolution=20)
@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
+import importlib
+
 import gdsfactory as gf
 import numpy as np
+import pytest
+import yaml
 
 import gplugins as sim
 import gplugins.gmeep as gm
 
+pytest.importorskip("meep")
+
+from gplugins.gmeep.write_sparameters_meep import (
+    stop_when_sparameters_converged,
+)
+
+write_sparameters_meep_module = importlib.import_module(
+    "gplugins.gmeep.write_sparameters_meep"
+)
+
 simulation_settings = dict(resolution=20, is_3d=False)
 
 
@@ -46,6 +60,143 @@ def test_sparameters_straight_symmetric() -> None:
     assert np.allclose(np.abs(sp["o2@0,o2@0"]), 0, atol=5e-02), np.abs(sp["o2@0,o2@0"])
 
 
+def test_sparameters_straight_processes() -> None:
+    """Checks Sparameters for a straight waveguide using a process pool."""
+    c = gf.components.straight(length=2)
+    p = 3
+    c = gf.add_padding_container(c, default=0, top=p, bottom=p)
+    sp = gm.write_sparameters_meep(
+        c, ymargin=0, overwrite=True, processes=2, **simulation_settings
+    )
+
+    # Check reasonable reflection/transmission
+    assert np.allclose(np.abs(sp["o1@0,o2@0"]), 1, atol=1e-02), np.abs(sp["o1@0,o2@0"])
+    assert np.allclose(np.abs(sp["o2@0,o1@0"]), 1, atol=1e-02), np.abs(sp["o2@0,o1@0"])
+    assert np.allclose(np.abs(sp["o1@0,o1@0"]), 0, atol=5e-02), np.abs(sp["o1@0,o1@0"])
+    assert np.allclose(np.abs(sp["o2@0,o2@0"]), 0, atol=5e-02), np.abs(sp["o2@0,o2@0"])
+
+
+def test_sparameters_straight_dft_convergence() -> None:
+    """Checks that DFT convergence termination matches energy decay."""
+    c = gf.components.straight(length=2)
+    p = 3
+    c = gf.add_padding_container(c, default=0, top=p, bottom=p)
+    sp = gm.write_sparameters_meep(
+        c, ymargin=0, overwrite=True, termination="dft", **simulation_settings
+    )
+    assert np.allclose(np.abs(sp["o1@0,o2@0"]), 1, atol=1e-02), np.abs(sp["o1@0,o2@0"])
+    assert not any(key.startswith("convergence") for key in sp)
+
+    filepath = gm.write_sparameters_meep(
+        c,
+        ymargin=0,
+        termination="dft",
+        only_return_filepath_sim_settings=True,
+        **simulation_settings,
+    )
+    convergence = yaml.safe_load(filepath.read_text())["convergence"]
+    assert set(convergence) == {"o1@0", "o2@0"}
+    assert all(record["converged"] for record in convergence.values())
+
+
+def test_sparameters_straight_checkpoint_resume(tmp_path, monkeypatch) -> None:
+    """Checks that an interrupted and resumed run matches a straight run."""
+    c = gf.components.straight(length=2)
+    p = 3
+    c = gf.add_padding_container(c, default=0, top=p, bottom=p)
+    settings = dict(ymargin=0, termination="dft", **simulation_settings)
+    sp = gm.write_sparameters_meep(
+        c, overwrite=True, filepath=tmp_path / "straight.npz", **settings
+    )
+
+    # interrupt the second excitation after its first checkpoint, so that the
+    # rerun loads o1 from its saved S-parameters and resumes o2 from its fields
+    dump_checkpoint = write_sparameters_meep_module._dump_checkpoint
+
+    def dump_checkpoint_and_interrupt(sim, dirpath, **kwargs) -> None:
+        dump_checkpoint(sim, dirpath, **kwargs)
+        if dirpath.name == "o2@0":
+            raise KeyboardInterrupt
+
+    filepath = tmp_path / "resumed.npz"
+    checkpoint_settings = dict(
+        filepath=filepath,
+        checkpoint_dir=tmp_path / "checkpoints",
+        checkpoint_interval=20,
+        **settings,
+    )
+    monkeypatch.setattr(
+        write_sparameters_meep_module,
+        "_dump_checkpoint",
+        dump_checkpoint_and_interrupt,
+    )
+    with pytest.raises(KeyboardInterrupt):
+        gm.write_sparameters_meep(c, overwrite=True, **checkpoint_settings)
+    assert (tmp_path / "checkpoints" / "resumed" / "o1@0.yml").exists()
+    assert (tmp_path / "checkpoints" / "resumed" / "o2@0" / "fields").exists()
+    monkeypatch.undo()
+
+    sp_resumed = gm.write_sparameters_meep(c, **checkpoint_settings)
+    for key in ("o1@0,o2@0", "o2@0,o1@0", "o1@0,o1@0", "o2@0,o2@0"):
+        np.testing.assert_allclose(sp_resumed[key], sp[key], atol=5e-3)
+
+    filepath_sim_settings = gm.write_sparameters_meep(
+        c, only_return_filepath_sim_settings=True, **checkpoint_settings
+    )
+    convergence = yaml.safe_load(filepath_sim_settings.read_text())["convergence"]
+    assert set(convergence) == {"o1@0", "o2@0"}
+    assert all(record["converged"] for record in convergence.values())
+
+
+def test_stop_when_sparameters_converged() -> None:
+    """Stops after window evaluations below tolerance."""
+
+    class Simulation:
+        time = 0
+
+        def meep_time(self) -> float:
+            return self.time
+
+    values = iter([1.0, 0.5, 0.4999, 0.4998, 0.4998, 0.4998])
+    record = {}
+    condition = stop_when_sparameters_converged(
+        lambda: {"o1@0,o1@0": np.array([next(values)])},
+        dt=10,
+        tolerance=1e-3,
+        window=3,
+        record=record,
+    )
+    sim = Simulation()
+    for sim.time in range(0, 100):
+        if condition(sim):
+            break
+    assert record["converged"]
+    assert record["evaluations"] == 5
+    assert sim.time == 50
+
+
+def test_stop_when_sparameters_converged_zero() -> None:
+    """Does not stop on all-zero S-parameters before the pulse arrives."""
+
+    class Simulation:
+        time = 0
+
+        def meep_time(self) -> float:
+            return self.time
+
+    record = {}
+    condition = stop_when_sparameters_converged(
+        lambda: {"o1@0,o1@0": np.zeros(1)},
+        dt=10,
+        window=3,
+        record=record,
+    )
+    sim = Simulation()
+    assert not any(condition(sim) for sim.time in range(0, 100))
+    assert not record["converged"]
+    assert record["evaluations"] == 9
+
+
 # def test_sparameters_straight_mpi() -> None:
 #     """Checks Sparameters for a straight waveguide using MPI."""
 #     c = gf.components.straight(length=2)
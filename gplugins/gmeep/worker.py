@@ -0,0 +1,242 @@
+"""Persistent Meep worker that runs many simulations per process.
+
+Workers pull job descriptors from a queue directory, so the interpreter,
+gdsfactory and meep are imported once per MPI slot instead of once per
+simulation.
+
+.. code::
+
+    mpirun -np 4 python -m gplugins.gmeep.worker /path/to/queue
+
+Queue layout::
+
+    queue/
+        jobs/      component GDS for each job
+        pending/   job descriptors waiting for a worker
+        running/   job descriptors claimed by a worker
+        done/      finished job descriptors, and <job>.yml with the elapsed time
+        failed/    job descriptors that raised an exception, and <job>.yml
+        stop       if present, idle workers exit
+
+Rank 0 of each worker claims a job by atomically renaming it from `pending` to
+`running` and broadcasts it to the other ranks, which run the simulation
+together.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import pickle
+import shlex
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any
+
+import gdsfactory as gf
+import yaml
+from gdsfactory import logger
+from gdsfactory.read import import_gds
+from gdsfactory.technology import LayerStack
+from gdsfactory.typings import ComponentSpec, PathType
+
+from gplugins.gmeep.write_sparameters_meep import write_sparameters_meep
+
+queue_subdirs = ("jobs", "pending", "running", "done", "failed")
+
+
+def _get_comm() -> Any:
+    """Returns the MPI world communicator or None if not running under MPI."""
+    try:
+        from mpi4py import MPI
+    except ModuleNotFoundError:
+        return None
+    comm = MPI.COMM_WORLD
+    return comm if comm.Get_size() > 1 else None
+
+
+def init_queue(queue_dir: PathType) -> pathlib.Path:
+    """Creates the queue directory structure and returns its path."""
+    queue_dir = pathlib.Path(queue_dir)
+    for subdir in queue_subdirs:
+        (queue_dir / subdir).mkdir(parents=True, exist_ok=True)
+    return queue_dir
+
+
+def submit_job(
+    queue_dir: PathType,
+    component: ComponentSpec,
+    filepath: PathType,
+    layer_stack: LayerStack,
+    **settings: Any,
+) -> pathlib.Path:
+    """Adds a write_sparameters_meep job to the queue and returns its descriptor.
+
+    Args:
+        queue_dir: queue directory.
+        component: component to simulate.
+        filepath: Sparameters npz filepath to write.
+        layer_stack: layer stack for the simulation.
+        settings: write_sparameters_meep settings.
+    """
+    queue_dir = init_queue(queue_dir)
+    job_id = f"{time.time_ns()}_{uuid.uuid4().hex[:8]}"
+
+    component = gf.get_component(component)
+    gdspath = queue_dir / "jobs" / f"{job_id}.gds"
+    component.write_gds(gdspath, with_metadata=True)
+
+    job = dict(
+        gdspath=str(gdspath),
+        filepath=str(filepath),
+        layer_stack=layer_stack.model_dump_json(),
+        settings=settings,
+    )
+    tmp = queue_dir / "jobs" / f"{job_id}.pkl"
+    with open(tmp, "wb") as f:
+        pickle.dump(job, f, pickle.HIGHEST_PROTOCOL)
+
+    descriptor = queue_dir / "pending" / f"{job_id}.pkl"
+    os.replace(tmp, descriptor)
+    return descriptor
+
+
+def claim_job(queue_dir: PathType) -> pathlib.Path | None:
+    """Moves the oldest pending job to running and returns it, None if empty."""
+    queue_dir = pathlib.Path(queue_dir)
+    for descriptor in sorted((queue_dir / "pending").glob("*.pkl")):
+        claimed = queue_dir / "running" / descriptor.name
+        try:
+            os.rename(descriptor, claimed)
+        except FileNotFoundError:  # claimed by another worker
+            continue
+        return claimed
+    return None
+
+
+def run_job(descriptor: PathType) -> pathlib.Path:
+    """Runs a job descriptor and returns the Sparameters filepath."""
+    with open(descriptor, "rb") as f:
+        job = pickle.load(f)
+
+    component = import_gds(job["gdspath"], read_metadata=True)
+    layer_stack = LayerStack.model_validate_json(job["layer_stack"])
+    write_sparameters_meep(
+        component=component,
+        layer_stack=layer_stack,
+        filepath=job["filepath"],
+        **job["settings"],
+    )
+    return pathlib.Path(job["filepath"])
+
+
+def serve(
+    queue_dir: PathType,
+    exit_when_empty: bool = True,
+    poll_interval: float = 1.0,
+) -> int:
+    """Processes jobs from the queue until it is empty or stopped.
+
+    Returns the number of jobs processed.
+
+    Args:
+        queue_dir: queue directory.
+        exit_when_empty: exit as soon as there are no pending jobs.
+            Otherwise wait for new jobs until a `stop` file is created.
+        poll_interval: seconds between queue checks when idle.
+    """
+    queue_dir = init_queue(queue_dir)
+    comm = _get_comm()
+    rank = comm.Get_rank() if comm else 0
+    processed = 0
+
+    while True:
+        descriptor = None
+        if rank == 0:
+            descriptor = claim_job(queue_dir)
+            while descriptor is None and not (
+                exit_when_empty or (queue_dir / "stop").exists()
+            ):
+                time.sleep(poll_interval)
+                descriptor = claim_job(queue_dir)
+        if comm:
+            descriptor = comm.bcast(descriptor, root=0)
+        if descriptor is None:
+            return processed
+
+        start = time.time()
+        try:
+            filepath = run_job(descriptor)
+            status = "done"
+        except Exception:
+            logger.exception(f"Job {descriptor.name} failed")
+            status = "failed"
+
+        if rank == 0:
+            elapsed = time.time() - start
+            (queue_dir / status / f"{descriptor.stem}.yml").write_text(
+                yaml.safe_dump(dict(elapsed=elapsed))
+            )
+            os.replace(descriptor, queue_dir / status / descriptor.name)
+            if status == "done":
+                logger.info(f"Job {descriptor.stem} -> {filepath} in {elapsed:.1f}s")
+        processed += 1
+
+
+def get_worker_command(queue_dir: PathType, cores: int = 1) -> str:
+    """Returns the mpirun command that starts one worker on the queue."""
+    args = ["mpirun", "-np", str(cores), sys.executable]
+    return shlex.join(args + ["-m", "gplugins.gmeep.worker", str(queue_dir)])
+
+
+def start_workers(
+    queue_dir: PathType,
+    workers: int = 1,
+    cores_per_worker: int = 1,
+    log_dir: PathType | None = None,
+) -> list[subprocess.Popen]:
+    """Starts MPI workers on the queue and returns their processes.
+
+    Workers exit once the queue is empty.
+
+    Args:
+        queue_dir: queue directory.
+        workers: number of workers.
+        cores_per_worker: MPI ranks per worker.
+        log_dir: directory for worker logs. Defaults to queue_dir.
+    """
+    queue_dir = init_queue(queue_dir)
+    log_dir = pathlib.Path(log_dir or queue_dir)
+    command = get_worker_command(queue_dir, cores=cores_per_worker)
+    processes = []
+    for i in range(workers):
+        logger.info(command)
+        with open(log_dir / f"worker_{i}.log", "w") as log:
+            processes.append(
+                subprocess.Popen(
+                    shlex.split(command), stdout=log, stderr=subprocess.STDOUT
+                )
+            )
+    return processes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Meep simulations from a queue.")
+    parser.add_argument("queue_dir", help="Queue directory.")
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Keep waiting for new jobs until a `stop` file exists in queue_dir.",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=1.0, help="Seconds between checks."
+    )
+    args = parser.parse_args()
+    serve(
+        args.queue_dir,
+        exit_when_empty=not args.wait,
+        poll_interval=args.poll_interval,
+    )
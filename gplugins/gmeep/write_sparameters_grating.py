@@ -10,25 +10,40 @@ MFD:
 from __future__ import annotations
 
 import hashlib
+import itertools
+import json
+import multiprocessing
+import os
 import pathlib
 import shlex
 import shutil
 import subprocess
+import sys
 import time
+from collections.abc import Sequence
+from typing import Any
 
 import matplotlib.pyplot as plt
 import meep as mp
 import numpy as np
+import xarray as xr
 import yaml
 from gdsfactory import logger
-from gdsfactory.config import PATH
+from gdsfactory.config import PATH, get_number_of_cores
 from gdsfactory.serialization import clean_value_json, clean_value_name
 from gdsfactory.typings import PathType
-
+from tqdm.auto import tqdm
+
+from gplugins.common.utils.cores import pin_pool_worker
+from gplugins.common.utils.result_store import normalize_settings
+from gplugins.gmeep.eigenmode_cache import (
+    get_cached_kpoints,
+    get_eigenmode_cache,
+    set_cached_kpoints,
+)
 from gplugins.gmeep.get_simulation_grating_fiber import (
     get_simulation_grating_fiber,
 )
-from gplugins.gmeep.write_sparameters_meep_mpi import _python
 
 nm = 1e-3
 nSi = 3.48
@@ -36,6 +51,30 @@ nSiO2 = 1.44
 
 Floats = tuple[float, ...]
 
+# settings that do not change the waveguide port eigenmode
+grating_settings = (
+    "period",
+    "fill_factor",
+    "n_periods",
+    "widths",
+    "gaps",
+    "fiber_angle_deg",
+    "fiber_xposition",
+    "decay_by",
+)
+
+# sweep dimensions and S-parameter variable names of write_sparameters_grating_sweep
+sweep_dims = ("fiber_angle_deg", "fiber_xposition", "period")
+sparameter_names = {
+    "o1@0,o1@0": "s11",
+    "o1@0,o2@0": "s12",
+    "o2@0,o1@0": "s21",
+    "o2@0,o2@0": "s22",
+}
+
+# write_sparameters_grating settings inherited by forked sweep workers
+_pool_grating_settings: dict[str, Any] = {}
+
 
 def fiber_core_material(fiber_numerical_aperture, fiber_clad_material):
     return (fiber_numerical_aperture**2 + fiber_clad_material**2) ** 0.5
@@ -49,6 +88,7 @@ def write_sparameters_grating(
     dirpath: PathType | None = PATH.sparameters,
     decay_by: float = 1e-3,
     verbosity: int = 0,
+    eigenmode_cache: PathType | bool = True,
     **settings,
 ) -> dict[str, np.ndarray]:
     """Write grating coupler with fiber Sparameters.
@@ -61,6 +101,11 @@ def write_sparameters_grating(
         dirpath: directory path.
         decay_by: field decay to stop simulation.
         verbosity: print messages.
+        eigenmode_cache: caches the waveguide port wavevectors, which do not depend
+            on the grating and fiber position, and uses them as MPB starting points.
+            MPB still solves the port mode in every run, starting close to the
+            solution. A directory, True for GDSDIR_TEMP / "eigenmodes" or False
+            to disable.
         core_materials: number of cores.
 
     Keyword Args:
@@ -190,12 +235,35 @@ def write_sparameters_grating(
     fcen = sim_dict["fcen"]
     wavelengths = 1 / freqs
 
+    cache = kpoints = None
+    if eigenmode_cache:
+        cache = get_eigenmode_cache(
+            None if eigenmode_cache is True else eigenmode_cache
+        )
+        waveguide_settings = {
+            key: value for key, value in settings.items() if key not in grating_settings
+        }
+        eigenmode_key = hashlib.sha256(
+            normalize_settings(port="grating_waveguide", **waveguide_settings).encode()
+        ).hexdigest()
+        kpoints = get_cached_kpoints(cache, eigenmode_key, freqs)
+
+    # the cached wavevectors only seed MPB, the mode profile is solved for the
+    # fields of this simulation
+    def kpoint_func(freq: float, band: int) -> mp.Vector3:
+        return mp.Vector3(x=kpoints[np.argmin(np.abs(freqs - freq))])
+
     waveguide_mode = sim.get_eigenmode_coefficients(
         waveguide_monitor,
         [1],
         eig_parity=mp.ODD_Z,
         direction=waveguide_port_direction,
+        kpoint_func=None if kpoints is None else kpoint_func,
     )
+    if cache is not None and kpoints is None:
+        set_cached_kpoints(
+            cache, eigenmode_key, freqs, [k.norm() for k in waveguide_mode.kpoints]
+        )
     fiber_mode = sim.get_eigenmode_coefficients(
         fiber_monitor,
         [1],
@@ -240,6 +308,159 @@ def write_sparameters_grating(
     return sp
 
 
+def _run_pool_grating(
+    configuration: tuple[tuple[int, ...], dict[str, float]],
+) -> tuple[tuple[int, ...], dict[str, np.ndarray]]:
+    """Runs one sweep configuration in a forked pool worker."""
+    index, sweep_settings = configuration
+    sp = write_sparameters_grating(**_pool_grating_settings, **sweep_settings)
+    return index, {key: np.asarray(value) for key, value in dict(sp).items()}
+
+
+def load_sparameters_grating_sweep(filepath: PathType) -> xr.Dataset:
+    """Returns the dataset written by write_sparameters_grating_sweep.
+
+    Args:
+        filepath: netCDF file.
+    """
+    with xr.open_dataset(filepath) as stored:
+        stored = stored.load()
+    return xr.Dataset(
+        {
+            name: stored[f"{name}_real"] + 1j * stored[f"{name}_imag"]
+            for name in sparameter_names.values()
+        },
+        attrs=stored.attrs,
+    )
+
+
+def _write_sparameters_grating_sweep_dataset(
+    ds: xr.Dataset, filepath: pathlib.Path
+) -> None:
+    """Writes ds with complex variables split in real and imaginary parts."""
+    stored = xr.Dataset(attrs=ds.attrs)
+    for name in sparameter_names.values():
+        stored[f"{name}_real"] = ds[name].real
+        stored[f"{name}_imag"] = ds[name].imag
+    filepath_tmp = filepath.with_name(f"{filepath.name}.tmp")
+    stored.to_netcdf(filepath_tmp)
+    os.replace(filepath_tmp, filepath)
+
+
+def write_sparameters_grating_sweep(
+    filepath: PathType,
+    fiber_angle_deg: Sequence[float] = (20.0,),
+    fiber_xposition: Sequence[float] = (1.0,),
+    period: Sequence[float] = (0.66,),
+    processes: int | None = None,
+    cores_per_run: int = 1,
+    overwrite: bool = False,
+    dirpath: PathType | None = PATH.sparameters,
+    **settings,
+) -> xr.Dataset:
+    """Sweeps fiber angle, fiber x position and grating period of write_sparameters_grating.
+
+    Configurations run concurrently in forked processes, each pinned to its own
+    cores_per_run cores, and share the waveguide eigenmode cache, which seeds the
+    MPB port mode solve of every configuration with the cached wavevectors. The
+    S-parameters land in one xarray dataset with dimensions fiber_angle_deg,
+    fiber_xposition, period and wavelength, and variables s11, s12, s21 and
+    s22. The dataset is written to filepath (netCDF) after each finished
+    configuration, and a rerun only simulates the configurations missing from
+    it.
+
+    Args:
+        filepath: netCDF file for the dataset.
+        fiber_angle_deg: fiber angles in degrees.
+        fiber_xposition: fiber x positions in um.
+        period: grating periods in um.
+        processes: number of concurrent simulations.
+            Defaults to the number of cores // cores_per_run.
+        cores_per_run: cores for each simulation.
+        overwrite: discards the stored dataset and the cached simulations.
+        dirpath: directory for the simulations of each configuration.
+        settings: other write_sparameters_grating settings.
+    """
+    filepath = pathlib.Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    coords = dict(
+        zip(
+            sweep_dims,
+            (
+                np.asarray(fiber_angle_deg, dtype=float),
+                np.asarray(fiber_xposition, dtype=float),
+                np.asarray(period, dtype=float),
+            ),
+        )
+    )
+    attrs = dict(settings=json.dumps(clean_value_json(settings), sort_keys=True))
+
+    ds = None
+    if filepath.exists() and not overwrite:
+        stored = load_sparameters_grating_sweep(filepath)
+        if stored.attrs.get("settings") != attrs["settings"]:
+            raise ValueError(
+                f"{str(filepath)!r} was written with settings {stored.attrs.get('settings')}, "
+                f"not {attrs['settings']}. Use overwrite=True or another filepath."
+            )
+        ds = stored.reindex(coords)
+
+    pending = [
+        (index, dict(zip(sweep_dims, values)))
+        for index, values in zip(
+            itertools.product(*(range(len(coords[dim])) for dim in sweep_dims)),
+            itertools.product(*(coords[dim].tolist() for dim in sweep_dims)),
+        )
+        if ds is None or np.isnan(ds["s11"].values[index]).all()
+    ]
+    logger.info(
+        f"Sweeping {len(pending)} of {np.prod([len(v) for v in coords.values()])} "
+        "grating configurations"
+    )
+
+    def update(index: tuple[int, ...], sp: dict[str, np.ndarray]) -> None:
+        nonlocal ds
+        if ds is None:
+            shape = [len(coords[dim]) for dim in sweep_dims] + [len(sp["wavelengths"])]
+            ds = xr.Dataset(
+                {
+                    name: ((*sweep_dims, "wavelength"), np.full(shape, np.nan + 0j))
+                    for name in sparameter_names.values()
+                },
+                coords=dict(coords, wavelength=sp["wavelengths"]),
+                attrs=attrs,
+            )
+        for key, name in sparameter_names.items():
+            ds[name].values[index] = sp[key]
+        _write_sparameters_grating_sweep_dataset(ds, filepath)
+
+    global _pool_grating_settings
+    _pool_grating_settings = dict(overwrite=overwrite, dirpath=dirpath, **settings)
+    processes = processes or max(1, get_number_of_cores() // cores_per_run)
+    processes = min(processes, len(pending))
+    try:
+        if processes > 1:
+            context = multiprocessing.get_context("fork")
+            counter = context.Value("i", 0)
+            with context.Pool(
+                processes,
+                initializer=pin_pool_worker,
+                initargs=(counter, cores_per_run),
+            ) as pool:
+                for index, sp in tqdm(
+                    pool.imap_unordered(_run_pool_grating, pending),
+                    total=len(pending),
+                ):
+                    update(index, sp)
+        else:
+            for configuration in tqdm(pending):
+                update(*_run_pool_grating(configuration))
+    finally:
+        _pool_grating_settings = {}
+
+    return ds
+
+
 def write_sparameters_grating_mpi(
     instance: dict,
     cores: int = 2,
@@ -283,7 +504,7 @@ def write_sparameters_grating_mpi(
     with open(script_file, "w") as script_file_obj:
         script_file_obj.writelines(script_lines)
     # Exec string
-    command = f"mpirun -np {cores} {_python()} {script_file}"
+    command = f"mpirun -np {cores} {sys.executable} {script_file}"
 
     # Launch simulation
     if verbosity:
@@ -5,7 +5,9 @@ from __future__ import annotations
 import inspect
 import multiprocessing
 import pathlib
+import shutil
 import time
+from collections.abc import Callable
 from functools import partial
 from pathlib import Path
 from typing import Any
@@ -23,9 +25,22 @@ from gdsfactory.typings import ComponentSpec, PathType, Port, PortSymmetries
 from tqdm.auto import tqdm
 
 from gplugins.common.utils import port_symmetries
+from gplugins.common.utils.effective_index import get_effective_index_component
 from gplugins.common.utils.get_sparameters_path import (
     get_sparameters_path_meep as get_sparameters_path,
 )
+from gplugins.common.utils.get_sparameters_path import (
+    load_sparameters,
+    save_sparameters,
+)
+from gplugins.common.utils.port_symmetries import get_symmetries
+from gplugins.gmeep.eigenmode_cache import (
+    get_cached_kpoints,
+    get_eigenmode_cache,
+    get_port_cross_section_hash,
+    set_cached_kpoints,
+)
+from gplugins.gmeep.get_material import get_material
 from gplugins.gmeep.get_simulation import (
     get_simulation,
     settings_get_simulation,
@@ -33,6 +48,20 @@ from gplugins.gmeep.get_simulation import (
 
 core_materials = multiprocessing.cpu_count()
 
+# sparameter_calculation reports the DFT convergence of each excitation under this key
+_convergence_prefix = "convergence:"
+
+# Excitation runner inherited by forked pool workers (closures are not picklable)
+_pool_sparameter_calculation: Callable[..., dict] | None = None
+
+
+def _run_pool_excitation(excitation: tuple[str, int]) -> dict[str, np.ndarray]:
+    """Runs one (port, mode) excitation in a forked pool worker."""
+    port_source_name, port_source_mode = excitation
+    return _pool_sparameter_calculation(
+        port_source_name, port_source_mode=port_source_mode
+    )
+
 
 def remove_simulation_kwargs(d: dict[str, Any]) -> dict[str, Any]:
     """Returns a copy of dict with only simulation settings.
@@ -42,17 +71,26 @@ def remove_simulation_kwargs(d: dict[str, Any]) -> dict[str, Any]:
     d = d.copy()
     d.pop("run", None)
     d.pop("lazy_parallelism", None)
+    d.pop("processes", None)
     d.pop("overwrite", None)
     d.pop("animate", None)
     d.pop("wait_to_finish", None)
     d.pop("cores", None)
     d.pop("temp_dir", None)
     d.pop("temp_file_str", None)
+    d.pop("checkpoint_dir", None)
+    d.pop("checkpoint_interval", None)
+    d.pop("eigenmode_cache", None)
     return d
 
 
 def parse_port_eigenmode_coeff(
-    port_name: str, ports: dict[str, Port], sim_dict: dict, port_mode: int = 0
+    port_name: str,
+    ports: dict[str, Port],
+    sim_dict: dict,
+    port_mode: int = 0,
+    eigenmode_key: str | None = None,
+    eigenmode_cache: PathType | bool = True,
 ):
     """Returns the coefficients relative to whether the wavevector is entering or \
             exiting simulation.
@@ -61,7 +99,43 @@ def parse_port_eigenmode_coeff(
         port_index: index of port.
         ports: component_ref.ports.
         sim_dict: simulation dict.
+        port_mode: mode number.
+        eigenmode_key: port cross-section hash. If set, the solved wavevectors are
+            cached and reused as MPB starting points for ports with the same key.
+        eigenmode_cache: eigenmode cache directory, True for the default one.
+
+    """
+    cache = kpoints = None
+    if eigenmode_key and eigenmode_cache:
+        cache = get_eigenmode_cache(
+            None if eigenmode_cache is True else eigenmode_cache
+        )
+        kpoints = get_cached_kpoints(cache, eigenmode_key, sim_dict["freqs"])
+
+    coeff_in, coeff_out, solved_kpoints = _get_port_eigenmode_coeff(
+        port_name, ports, sim_dict, port_mode=port_mode, kpoints=kpoints
+    )
+    if cache is not None and kpoints is None:
+        set_cached_kpoints(cache, eigenmode_key, sim_dict["freqs"], solved_kpoints)
+    return coeff_in, coeff_out
+
 
+def _get_port_eigenmode_coeff(
+    port_name: str,
+    ports: dict[str, Port],
+    sim_dict: dict,
+    port_mode: int = 0,
+    kpoints: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns ingoing and outgoing coefficients and the solved wavevector magnitudes.
+
+    Args:
+        port_name: port name.
+        ports: component_ref.ports.
+        sim_dict: simulation dict.
+        port_mode: mode number.
+        kpoints: wavevector magnitudes at sim_dict["freqs"] used as MPB
+            starting points. None to start from the port direction.
     """
     if port_name not in ports:
         port_names = [port.name for port in ports]
@@ -98,11 +172,16 @@ def parse_port_eigenmode_coeff(
             f"Port orientation {orientation!r} not in 0, 90, 180, or 270 degrees!"
         )
 
+    def kpoint_func(freq: float, band: int) -> mp.Vector3:
+        if kpoints is None:
+            return kpoint
+        index = np.argmin(np.abs(sim_dict["freqs"] - freq))
+        return kpoint * kpoints[index]
+
     # Get port coeffs
     monitor_coeff = sim.get_eigenmode_coefficients(
-        monitors[port_name], [port_mode + 1], kpoint_func=lambda f, n: kpoint
+        monitors[port_name], [port_mode + 1], kpoint_func=kpoint_func
     )
-
     coeff_in = monitor_coeff.alpha[
         0, :, idx_in
     ]  # ingoing (w.r.t. simulation cell) wave
@@ -110,7 +189,145 @@ def parse_port_eigenmode_coeff(
         0, :, idx_out
     ]  # outgoing (w.r.t. simulation cell) wave
 
-    return coeff_in, coeff_out
+    return coeff_in, coeff_out, np.array([k.norm() for k in monitor_coeff.kpoints])
+
+
+def stop_when_sparameters_converged(
+    get_sparameters: Callable[[], dict[str, np.ndarray]],
+    dt: float = 50,
+    tolerance: float = 1e-3,
+    window: int = 3,
+    max_time: float | None = None,
+    min_time: float = 0,
+    record: dict[str, Any] | None = None,
+) -> Callable[[mp.Simulation], bool]:
+    """Returns a Meep stop condition for converged S-parameters.
+
+    Every `dt` time units the S-parameters are evaluated from the mode monitors
+    and compared with the previous evaluation. The simulation stops once the
+    largest change over all S-parameters and frequencies, relative to the
+    largest |S|, stays below tolerance for `window` consecutive evaluations,
+    or after `max_time`.
+
+    Evaluations only start `min_time` after the sources turn off, and only
+    count towards the window while some |S| is nonzero, so that the run does
+    not stop on the all-zero S-parameters seen before the pulse reaches the
+    monitors.
+
+    Args:
+        get_sparameters: returns the current S-parameters.
+        dt: time between evaluations in Meep time units.
+        tolerance: maximum max|ΔS| / max|S| between evaluations.
+        window: number of consecutive evaluations below tolerance.
+        max_time: stops after this Meep time even if not converged.
+        min_time: Meep time after the last source time before evaluating,
+            for example the port to port transit time.
+        record: filled with the convergence history (delta, time, converged).
+    """
+    record = {} if record is None else record
+    record.update(delta=[], converged=False, time=None, evaluations=0)
+    state = dict(next_time=None, previous=None, count=0)
+
+    def condition(sim: mp.Simulation) -> bool:
+        time = sim.meep_time()
+        if max_time is not None and time >= max_time:
+            record["time"] = time
+            return True
+        if min_time and time < sim.fields.last_source_time() + min_time:
+            return False
+        if state["next_time"] is None:
+            state["next_time"] = time + dt
+        if time < state["next_time"]:
+            return False
+        state["next_time"] = time + dt
+
+        sp = get_sparameters()
+        record["evaluations"] += 1
+        current = np.stack([sp[key] for key in sorted(sp)])
+        scale = float(np.max(np.abs(current)))
+        if state["previous"] is not None and scale > 0:
+            delta = float(np.max(np.abs(current - state["previous"]))) / scale
+            record["delta"].append(delta)
+            state["count"] = state["count"] + 1 if delta < tolerance else 0
+        else:
+            state["count"] = 0
+        state["previous"] = current
+        record["time"] = time
+        record["converged"] = state["count"] >= window
+        return record["converged"]
+
+    return condition
+
+
+def _get_transit_time(sim_dict: dict[str, Any]) -> float:
+    """Returns the Meep time light takes to cross the cell at the highest index."""
+    sim = sim_dict["sim"]
+    fcen = float(np.mean(sim_dict["freqs"]))
+    media = [sim.default_material] + [obj.material for obj in sim.geometry]
+    n_max = max(
+        [
+            float(np.sqrt(np.max(np.real(np.asarray(medium.epsilon(fcen))))))
+            for medium in media
+            if isinstance(medium, mp.Medium)
+        ],
+        default=1.0,
+    )
+    return sim_dict["cell_size"].norm() * n_max
+
+
+def _dump_checkpoint(
+    sim: mp.Simulation,
+    dirpath: pathlib.Path,
+    record: dict[str, Any] | None = None,
+) -> None:
+    """Dumps structure and fields to dirpath / "fields", replacing the previous dump.
+
+    The DFT convergence record so far, if any, is saved with the fields.
+    """
+    fields_dir = dirpath / "fields"
+    temp_dir = dirpath / "fields.tmp"
+    sim.dump(str(temp_dir), dump_structure=True, dump_fields=True)
+    if mp.am_master():
+        if record:
+            (temp_dir / "convergence.yml").write_text(yaml.safe_dump(record))
+        shutil.rmtree(fields_dir, ignore_errors=True)
+        temp_dir.rename(fields_dir)
+    mp.all_wait()
+
+
+def _save_checkpoint(
+    sp: dict[str, np.ndarray],
+    filepath: pathlib.Path,
+    record: dict[str, Any] | None = None,
+) -> None:
+    """Atomically saves the S-parameters and convergence record of a finished excitation."""
+    if mp.am_master():
+        if record:
+            filepath.with_suffix(".yml").write_text(yaml.safe_dump(record))
+        temp_file = filepath.with_suffix(".tmp.npz")
+        np.savez(temp_file, **sp)
+        temp_file.replace(filepath)
+
+
+def _pop_convergence(sp: dict[str, Any], sim_settings: dict[str, Any]) -> None:
+    """Moves the DFT convergence records of the excitations to sim_settings."""
+    convergence = {
+        key[len(_convergence_prefix) :]: sp.pop(key)
+        for key in list(sp)
+        if key.startswith(_convergence_prefix)
+    }
+    if convergence:
+        sim_settings.update(
+            convergence={
+                excitation: dict(
+                    converged=record["converged"],
+                    time=record["time"],
+                    max_delta=record["delta"][-1] if record["delta"] else None,
+                    evaluations=record["evaluations"],
+                )
+                for excitation, record in convergence.items()
+            }
+        )
 
 
 def write_sparameters_meep(
@@ -118,7 +335,7 @@ def write_sparameters_meep(
     port_source_names: list[str] | None = None,
     port_source_modes: dict[str, list] | None = None,
     port_modes: list[int] | None = None,
-    port_symmetries: PortSymmetries | None = None,
+    port_symmetries: PortSymmetries | str | None = None,
     resolution: int = 30,
     wavelength_start: float = 1.5,
     wavelength_stop: float = 1.6,
@@ -134,6 +351,7 @@ def write_sparameters_meep(
     animate_center: tuple[float, float, float] | None = None,
     animate_size: tuple[float, float, float] | None = None,
     lazy_parallelism: bool = False,
+    processes: int | None = None,
     run: bool = True,
     dispersive: bool = False,
     xmargin: float = 0,
@@ -146,11 +364,21 @@ def write_sparameters_meep(
     zmargin_top: float = 0,
     zmargin_bot: float = 0,
     decay_by: float = 1e-3,
+    termination: str = "energy",
+    dft_tolerance: float = 1e-3,
+    dft_window: int = 3,
+    dft_dt: float = 50,
+    dft_max_time: float | None = 5000,
+    dft_min_time: float | None = None,
     is_3d: bool = False,
+    effective_index: bool = False,
     z: float = 0,
     plot_args: dict | None = None,
     only_return_filepath_sim_settings=False,
     verbosity: int = 0,
+    eigenmode_cache: PathType | bool = True,
+    checkpoint_dir: PathType | None = None,
+    checkpoint_interval: float = 500,
     **settings,
 ) -> dict[str, np.ndarray]:
     r"""Returns Sparameters and writes them to npz filepath.
@@ -172,6 +400,12 @@ def write_sparameters_meep(
         when this source is active
     - The values of this inner Dict are lists of s-parameters whose values are copied
 
+    With `port_symmetries="auto"` the symmetries are detected from the component
+    geometry (see `gplugins.common.utils.port_symmetries.get_symmetries`). Only
+    the ports needed are excited (unless port_source_names is set), and mirror
+    planes through the cell center that map the source port to itself are
+    passed to Meep as `symmetries` for fundamental mode sources.
+
 
     .. code::
 
@@ -214,6 +448,7 @@ def write_sparameters_meep(
         resolution: in pixels/um (30: for coarse, 100: for fine).
         port_source_names: list of ports to excite. Defaults to all.
         port_symmetries: Dict to specify port symmetries, to save number of simulations.
+            "auto" detects them from the component geometry.
         dirpath: directory to store Sparameters.
         layer_stack: contains layer to thickness, zmin and material.
             Defaults to active pdk.layer_stack.
@@ -236,6 +471,10 @@ def write_sparameters_meep(
             So we use that n to select different sources, and each subdivision calculates
             its own Sparams independently. Afterwards, we collect all
             results in one of the subdivisions (if rank == 0).
+        processes: if > 1, runs each (port, mode) excitation as an independent
+            task in a pool of forked processes (no MPI needed) and merges the
+            results. Each process runs a full Meep simulation, so memory scales
+            with the number of processes.
         run: runs simulation, if False, only plots simulation.
         dispersive: use dispersive models for materials (requires higher resolution).
         xmargin: left and right distance from component to PML.
@@ -246,10 +485,38 @@ def write_sparameters_meep(
         ymargin_bot: south distance from component to PML.
         zmargin_top: +z distance from component to PML.
         zmargin_bot: -z distance from component to PML.
+        decay_by: field energy decay to stop the simulation (termination="energy").
+        termination: "energy" stops when the field energy decayed by decay_by.
+            "dft" stops when the S-parameters of all ports and frequencies change
+            by less than dft_tolerance over dft_window evaluations.
+        dft_tolerance: maximum change of the S-parameters between evaluations,
+            relative to the largest |S|, for termination="dft".
+        dft_window: consecutive evaluations below tolerance for termination="dft".
+        dft_dt: Meep time between evaluations for termination="dft".
+        dft_max_time: Meep time limit for termination="dft".
+        dft_min_time: Meep time after the sources turn off before the first
+            evaluation for termination="dft". Defaults to the time light takes
+            to cross the simulation cell at the highest material index.
         is_3d: if True runs in 3D (much slower).
+        effective_index: runs a 2D simulation of the effective index reduction of
+            the component and layer stack, for fast first-pass S-parameters.
+            Each region is replaced by the TM slab mode index of its vertical
+            profile at the center wavelength, as the 2D simulation excites Ez (see
+            `gplugins.common.utils.effective_index.get_effective_index_component`).
         z: for 2D plot.
         plot_args: if animate or not run, customization keyword arguments passed to
           `plot2D()` (i.e. `labels`, `eps_parameters`, `boundary_parameters`, `field_parameters`, etc.)
+        eigenmode_cache: caches the port eigenmode wavevectors by port cross-section,
+            materials, frequencies and resolution, and uses them as MPB starting
+            points for sources and monitors. A directory, True for
+            GDSDIR_TEMP / "eigenmodes" or False to disable.
+        checkpoint_dir: if set, every checkpoint_interval Meep time units the fields
+            and structure of the running excitation are dumped to
+            checkpoint_dir / filepath.stem, and the S-parameters of finished
+            excitations are saved there, together with their DFT convergence
+            records. A rerun resumes the interrupted excitation from its last dump
+            and skips the finished ones.
+        checkpoint_interval: Meep time between checkpoints.
 
     Keyword Args:
         extend_ports_length: to extend ports beyond the PML (um).
@@ -287,6 +554,11 @@ def write_sparameters_meep(
 
     port_symmetries = port_symmetries or {}
 
+    if termination not in ("energy", "dft"):
+        raise ValueError(f"termination = {termination!r} not in ('energy', 'dft')")
+    if effective_index and is_3d:
+        raise ValueError("effective_index runs 2D simulations, set is_3d=False")
+
     xmargin_left = xmargin_left or xmargin
     xmargin_right = xmargin_right or xmargin
 
@@ -315,6 +587,17 @@ def write_sparameters_meep(
         is_3d=is_3d,
         **settings,
     )
+    if termination == "dft":
+        sim_settings.update(
+            termination=termination,
+            dft_tolerance=dft_tolerance,
+            dft_window=dft_window,
+            dft_dt=dft_dt,
+            dft_max_time=dft_max_time,
+            dft_min_time=dft_min_time,
+        )
+    if effective_index:
+        sim_settings.update(effective_index=effective_index)
 
     filepath = filepath or get_sparameters_path(
         component=component,
@@ -347,16 +630,87 @@ def write_sparameters_meep(
         right=xmargin_right,
     )
 
+    if effective_index:
+        material_name_to_meep = settings.get("material_name_to_meep") or {}
+        wavelength = (wavelength_start + wavelength_stop) / 2
+
+        def get_index(name: str, wavelength: float) -> float:
+            medium = get_material(
+                name=name,
+                wavelength=wavelength,
+                material_name_to_meep=material_name_to_meep,
+            )
+            return float(np.real(medium.epsilon(1 / wavelength)[0][0]) ** 0.5)
+
+        component, layer_stack, neffs = get_effective_index_component(
+            component,
+            layer_stack=layer_stack,
+            get_index=get_index,
+            wavelength=wavelength,
+            clad_material=settings.get("clad_material", "SiO2"),
+            # the 2D simulation excites Ez, normal to the film
+            polarization="tm",
+        )
+        settings["material_name_to_meep"] = material_name_to_meep | {
+            f"neff_{name}": neff for name, neff in neffs.items()
+        }
+        sim_settings["effective_indices"] = neffs
+
     dummy = Component()
     component_ref = dummy << component
     ports = component_ref.ports
     port_names = [port.name for port in ports]
+
+    mirrors = {}
+    if port_symmetries == "auto":
+        detected = get_symmetries(component, port_modes=port_modes or [0])
+        port_symmetries = detected.port_symmetries
+        port_source_names = port_source_names or detected.port_source_names
+        # the Meep cell is centered at the origin
+        if np.allclose(detected.center, 0):
+            mirrors = {name: detected.get_mirrors([name]) for name in port_names}
+        logger.info(
+            f"Detected symmetries {list(detected.port_maps)}, "
+            f"exciting {port_source_names}"
+        )
+
     port_source_names = port_source_names or port_names
     port_source_modes = port_source_modes or {key: [0] for key in port_source_names}
     port_modes = port_modes or [0]
+    excitations = [
+        (port_source_name, port_source_mode)
+        for port_source_name in port_source_names
+        for port_source_mode in port_source_modes.get(port_source_name, [0])
+    ]
 
     num_sims = len(port_source_names) - len(port_symmetries)
 
+    freqs = 1 / np.linspace(wavelength_start, wavelength_stop, wavelength_points)
+    eigenmode_keys = {
+        (port.name, port_mode): get_port_cross_section_hash(
+            component,
+            port,
+            port_margin=port_margin,
+            port_mode=port_mode,
+            freqs=freqs,
+            resolution=resolution,
+            layer_stack=sim_settings["layer_stack"],
+            dispersive=dispersive,
+            is_3d=is_3d,
+            zmargin_top=zmargin_top,
+            zmargin_bot=zmargin_bot,
+            **settings,
+        )
+        for port in component.ports
+        for port_mode in {*port_modes, *port_source_modes.get(port.name, [0])}
+    }
+    cache = (
+        get_eigenmode_cache(None if eigenmode_cache is True else eigenmode_cache)
+        if eigenmode_cache
+        else None
+    )
+    cache_stats = (cache.stats.hits, cache.stats.misses) if cache else (0, 0)
+
     # set verbosity
     mp.verbosity(verbosity)
 
@@ -391,16 +745,43 @@ def write_sparameters_meep(
             sim.plot2D(plot_eps_flag=True, **plot_args)
         return sim
 
-    if filepath.exists():
-        if not overwrite:
+    if not overwrite:
+        sp = load_sparameters(filepath)
+        if sp is not None:
             logger.info(f"Simulation loaded from {filepath!r}")
-            return dict(np.load(filepath))
-        elif overwrite:
-            filepath.unlink()
+            return sp
 
     sp = {}  # Sparameters dict
     start = time.time()
 
+    checkpoint_path = None
+    if checkpoint_dir:
+        checkpoint_path = pathlib.Path(checkpoint_dir) / filepath.stem
+        if overwrite:
+            shutil.rmtree(checkpoint_path, ignore_errors=True)
+        checkpoint_path.mkdir(parents=True, exist_ok=True)
+
+        finished = []
+        for port_source_name, port_source_mode in excitations:
+            excitation_file = (
+                checkpoint_path / f"{port_source_name}@{port_source_mode}.npz"
+            )
+            if excitation_file.exists():
+                sp.update(dict(np.load(excitation_file)))
+                record_file = excitation_file.with_suffix(".yml")
+                if record_file.exists():
+                    sp[
+                        f"{_convergence_prefix}{port_source_name}@{port_source_mode}"
+                    ] = yaml.safe_load(record_file.read_text())
+                finished.append((port_source_name, port_source_mode))
+        if finished:
+            logger.info(f"Resuming {filepath.stem!r}, skipping finished {finished}")
+            excitations = [e for e in excitations if e not in finished]
+            for key, symmetries in port_symmetries.items():
+                for sym in symmetries:
+                    if key in sp:
+                        sp[sym] = sp[key]
+
     def sparameter_calculation(
         port_source_name: str,
         component: Component,
@@ -419,6 +800,21 @@ def write_sparameters_meep(
         **settings,
     ) -> dict:
         """Return Sparameter dict."""
+        if (
+            port_source_mode == 0
+            and mirrors.get(port_source_name)
+            and "symmetries" not in settings
+        ):
+            settings["symmetries"] = [
+                mp.Mirror(mp.X if axis == "x" else mp.Y, phase=-1 if is_3d else 1)
+                for axis in mirrors[port_source_name]
+            ]
+        source_key = eigenmode_keys[port_source_name, port_source_mode]
+        source_kpoints = (
+            get_cached_kpoints(cache, source_key, np.mean(freqs))
+            if cache is not None
+            else None
+        )
         sim_dict = get_simulation(
             component=component,
             port_source_name=port_source_name,
@@ -433,6 +829,7 @@ def write_sparameters_meep(
             dispersive=dispersive,
             layer_stack=layer_stack,
             is_3d=is_3d,
+            port_source_kpoint=None if source_kpoints is None else source_kpoints[0],
             **settings,
         )
 
@@ -441,8 +838,85 @@ def write_sparameters_meep(
         # wavelengths = 1 / freqs
         # print(sim.resolution)
 
-        # Terminate when the area in the whole area decayed
-        termination = [mp.stop_when_energy_decayed(dt=50, decay_by=decay_by)]
+        # port wavevectors, looked up in the cache once per run instead of at
+        # every convergence check, and kept after the first solve
+        port_kpoints: dict[Any, np.ndarray | None] = {}
+
+        def get_port_coeff(
+            port_name: str, port_mode: int
+        ) -> tuple[np.ndarray, np.ndarray]:
+            eigenmode_key = eigenmode_keys.get((port_name, port_mode))
+            key = eigenmode_key or (port_name, port_mode)
+            if key not in port_kpoints:
+                port_kpoints[key] = (
+                    get_cached_kpoints(cache, eigenmode_key, sim_dict["freqs"])
+                    if cache is not None and eigenmode_key
+                    else None
+                )
+            coeff_in, coeff_out, kpoints = _get_port_eigenmode_coeff(
+                port_name,
+                component.ports,
+                sim_dict,
+                port_mode=port_mode,
+                kpoints=port_kpoints[key],
+            )
+            if port_kpoints[key] is None:
+                port_kpoints[key] = kpoints
+                if cache is not None and eigenmode_key:
+                    set_cached_kpoints(cache, eigenmode_key, sim_dict["freqs"], kpoints)
+            return coeff_in, coeff_out
+
+        def get_sparameters() -> dict[str, np.ndarray]:
+            source_entering, _ = get_port_coeff(port_source_name, port_source_mode)
+            sp_excitation = {}
+            for port_name in port_names:
+                for port_mode in port_modes:
+                    _, monitor_exiting = get_port_coeff(port_name, port_mode)
+                    key = (
+                        f"{port_name}@{port_mode},{port_source_name}@{port_source_mode}"
+                    )
+                    sp_excitation[key] = monitor_exiting / source_entering
+            return sp_excitation
+
+        convergence = {}
+        if termination == "dft":
+            stop_conditions = [
+                stop_when_sparameters_converged(
+                    get_sparameters,
+                    dt=dft_dt,
+                    tolerance=dft_tolerance,
+                    window=dft_window,
+                    max_time=dft_max_time,
+                    min_time=_get_transit_time(sim_dict)
+                    if dft_min_time is None
+                    else dft_min_time,
+                    record=convergence,
+                )
+            ]
+        else:
+            # Terminate when the area in the whole area decayed
+            stop_conditions = [mp.stop_when_energy_decayed(dt=50, decay_by=decay_by)]
+
+        step_functions = []
+        resumed = {}
+        if checkpoint_path is not None:
+            excitation_path = checkpoint_path / f"{port_source_name}@{port_source_mode}"
+            fields_dir = excitation_path / "fields"
+            if fields_dir.exists():
+                logger.info(f"Loading checkpoint {excitation_path}")
+                sim.load(str(fields_dir), load_structure=True, load_fields=True)
+                if (fields_dir / "convergence.yml").exists():
+                    resumed = yaml.safe_load(
+                        (fields_dir / "convergence.yml").read_text()
+                    )
+            step_functions.append(
+                mp.at_every(
+                    checkpoint_interval,
+                    partial(
+                        _dump_checkpoint, dirpath=excitation_path, record=convergence
+                    ),
+                )
+            )
 
         if animate:
             # Defaults for animation
@@ -479,29 +953,37 @@ def write_sparameters_meep(
                     sim,
                     **plot_args,
                 )
-            sim.run(mp.at_every(1, animate), until_after_sources=termination)
+            sim.run(
+                mp.at_every(1, animate),
+                *step_functions,
+                until_after_sources=stop_conditions,
+            )
             animate.to_mp4(
                 30, f"{component.name}_{port_source_name}_{port_source_mode}.mp4"
             )
         else:
-            sim.run(until_after_sources=termination)
+            sim.run(*step_functions, until_after_sources=stop_conditions)
+
+        if resumed:
+            # the convergence window restarts after a resume, the history does not
+            convergence.update(
+                delta=resumed["delta"] + convergence["delta"],
+                evaluations=resumed["evaluations"] + convergence["evaluations"],
+            )
 
         # Calculate mode overlaps
-        # Get source monitor results
-        source_entering, _ = parse_port_eigenmode_coeff(
-            port_source_name, component.ports, sim_dict, port_mode=port_source_mode
-        )
-        # Get coefficients
-        for port_name in port_names:
-            for port_mode in port_modes:
-                _, monitor_exiting = parse_port_eigenmode_coeff(
-                    port_name,
-                    component.ports,
-                    sim_dict,
-                    port_mode=port_mode,
-                )
-                key = f"{port_name}@{port_mode},{port_source_name}@{port_source_mode}"
-                sp[key] = monitor_exiting / source_entering
+        sp_excitation = get_sparameters()
+        sp.update(sp_excitation)
+        if checkpoint_path is not None:
+            _save_checkpoint(
+                sp_excitation, excitation_path.with_suffix(".npz"), record=convergence
+            )
+            if mp.am_master():
+                shutil.rmtree(excitation_path, ignore_errors=True)
+        if convergence:
+            sp[f"{_convergence_prefix}{port_source_name}@{port_source_mode}"] = (
+                convergence
+            )
 
         if bool(port_symmetries):
             for key, symmetries in port_symmetries.items():
@@ -543,46 +1025,89 @@ def write_sparameters_meep(
                 data = comm.recv(source=i, tag=11)
                 sp.update(data)
 
+            _pop_convergence(sp, sim_settings)
             sp["wavelengths"] = np.linspace(
                 wavelength_start, wavelength_stop, wavelength_points
             )
-            np.savez_compressed(filepath, **sp)
+            save_sparameters(filepath, sp, component=component.name, tool="meep")
             logger.info(f"Write simulation results to {filepath!r}")
             filepath_sim_settings.write_text(yaml.dump(clean_value_json(sim_settings)))
             logger.info(f"Write simulation settings to {filepath_sim_settings!r}")
             return sp
         else:
             comm.send(sp, dest=0, tag=11)
+            return sp
+
+    elif processes and processes > 1 and len(excitations) > 1:
+        global _pool_sparameter_calculation
+        _pool_sparameter_calculation = partial(
+            sparameter_calculation,
+            component=component,
+            port_symmetries=port_symmetries,
+            wavelength_start=wavelength_start,
+            wavelength_stop=wavelength_stop,
+            wavelength_points=wavelength_points,
+            animate=animate,
+            port_names=port_names,
+            **settings,
+        )
+        processes = min(processes, len(excitations))
+        try:
+            with multiprocessing.get_context("fork").Pool(processes) as pool:
+                for sp_excitation in tqdm(
+                    pool.imap_unordered(_run_pool_excitation, excitations),
+                    total=len(excitations),
+                ):
+                    sp.update(sp_excitation)
+        finally:
+            _pool_sparameter_calculation = None
+
+        # symmetries may map keys computed by different excitations
+        for key, symmetries in port_symmetries.items():
+            for sym in symmetries:
+                if key in sp:
+                    sp[sym] = sp[key]
 
     else:
-        for port_source_name in tqdm(port_source_names):
-            for port_source_mode in port_source_modes[port_source_name]:
-                sp.update(
-                    sparameter_calculation(
-                        port_source_name,
-                        port_source_mode=port_source_mode,
-                        component=component,
-                        port_symmetries=port_symmetries,
-                        wavelength_start=wavelength_start,
-                        wavelength_stop=wavelength_stop,
-                        wavelength_points=wavelength_points,
-                        animate=animate,
-                        port_names=port_names,
-                        **settings,
-                    )
+        for port_source_name, port_source_mode in tqdm(excitations):
+            sp.update(
+                sparameter_calculation(
+                    port_source_name,
+                    port_source_mode=port_source_mode,
+                    component=component,
+                    port_symmetries=port_symmetries,
+                    wavelength_start=wavelength_start,
+                    wavelength_stop=wavelength_stop,
+                    wavelength_points=wavelength_points,
+                    animate=animate,
+                    port_names=port_names,
+                    **settings,
                 )
-        sp["wavelengths"] = np.linspace(
-            wavelength_start, wavelength_stop, wavelength_points
+            )
+
+    _pop_convergence(sp, sim_settings)
+    sp["wavelengths"] = np.linspace(
+        wavelength_start, wavelength_stop, wavelength_points
+    )
+    save_sparameters(filepath, sp, component=component.name, tool="meep")
+    if checkpoint_path is not None:
+        shutil.rmtree(checkpoint_path, ignore_errors=True)
+
+    end = time.time()
+    if cache is not None:
+        # counters of forked pool workers are not collected
+        eigenmode_cache_stats = dict(
+            hits=cache.stats.hits - cache_stats[0],
+            misses=cache.stats.misses - cache_stats[1],
         )
-        np.savez_compressed(filepath, **sp)
-
-        end = time.time()
-        sim_settings.update(compute_time_seconds=end - start)
-        sim_settings.update(compute_time_minutes=(end - start) / 60)
-        logger.info(f"Write simulation results to {filepath!r}")
-        filepath_sim_settings.write_text(yaml.dump(sim_settings))
-        logger.info(f"Write simulation settings to {filepath_sim_settings!r}")
-        return sp
+        logger.info(f"Eigenmode cache {eigenmode_cache_stats}")
+        sim_settings.update(eigenmode_cache=eigenmode_cache_stats)
+    sim_settings.update(compute_time_seconds=end - start)
+    sim_settings.update(compute_time_minutes=(end - start) / 60)
+    logger.info(f"Write simulation results to {filepath!r}")
+    filepath_sim_settings.write_text(yaml.dump(sim_settings))
+    logger.info(f"Write simulation settings to {filepath_sim_settings!r}")
+    return sp
 
 
 write_sparameters_meep_1x1 = partial(
@@ -4,35 +4,92 @@ from __future__ import annotations
 
 import multiprocessing
 import pathlib
+import shlex
 import shutil
+import subprocess
+import tempfile
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from functools import partial
 from pathlib import Path
-from pprint import pprint
 
 import gdsfactory as gf
 import numpy as np
+import yaml
 from gdsfactory import logger
-from gdsfactory.component import Component
 from gdsfactory.config import sparameters_path
 from gdsfactory.pdk import get_layer_stack
 from gdsfactory.technology import LayerStack
-from tqdm.auto import tqdm
 
 from gplugins.common.utils import port_symmetries
 from gplugins.common.utils.get_sparameters_path import (
     get_sparameters_path_meep as get_sparameters_path,
 )
+from gplugins.gmeep.worker import get_worker_command, submit_job
 from gplugins.gmeep.write_sparameters_meep import remove_simulation_kwargs
-from gplugins.gmeep.write_sparameters_meep_mpi import (
-    write_sparameters_meep_mpi,
-)
 
 core_materials = multiprocessing.cpu_count()
 
 temp_dir_default = Path(sparameters_path) / "temp"
 
 
+def _run_command(command: str, log_file: Path) -> int:
+    """Runs command until the process exits and returns its exit code."""
+    with open(log_file, "w") as f:
+        return subprocess.run(
+            shlex.split(command), stdout=f, stderr=subprocess.STDOUT, check=False
+        ).returncode
+
+
+def get_job_cores(
+    jobs: list[dict],
+    cores_per_run: int = 2,
+    total_cores: int = 4,
+    weight_by_volume: bool = False,
+    **kwargs,
+) -> list[int]:
+    """Returns the number of cores for each job.
+
+    Jobs can set their own `cores`. Otherwise each job gets `cores_per_run`, or
+    if `weight_by_volume` a share scaled by its estimated cell volume relative to
+    the median job, so large simulations get more cores than small ones.
+    Components are only built to estimate volumes when `weight_by_volume` is
+    set, and only for jobs without their own `cores`.
+
+    Args:
+        jobs: list of write_sparameters_meep settings.
+        cores_per_run: number of cores for a median sized job.
+        total_cores: maximum number of cores for any job.
+        weight_by_volume: scale cores by estimated cell volume.
+        kwargs: default settings shared by all jobs.
+    """
+    # only build components to estimate volumes for jobs that need them
+    volumes: dict[int, float] = {}
+    if weight_by_volume:
+        for i, job in enumerate(jobs):
+            if "cores" in job:
+                continue
+            settings = {**kwargs, **job}
+            component = gf.get_component(settings["component"])
+            resolution = settings.get("resolution", 30)
+            volume = component.xsize * component.ysize * resolution**2
+            if settings.get("is_3d", False):
+                volume *= resolution
+            volumes[i] = volume
+
+    median_volume = float(np.median(list(volumes.values()))) if volumes else 0.0
+    cores = []
+    for i, job in enumerate(jobs):
+        if "cores" in job:
+            ncores = job["cores"]
+        elif i in volumes and median_volume > 0:
+            ncores = round(cores_per_run * volumes[i] / median_volume)
+        else:
+            ncores = cores_per_run
+        cores.append(int(np.clip(ncores, 1, total_cores)))
+    return cores
+
+
 def write_sparameters_meep_batch(
     jobs: list[dict],
     cores_per_run: int = 2,
@@ -41,25 +98,37 @@ def write_sparameters_meep_batch(
     delete_temp_files: bool = True,
     dirpath: Path | None = None,
     layer_stack: LayerStack | None = None,
+    weight_by_volume: bool = False,
+    checkpoint_dir: Path | None = None,
     **kwargs,
 ) -> list[Path]:
     """Write Sparameters for a batch of jobs using MPI and returns results filepaths.
 
-    Given a list of write_sparameters_meep keyword arguments `jobs` launches them in
-    different cores using MPI where each simulation runs with `cores_per_run` cores.
-    If there are more simulations than cores each batch runs sequentially.
-
+    Given a list of write_sparameters_meep keyword arguments `jobs` queues them
+    and runs them on :mod:`gplugins.gmeep.worker` processes, each with the
+    number of cores of its jobs (`cores_per_run` by default). Jobs with the same
+    number of cores share a queue, and each worker keeps running jobs from its
+    queue until it is empty, paying the Python and meep import cost once per
+    worker instead of once per job. A new worker starts as soon as a running
+    one exits and enough cores are free, so a slow simulation does not keep the
+    other cores idle.
 
     Args:
         jobs: list of Dicts containing the simulation settings for each job.
-            for write_sparameters_meep.
+            for write_sparameters_meep. A job can set its own `cores`.
         cores_per_run: number of processors to assign to each component simulation.
         total_cores: total number of cores to use.
-        temp_dir: temporary directory to hold simulation files.
-        delete_temp_files: deletes temp_dir when done.
+        temp_dir: directory for the queue of the batch, a new one for each batch.
+        delete_temp_files: deletes the queue of the batch when all jobs and
+            workers succeed. The wall time of each job is logged either way.
         dirpath: directory to store Sparameters.
         layer_stack: contains layer to thickness, zmin and material.
             Defaults to active pdk.layer_stack.
+        weight_by_volume: scale cores per job by estimated cell volume
+            (`cores_per_run` for the median job).
+        checkpoint_dir: checkpoints of every job (see write_sparameters_meep).
+            Rerunning the batch resumes interrupted jobs from their last checkpoint
+            and skips finished excitations. Not deleted with the queue.
 
     Keyword Args:
         resolution: in pixels/um (30: for coarse, 100: for fine).
@@ -102,92 +171,120 @@ def write_sparameters_meep_batch(
 
     """
     layer_stack = layer_stack or get_layer_stack()
+    temp_dir = pathlib.Path(temp_dir)
+    temp_dir.mkdir(exist_ok=True, parents=True)
+    # a new queue for each batch, so jobs left by an aborted batch are not run
+    queue_dir = pathlib.Path(tempfile.mkdtemp(prefix="batch_", dir=temp_dir))
+    if checkpoint_dir:
+        kwargs.update(checkpoint_dir=pathlib.Path(checkpoint_dir))
+
+    cores = get_job_cores(
+        jobs,
+        cores_per_run=cores_per_run,
+        total_cores=total_cores,
+        weight_by_volume=weight_by_volume,
+        **kwargs,
+    )
+    njobs = len(jobs)
+    logger.info(f"Running {njobs} simulations on {total_cores} cores")
 
-    # Parse jobs
-    jobs_to_run = []
-    for job in jobs:
-        component = job["component"]
-        component = gf.get_component(component)
-        assert isinstance(component, Component)
-        settings = remove_simulation_kwargs(kwargs)
-        filepath = job.get(
-            "filepath",
-            get_sparameters_path(
-                component=component,
-                dirpath=dirpath,
-                layer_stack=layer_stack,
-                **settings,
-            ),
+    # jobs with the same number of cores share a queue
+    filepaths = []
+    descriptors: dict[str, Path] = {}
+    queued: dict[int, int] = {}
+    for job, ncores in zip(jobs, cores):
+        settings = {**kwargs, **job}
+        settings.pop("cores", None)
+        component = gf.get_component(settings.pop("component"))
+        job_layer_stack = settings.pop("layer_stack", layer_stack)
+        overwrite = settings.pop("overwrite", False)
+        filepath = settings.pop("filepath", None) or get_sparameters_path(
+            component=component,
+            dirpath=dirpath,
+            layer_stack=job_layer_stack,
+            **remove_simulation_kwargs(settings),
         )
-        if filepath.exists():
-            job.update(**kwargs)
-            if job.get("overwrite", kwargs.get("overwrite", False)):
-                pathlib.Path.unlink(filepath)
-                logger.info(
-                    f"Simulation {filepath!r} found and overwrite is True. "
-                    "Deleting file and adding it to the queue."
-                )
-                jobs_to_run.append(job)
-            else:
-                logger.info(
-                    f"Simulation {filepath!r} found exists and "
-                    "overwrite is False. Removing it from the queue."
-                )
-        else:
-            logger.info(f"Simulation {filepath!r} not found. Adding it to the queue")
-            jobs_to_run.append(job)
+        filepath = pathlib.Path(filepath)
+        filepaths.append(filepath)
+        if filepath.exists() and not overwrite:
+            logger.info(f"Simulation {filepath!r} already exists")
+            continue
+        descriptor = submit_job(
+            queue_dir / f"cores_{ncores}",
+            component=component,
+            filepath=filepath,
+            layer_stack=job_layer_stack,
+            overwrite=overwrite,
+            **settings,
+        )
+        descriptors[descriptor.stem] = filepath
+        queued[ncores] = queued.get(ncores, 0) + 1
 
-    jobs = jobs_to_run
+    running: dict[Future, tuple[int, float]] = {}
+    started = dict.fromkeys(queued, 0)
+    free_cores = total_cores
+    worker_failures = 0
+    start = time.time()
 
-    batches = int(np.ceil(cores_per_run * len(jobs) / total_cores))
-    jobs_per_batch = int(np.floor(total_cores / cores_per_run))
-    njobs = len(jobs)
-    logger.info(f"Running {njobs} simulations")
-    logger.info(f"total_cores = {total_cores} with cores_per_run = {cores_per_run}")
-    logger.info(f"Running {batches} batches with up to {jobs_per_batch} jobs each.")
-
-    i = 0
-    # For each batch in the pool
-    for j in tqdm(range(batches)):
-        filepaths = []
-
-        # For each job in the batch
-        for k in range(jobs_per_batch):
-            if i >= njobs:
-                continue
-            logger.info(f"Task {k} of batch {j} is job {i}")
-
-            # Obtain current job
-            simulations_settings = jobs[i]
-
-            pprint(simulations_settings)
-
-            filepath = write_sparameters_meep_mpi(
-                cores=cores_per_run,
-                temp_dir=temp_dir,
-                temp_file_str=f"write_sparameters_meep_mpi_{i}",
-                wait_to_finish=False,
-                **simulations_settings,
-            )
-            filepaths.append(filepath)
-
-            # Increment task number
-            i += 1
-
-        # Wait for batch to end
-        done = False
-        num_pool_jobs = len(filepaths)
-        while not done:
-            # Check if all jobs finished
-            jobs_done = sum(1 for filepath in filepaths if filepath.exists())
-            if jobs_done == num_pool_jobs:
-                done = True
-            else:
-                time.sleep(1)
+    with ThreadPoolExecutor(max_workers=max(njobs, 1)) as executor:
+        while True:
+            # Start workers on queues with more pending jobs than workers,
+            # never more workers than jobs in a queue
+            for ncores in sorted(queued, reverse=True):
+                queue = queue_dir / f"cores_{ncores}"
+                pending = len(list((queue / "pending").glob("*.pkl")))
+                workers = sum(c == ncores for c, _ in running.values())
+                while (
+                    pending > workers
+                    and started[ncores] < queued[ncores]
+                    and ncores <= free_cores
+                ):
+                    command = get_worker_command(queue, cores=ncores)
+                    log_file = queue_dir / f"worker_{sum(started.values())}.log"
+                    logger.info(f"Worker started with {ncores} cores: {command}")
+                    future = executor.submit(_run_command, command, log_file)
+                    running[future] = (ncores, time.time())
+                    free_cores -= ncores
+                    started[ncores] += 1
+                    workers += 1
 
-    temp_dir = pathlib.Path(temp_dir)
-    if temp_dir.exists() and delete_temp_files:
-        shutil.rmtree(temp_dir)
+            if not running:
+                break
+
+            # Block until any worker exits
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                ncores, worker_start = running.pop(future)
+                free_cores += ncores
+                returncode = future.result()
+                if returncode:
+                    worker_failures += 1
+                    logger.error(
+                        f"Worker with {ncores} cores failed with exit code "
+                        f"{returncode} after {time.time() - worker_start:.1f}s, "
+                        f"see logs in {queue_dir}"
+                    )
+
+    logger.info(
+        f"{sum(queued.values())} jobs finished in {time.time() - start:.1f}s "
+        f"on {sum(started.values())} workers"
+    )
+    for status in ("done", "failed"):
+        for record in sorted(queue_dir.glob(f"*/{status}/*.yml")):
+            elapsed = yaml.safe_load(record.read_text())["elapsed"]
+            logger.info(f"Job {descriptors[record.stem]} {status} in {elapsed:.1f}s")
+
+    # jobs left in running/ were lost with a crashed worker
+    failed = list(queue_dir.glob("*/failed/*.pkl"))
+    failed += queue_dir.glob("*/running/*.pkl")
+    failed += queue_dir.glob("*/pending/*.pkl")
+    if failed or worker_failures:
+        logger.error(
+            f"{len(failed)} jobs failed and {worker_failures} workers exited with "
+            f"an error, see logs in {queue_dir}"
+        )
+    elif delete_temp_files:
+        shutil.rmtree(queue_dir)
     return filepaths
 
 
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import multiprocessing
 import pathlib
-import pickle
 import shlex
 import subprocess
 import sys
@@ -24,6 +23,7 @@ from gplugins.common.utils import port_symmetries
 from gplugins.common.utils.get_sparameters_path import (
     get_sparameters_path_meep as get_sparameters_path,
 )
+from gplugins.gmeep.worker import get_worker_command, init_queue, submit_job
 from gplugins.gmeep.write_sparameters_meep import (
     remove_simulation_kwargs,
     settings_write_sparameters_meep,
@@ -34,11 +34,6 @@ core_materials = multiprocessing.cpu_count()
 temp_dir_default = GDSDIR_TEMP / "temp"
 
 
-def _python() -> str:
-    """Select correct python executable from current activated environment."""
-    return sys.executable
-
-
 def write_sparameters_meep_mpi(
     component: ComponentSpec,
     layer_stack: LayerStack | None = None,
@@ -127,73 +122,20 @@ def write_sparameters_meep_mpi(
         write stdout to file, maybe simulation logs too.
 
     """
-    for setting in kwargs:
-        if setting not in settings_write_sparameters_meep:
-            raise ValueError(f"{setting!r} not in {settings_write_sparameters_meep}")
-
-    component = gf.get_component(component)
-    assert isinstance(component, Component)
-
-    layer_stack = layer_stack or get_layer_stack()
-
-    settings = remove_simulation_kwargs(kwargs)
-    filepath = filepath or get_sparameters_path(
+    command, filepath = get_command_write_sparameters_meep_mpi(
         component=component,
-        dirpath=dirpath,
         layer_stack=layer_stack,
-        **settings,
+        cores=cores,
+        filepath=filepath,
+        dirpath=dirpath,
+        temp_dir=temp_dir,
+        temp_file_str=temp_file_str,
+        overwrite=overwrite,
+        **kwargs,
     )
-    filepath = pathlib.Path(filepath)
-    if filepath.exists() and not overwrite:
-        logger.info(f"Simulation {filepath!r} already exists")
+    if command is None:
         return filepath
 
-    if filepath.exists() and overwrite:
-        filepath.unlink()
-
-    # Save all the simulation arguments for later retrieval
-    temp_dir.mkdir(exist_ok=True, parents=True)
-    tempfile = temp_dir / temp_file_str
-    filepath_json = tempfile.with_suffix(".json")
-    logger.info(f"Write {filepath_json!r}")
-
-    layer_stack_json = layer_stack.json()
-    filepath_json.write_text(layer_stack_json)
-
-    parameters_file = tempfile.with_suffix(".pkl")
-    with open(parameters_file, "wb") as outp:
-        pickle.dump(settings, outp, pickle.HIGHEST_PROTOCOL)
-
-    # Save component to disk through gds
-    component_file = tempfile.with_suffix(".gds")
-    component.write_gds(component_file, with_metadata=True)
-
-    # Write execution file
-    script_lines = [
-        "import pathlib\n",
-        "import pickle\n",
-        "from gplugins.gmeep import write_sparameters_meep\n\n",
-        "from gdsfactory.read import import_gds\n",
-        "from gdsfactory.technology import LayerStack\n\n",
-        "if __name__ == '__main__':\n",
-        f"\twith open(\"{parameters_file}\", 'rb') as inp:\n",
-        "\t\tparameters_dict = pickle.load(inp)\n\n",
-        f"\tcomponent = import_gds({str(component_file)!r}, read_metadata=True)\n",
-        f"\tfilepath_json = pathlib.Path({str(filepath_json)!r})\n",
-        "\tlayer_stack = LayerStack.parse_raw(filepath_json.read_text())\n",
-        f"\twrite_sparameters_meep(component=component, overwrite={overwrite}, "
-        f"layer_stack=layer_stack, filepath={str(filepath)!r},",
-    ]
-    script_lines.extend(f'\t\t{key} = parameters_dict["{key}"],\n' for key in settings)
-    script_lines.append("\t)")
-
-    script_file = tempfile.with_suffix(".py")
-    with open(script_file, "w") as script_file_obj:
-        script_file_obj.writelines(script_lines)
-    command = f"mpirun -np {cores} {_python()} {script_file}"
-    logger.info(command)
-    logger.info(str(filepath))
-
     if live_output:
         import asyncio
 
@@ -225,6 +167,90 @@ def write_sparameters_meep_mpi(
     return filepath
 
 
+def get_command_write_sparameters_meep_mpi(
+    component: ComponentSpec,
+    layer_stack: LayerStack | None = None,
+    cores: int = core_materials,
+    filepath: PathType | None = None,
+    dirpath: PathType | None = None,
+    temp_dir: Path = temp_dir_default,
+    temp_file_str: str = "write_sparameters_meep_mpi",
+    overwrite: bool = False,
+    **kwargs,
+) -> tuple[str | None, Path]:
+    """Queues the simulation and returns (mpirun command, Sparameters filepath).
+
+    The command starts a :mod:`gplugins.gmeep.worker` that runs the queued job.
+    The command is None if the Sparameters already exist and overwrite is False.
+
+    Args:
+        component: gdsfactory Component.
+        layer_stack: contains layer to thickness, zmin and material.
+            Defaults to active pdk.layer_stack.
+        cores: number of processors.
+        filepath: to store Sparameters. Defaults to dirpath/component_.npz.
+        dirpath: directory to store sparameters.
+        temp_dir: temporary directory to hold simulation files.
+        temp_file_str: name of the queue directory in temp_dir. Jobs left pending
+            by an aborted call and finished jobs are cleared from it.
+        overwrite: overwrites stored simulation results.
+        kwargs: write_sparameters_meep settings.
+    """
+    for setting in kwargs:
+        if setting not in settings_write_sparameters_meep:
+            raise ValueError(f"{setting!r} not in {settings_write_sparameters_meep}")
+
+    component = gf.get_component(component)
+    assert isinstance(component, Component)
+
+    layer_stack = layer_stack or get_layer_stack()
+
+    settings = remove_simulation_kwargs(kwargs)
+    filepath = filepath or get_sparameters_path(
+        component=component,
+        dirpath=dirpath,
+        layer_stack=layer_stack,
+        **settings,
+    )
+    filepath = pathlib.Path(filepath)
+    if filepath.exists() and not overwrite:
+        logger.info(f"Simulation {filepath!r} already exists")
+        return None, filepath
+
+    if filepath.exists() and overwrite:
+        filepath.unlink()
+
+    # checkpoints do not change the results but the worker needs them
+    checkpoint = {
+        key: kwargs[key]
+        for key in ("checkpoint_dir", "checkpoint_interval")
+        if key in kwargs
+    }
+
+    # Hand the job to a worker that reads it from a queue directory, one per
+    # temp_file_str. Stale pending jobs are not run and finished ones do not
+    # pile up, jobs still running for another call are left alone
+    queue_dir = init_queue(pathlib.Path(temp_dir) / temp_file_str)
+    for status in ("pending", "done", "failed"):
+        for path in (queue_dir / status).iterdir():
+            path.unlink(missing_ok=True)
+            for job_file in (queue_dir / "jobs").glob(f"{path.stem}.*"):
+                job_file.unlink(missing_ok=True)
+    submit_job(
+        queue_dir,
+        component=component,
+        filepath=filepath,
+        layer_stack=layer_stack,
+        overwrite=overwrite,
+        **settings,
+        **checkpoint,
+    )
+    command = get_worker_command(queue_dir, cores=cores)
+    logger.info(command)
+    logger.info(str(filepath))
+    return command, filepath
+
+
 write_sparameters_meep_mpi_1x1 = partial(
     write_sparameters_meep_mpi, port_symmetries=port_symmetries.port_symmetries_1x1
 )
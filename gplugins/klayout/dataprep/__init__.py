@@ -1,19 +1,29 @@
-from gplugins.klayout.dataprep import regions
+from gplugins.klayout.dataprep import lazy, regions
+from gplugins.klayout.dataprep.lazy import LazyRegion, LazyRegionCollection
 from gplugins.klayout.dataprep.regions import (
     Region,
     RegionCollection,
+    Tiling,
+    benchmark_tiling,
     boolean_not,
     boolean_or,
     copy,
     size,
+    tiled,
 )
 
 __all__ = [
+    "LazyRegion",
+    "LazyRegionCollection",
     "Region",
     "RegionCollection",
+    "Tiling",
+    "benchmark_tiling",
     "boolean_not",
     "boolean_or",
     "copy",
+    "lazy",
     "regions",
     "size",
+    "tiled",
 ]
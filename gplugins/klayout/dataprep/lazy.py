@@ -0,0 +1,279 @@
+"""Lazy, hierarchical dataprep.
+
+Operations on a LazyRegionCollection are not executed right away, they are
+recorded into a DAG. Identical subexpressions are recorded once, so outputs
+sharing a subexpression reuse its result. The DAG is executed on hierarchical
+(deep) regions backed by a DeepShapeStore, so layers are never flattened.
+Nodes run one at a time in topological order, and KLayout parallelizes each
+deep operation over the `threads` of the DeepShapeStore.
+
+.. code::
+
+    from gdsfactory.generic_tech import LAYER
+    from gplugins.klayout.dataprep import LazyRegionCollection
+
+    d = LazyRegionCollection(gdspath, threads=8)
+    core = d[LAYER.WG] + 2  # recorded, not executed
+    d[LAYER.SLAB90] = core
+    d[LAYER.DEEP_ETCH] = core - d[LAYER.WG]  # reuses core
+    d.write_gds("out.gds")  # executes the DAG
+
+"""
+
+from __future__ import annotations
+
+import itertools
+
+import kfactory as kf
+from gdsfactory.config import get_number_of_cores
+from gdsfactory.typings import PathType
+from kfactory import kdb
+
+from gplugins.klayout.dataprep.regions import RegionCollection, _assert_is_layer
+
+commutative_operations = ("or", "and", "xor")
+
+
+class LazyRegion:
+    """Node of a dataprep DAG.
+
+    Supports the same operators as `Region`: `+` and `-` with a number size the
+    region (in um), with a region they are a boolean OR and NOT.
+    `&`, `|` and `^` are boolean AND, OR and XOR.
+
+    Args:
+        collection: collection that records the node.
+        operation: layer, size, smooth, or, not, and, xor.
+        inputs: input nodes.
+        value: layer for layer nodes, distance in um for size and smooth.
+        index: node id, unique in the collection.
+    """
+
+    def __init__(
+        self,
+        collection: LazyRegionCollection,
+        operation: str,
+        inputs: tuple[LazyRegion, ...],
+        value: tuple[int, int] | float | None,
+        index: int,
+    ) -> None:
+        """Records a node. Use the operators instead."""
+        self.collection = collection
+        self.operation = operation
+        self.inputs = inputs
+        self.value = value
+        self.index = index
+
+    def __repr__(self) -> str:
+        """Returns the recorded expression."""
+        if self.operation == "layer":
+            return f"layer{self.value}"
+        if self.operation in ("size", "smooth"):
+            return f"{self.operation}({self.inputs[0]!r}, {self.value})"
+        return f"{self.operation}({', '.join(repr(i) for i in self.inputs)})"
+
+    def _binary(self, operation: str, other: LazyRegion) -> LazyRegion:
+        if not isinstance(other, LazyRegion):
+            raise ValueError(f"Cannot {operation} type {type(other)} with region")
+        return self.collection._record(operation, (self, other))
+
+    def sized(self, offset: float) -> LazyRegion:
+        """Returns the region grown (or shrunk for negative offsets) by offset in um."""
+        if offset == 0:
+            return self
+        return self.collection._record("size", (self,), float(offset))
+
+    def smoothed(self, distance: float) -> LazyRegion:
+        """Returns the region smoothed with distance in um."""
+        return self.collection._record("smooth", (self,), float(distance))
+
+    def __add__(self, element: float | int | LazyRegion) -> LazyRegion:
+        """Sizes the region by a number or ORs it with another region."""
+        if isinstance(element, float | int):
+            return self.sized(element)
+        if isinstance(element, LazyRegion):
+            return self._binary("or", element)
+        raise ValueError(f"Cannot add type {type(element)} to region")
+
+    def __sub__(self, element: float | int | LazyRegion) -> LazyRegion:
+        """Shrinks the region by a number or subtracts another region."""
+        if isinstance(element, float | int):
+            return self.sized(-element)
+        if isinstance(element, LazyRegion):
+            return self._binary("not", element)
+        raise ValueError(f"Cannot subtract type {type(element)} from region")
+
+    def __or__(self, other: LazyRegion) -> LazyRegion:
+        """Boolean OR."""
+        return self._binary("or", other)
+
+    def __and__(self, other: LazyRegion) -> LazyRegion:
+        """Boolean AND."""
+        return self._binary("and", other)
+
+    def __xor__(self, other: LazyRegion) -> LazyRegion:
+        """Boolean XOR."""
+        return self._binary("xor", other)
+
+    def copy(self) -> LazyRegion:
+        """Returns the node. Nodes are immutable, so copies can be shared."""
+        return self
+
+
+class LazyRegionCollection(RegionCollection):
+    """A RegionCollection that records layer operations and executes them lazily.
+
+    Args:
+        gdspath: to read GDS from.
+        cell_name: optional top cell name to edit (defaults to the top cell of the layout if None).
+        threads: number of threads of the DeepShapeStore for each deep operation.
+    """
+
+    def __init__(
+        self,
+        gdspath: PathType,
+        cell_name: str | None = None,
+        threads: int = get_number_of_cores(),
+    ) -> None:
+        """Initializes the LazyRegionCollection."""
+        super().__init__(gdspath, cell_name=cell_name)
+        self.threads = threads
+        self.dss = kdb.DeepShapeStore()
+        self.dss.threads = threads
+        self.outputs: dict[tuple[int, int], LazyRegion] = {}
+        self.executed = 0
+        self._nodes: dict[tuple, LazyRegion] = {}
+        self._results: dict[int, kdb.Region] = {}
+        self._index = itertools.count()
+
+    def _record(
+        self,
+        operation: str,
+        inputs: tuple[LazyRegion, ...],
+        value: tuple[int, int] | float | None = None,
+    ) -> LazyRegion:
+        """Returns the node for an operation, reusing an identical one."""
+        indexes = tuple(node.index for node in inputs)
+        if operation in commutative_operations:
+            indexes = tuple(sorted(indexes))
+        key = (operation, indexes, value)
+        if key not in self._nodes:
+            self._nodes[key] = LazyRegion(
+                self, operation, inputs, value, next(self._index)
+            )
+        return self._nodes[key]
+
+    def __getitem__(self, layer: tuple[int, int]) -> LazyRegion:
+        """Gets a layer from the collection."""
+        _assert_is_layer(layer)
+        layer = tuple(layer)
+        if layer in self.outputs:
+            return self.outputs[layer]
+        return self._record("layer", (), layer)
+
+    def __setitem__(self, layer: tuple[int, int], region: LazyRegion) -> None:
+        """Sets a layer in the collection."""
+        _assert_is_layer(layer)
+        if not isinstance(region, LazyRegion):
+            raise ValueError(f"Expected a LazyRegion. Got {type(region)}")
+        self.outputs[tuple(layer)] = region
+
+    def __delitem__(self, layer: tuple[int, int]) -> None:
+        """Clears a layer."""
+        self[layer] = self[layer] - self[layer]
+
+    def _execute(self, node: LazyRegion) -> kdb.Region:
+        dbu = self.lib.dbu
+        if node.operation == "layer":
+            layer_index = self.lib.layer(*node.value)
+            iterator = self.layout.begin_shapes_rec(layer_index)
+            return kdb.Region(iterator, self.dss).merged()
+
+        regions = [self._results[i.index] for i in node.inputs]
+        if node.operation == "size":
+            return regions[0].sized(round(node.value / dbu))
+        if node.operation == "smooth":
+            return regions[0].smoothed(round(node.value / dbu))
+        if node.operation == "or":
+            return regions[0] | regions[1]
+        if node.operation == "not":
+            return regions[0] - regions[1]
+        if node.operation == "and":
+            return regions[0] & regions[1]
+        return regions[0] ^ regions[1]
+
+    def evaluate(
+        self, layers: list[tuple[int, int]] | None = None
+    ) -> dict[tuple[int, int], kdb.Region]:
+        """Executes the DAG and returns the deep region of each output layer.
+
+        Nodes run in topological order on the calling thread. KLayout Region
+        operations hold the GIL, so Python threads would not run branches in
+        parallel, and the DeepShapeStore is not meant to be used from several
+        threads at once. Each deep operation is instead parallelized by
+        KLayout over `threads`. Results are kept, so later evaluations only
+        execute newly recorded operations.
+
+        Args:
+            layers: output layers to evaluate. Defaults to all assigned layers.
+        """
+        layers = list(self.outputs) if layers is None else [tuple(i) for i in layers]
+        targets = [self.outputs.get(layer, self[layer]) for layer in layers]
+
+        # depth-first post-order: inputs run before the nodes that use them
+        order: list[LazyRegion] = []
+        visited: set[int] = set()
+        stack: list[tuple[LazyRegion, bool]] = [(node, False) for node in targets]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if node.index in self._results or node.index in visited:
+                continue
+            visited.add(node.index)
+            stack.append((node, True))
+            stack.extend((i, False) for i in node.inputs)
+
+        for node in order:
+            self._results[node.index] = self._execute(node)
+            self.executed += 1
+
+        return {
+            layer: self._results[node.index] for layer, node in zip(layers, targets)
+        }
+
+    def get_kcell(
+        self, keep_original: bool = True, cellname: str = "Unnamed"
+    ) -> kf.KCell:
+        """Executes the DAG and returns kfactory cell.
+
+        Output layers keep the hierarchy of the deep regions.
+
+        Args:
+            keep_original: keep original cell.
+            cellname: for top cell.
+        """
+        regions = self.evaluate()
+        c = super().get_kcell(keep_original=keep_original, cellname=cellname)
+        layout = c.kcl.layout
+        for layer, region in regions.items():
+            layer_index = layout.layer(*layer)
+            layout.clear_layer(layer_index)
+            region.insert_into(layout, c.cell_index(), layer_index)
+        return c
+
+
+if __name__ == "__main__":
+    import gdsfactory as gf
+    from gdsfactory.generic_tech import LAYER
+
+    gf.gpdk.PDK.activate()
+    c = gf.components.ring_single()
+    gdspath = c.write_gds()
+
+    d = LazyRegionCollection(gdspath)
+    core = d[LAYER.WG] + 2
+    d[LAYER.SLAB90] = core
+    d[LAYER.DEEP_ETCH] = core - d[LAYER.WG]
+    d.show()
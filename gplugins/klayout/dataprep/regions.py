@@ -1,25 +1,131 @@
+import time
 import uuid
+from dataclasses import dataclass
 from typing import Any
 
 import gdsfactory as gf
 import kfactory as kf
 from gdsfactory.component import GDSDIR_TEMP
+from gdsfactory.config import get_number_of_cores
 from gdsfactory.typings import PathType
 from kfactory import kdb
 
 
-def size(region: kdb.Region, offset: float, dbu=1e3) -> kdb.Region:
+@dataclass(frozen=True)
+class Tiling:
+    """Settings to run region operations on tiles with a TilingProcessor.
+
+    Args:
+        tile_size: tile width and height in um.
+        border: tile border in um. Defaults to the sizing offset.
+        threads: number of threads.
+        dbu: database unit in um.
+    """
+
+    tile_size: float = 500
+    border: float | None = None
+    threads: int = get_number_of_cores()
+    dbu: float = 0.001
+
+
+def tiled(
+    expression: str,
+    tiling: Tiling,
+    border: float = 0,
+    **inputs: kdb.Region,
+) -> kdb.Region:
+    """Returns the result of a region expression evaluated tile by tile.
+
+    Each tile result is clipped to its tile and the results are merged, so
+    the output matches the flat evaluation up to dbu-sized slivers where
+    non-Manhattan edges cross tile boundaries.
+
+    Args:
+        expression: KLayout expression of the input names, for example `a - b`.
+        tiling: tiling settings.
+        border: minimum tile border in um, for example the sizing offset.
+        inputs: input regions by name.
+    """
+    output = Region()
+    frame = kdb.Box()
+    for region in inputs.values():
+        frame += region.bbox()
+    if frame.empty():
+        return output
+    border = max(border, tiling.border or 0)
+
+    tp = kdb.TilingProcessor()
+    tp.dbu = tiling.dbu
+    tp.threads = tiling.threads
+    tp.tile_size(tiling.tile_size, tiling.tile_size)
+    tp.tile_border(border, border)
+    tp.frame = frame.to_dtype(tiling.dbu).enlarged(border, border)
+    for name, region in inputs.items():
+        tp.input(name, region)
+    tp.output("output", output)
+    tp.queue(f"_output(output, {expression})")
+    tp.execute("tiled region operation")
+    output.merge()
+    return output
+
+
+def size(
+    region: kdb.Region, offset: float, dbu=1e3, tiling: Tiling | None = None
+) -> kdb.Region:
+    if tiling is not None:
+        return tiled(f"a.sized({int(offset * dbu)})", tiling, abs(offset), a=region)
     return region.dup().size(int(offset * dbu))
 
 
-def boolean_or(region1: kdb.Region, region2: kdb.Region) -> kdb.Region:
+def boolean_or(
+    region1: kdb.Region, region2: kdb.Region, tiling: Tiling | None = None
+) -> kdb.Region:
+    if tiling is not None:
+        return tiled("a + b", tiling, a=region1, b=region2)
     return region1.__or__(region2)
 
 
-def boolean_not(region1: kdb.Region, region2: kdb.Region) -> kdb.Region:
+def boolean_not(
+    region1: kdb.Region, region2: kdb.Region, tiling: Tiling | None = None
+) -> kdb.Region:
+    if tiling is not None:
+        return tiled("a - b", tiling, a=region1, b=region2)
     return kdb.Region.__sub__(region1, region2)
 
 
+def benchmark_tiling(
+    columns: int = 300,
+    rows: int = 300,
+    offset: float = 0.6,
+    tiling: Tiling | None = None,
+) -> dict[str, float]:
+    """Returns flat and tiled run times in seconds of sizing and booleans on a box array.
+
+    Args:
+        columns: number of 1um boxes along x, on a 2um pitch.
+        rows: number of 1um boxes along y, on a 2um pitch.
+        offset: sizing offset in um.
+        tiling: tiling settings. Defaults to 100um tiles.
+    """
+    tiling = tiling or Tiling(tile_size=100)
+    dbu = 1 / tiling.dbu
+    region = kdb.Region()
+    for i in range(columns):
+        for j in range(rows):
+            x, y = round(2 * i * dbu), round(2 * j * dbu)
+            region.insert(kdb.Box(x, y, x + round(dbu), y + round(dbu)))
+    grown = size(region, offset, dbu=dbu)
+
+    timings = {}
+    for name, t in (("flat", None), ("tiled", tiling)):
+        start = time.perf_counter()
+        size(region, offset, dbu=dbu, tiling=t)
+        boolean_or(region, grown, tiling=t)
+        boolean_not(grown, region, tiling=t)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
 def copy(region: kdb.Region) -> kdb.Region:
     return region.dup()
 
@@ -38,34 +144,47 @@ def _assert_is_layer(value: any) -> None:
 
 
 class Region(kdb.Region):
+    """Region with sizing and boolean operators.
+
+    Regions of a tiled RegionCollection have a `tiling` attribute and run the
+    operators on tiles. Results keep the tiling.
+    """
+
+    tiling: Tiling | None = None
+
+    def _tiled(self, region: kdb.Region) -> kdb.Region:
+        if self.tiling is not None:
+            region.tiling = self.tiling
+        return region
+
     def __iadd__(self, offset) -> kdb.Region:
         """Adds an offset to the layer."""
-        return size(self, offset)
+        return self + offset
 
     def __isub__(self, offset) -> kdb.Region:
         """Adds an offset to the layer."""
-        return size(self, -offset)
+        return self - offset
 
     def __add__(self, element) -> kdb.Region:
         """Adds an element to the region."""
         if isinstance(element, float | int):
-            return size(self, element)
+            return self._tiled(size(self, element, tiling=self.tiling))
 
         elif isinstance(element, kdb.Region):
-            return boolean_or(self, element)
+            return self._tiled(boolean_or(self, element, tiling=self.tiling))
         else:
             raise ValueError(f"Cannot add type {type(element)} to region")
 
     def __sub__(self, element: float | int | kdb.Region) -> kdb.Region | None:
         """Subtracts an element from the region."""
         if isinstance(element, float | int):
-            return size(self, -element)
+            return self._tiled(size(self, -element, tiling=self.tiling))
 
         elif isinstance(element, kdb.Region):
-            return boolean_not(self, element)
+            return self._tiled(boolean_not(self, element, tiling=self.tiling))
 
     def copy(self) -> kdb.Region:
-        return self.dup()
+        return self._tiled(self.dup())
 
 
 class RegionCollection:
@@ -76,6 +195,9 @@ class RegionCollection:
     Args:
         gdspath: to read GDS from.
         cell_name: optional top cell name to edit (defaults to the top cell of the layout if None).
+        tile_size: if set, sizing and booleans run on tiles of this size in um.
+        tile_border: tile border in um. Defaults to the sizing offset.
+        threads: number of threads for tiled operations.
 
     .. code::
 
@@ -89,7 +211,14 @@ class RegionCollection:
 
     """
 
-    def __init__(self, gdspath: PathType, cell_name: str | None = None) -> None:
+    def __init__(
+        self,
+        gdspath: PathType,
+        cell_name: str | None = None,
+        tile_size: float | None = None,
+        tile_border: float | None = None,
+        threads: int = get_number_of_cores(),
+    ) -> None:
         """Initializes the RegionCollection."""
         lib = kf.KCLayout(str(gdspath))
         lib.read(filename=str(gdspath))
@@ -97,6 +226,13 @@ class RegionCollection:
         self.lib = lib
         self.regions: dict[tuple[int, int], Region] = {}
         self.cell = lib[lib.top_cell().cell_index()]
+        self.tiling = (
+            Tiling(
+                tile_size=tile_size, border=tile_border, threads=threads, dbu=lib.dbu
+            )
+            if tile_size
+            else None
+        )
 
     def __getitem__(self, layer: tuple[int, int]) -> Region:
         """Gets a layer from the collection."""
@@ -105,6 +241,7 @@ class RegionCollection:
         if layer in self.regions:
             return self.regions[layer]
         region = Region()
+        region.tiling = self.tiling
         layer_index = self.lib.layer(layer[0], layer[1])
         region.insert(self.layout.begin_shapes_rec(layer_index))
         region.merge()
@@ -1,55 +1,224 @@
 from __future__ import annotations
 
+import math
 import pathlib
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from xml.etree import ElementTree
 
 import matplotlib.pyplot as plt
+import numpy as np
 import yaml
-from klayout import rdb
+from gdsfactory.config import get_number_of_cores
 
 PathType = pathlib.Path | str
 
+summary_columns = ("file", "category", "cell", "count", "xmin", "ymin", "xmax", "ymax")
+_geometry_kinds = {"polygon", "box", "edge", "edge-pair", "path"}
+_category_pattern = re.compile(r"'((?:[^'\\]|\\.)*)'|([^.']+)")
+_number_pattern = re.compile(r"-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?")
 
-def count_drc(rdb_path: PathType, threshold: int = 0) -> dict[str, int]:
+
+def count_drc(
+    rdb_path: PathType, threshold: int = 0, processes: int | None = None
+) -> dict[str, int] | dict[str, dict[str, int]]:
     """Reads klayout Results database and returns a dict of error names to number of errors.
 
-    Works for both single rdb files and directories of rdb files.
+    Works for both single rdb files and directories of rdb files. Directories
+    are parsed in parallel, one file per process.
 
     Args:
         rdb_path: Path to rdb file or directory of rdb files.
         threshold: Minimum number of errors to be included in the output.
+        processes: number of processes for directories. Defaults to the number of cores.
     """
     rdb_path = pathlib.Path(rdb_path)
-    errors_dict = {}
+    rdb_files = _get_rdb_files(rdb_path)
+    summaries = _map_files(_summarize_rdb, rdb_files, processes)
+    counts = {
+        rdb_file.stem: _get_errors(summary, threshold)
+        for rdb_file, summary in zip(rdb_files, summaries)
+    }
+    return counts if rdb_path.is_dir() else counts[rdb_path.stem]
+
 
+def _get_rdb_files(rdb_path: pathlib.Path) -> list[pathlib.Path]:
     if not rdb_path.exists():
         raise FileNotFoundError(f"Cannot find {rdb_path}")
-
     if not rdb_path.is_dir():
-        return _get_errors(rdb_path, threshold, errors_dict)
-    for rdb_file in rdb_path.glob("*.rdb"):
-        errors_dict[rdb_file.stem] = count_drc(rdb_file)
+        return [rdb_path]
+    return sorted(rdb_path.glob("*.rdb")) + sorted(rdb_path.glob("*.lyrdb"))
+
 
-    return errors_dict
+def _map_files(function, rdb_files: list[pathlib.Path], processes: int | None):
+    if len(rdb_files) <= 1 or processes == 1:
+        return [function(rdb_file) for rdb_file in rdb_files]
+    processes = min(processes or get_number_of_cores(), len(rdb_files))
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(function, rdb_files))
 
 
-def _get_errors(rdb_path, threshold, errors_dict):
-    r = rdb.ReportDatabase()
-    r.load(rdb_path)
+def _get_errors(summary: dict[tuple[str, str], list], threshold: int) -> dict[str, int]:
+    errors_dict: dict[str, int] = {}
+    for (category, _), (count, *_) in summary.items():
+        errors_dict[category] = errors_dict.get(category, 0) + count
 
-    categories = {cat.rdb_id(): cat for cat in r.each_category()}
+    errors_total = sum(errors_dict.values())
+    errors_dict = {
+        category: errors
+        for category, errors in errors_dict.items()
+        if errors > threshold
+    }
+    errors_dict["total"] = errors_total
+    return dict(sorted(errors_dict.items(), key=lambda item: item[1], reverse=True))
 
-    errors_total = 0
 
-    for category_id, category in categories.items():
-        errors_per_category = r.each_item_per_category(category_id)
-        errors = len(list(errors_per_category))
-        errors_total += errors
+def _split_category(path: str) -> list[str]:
+    """Returns the names of a dot separated, optionally quoted, category path."""
+    return [
+        re.sub(r"\\(.)", r"\1", quoted) if quoted else plain
+        for quoted, plain in _category_pattern.findall(path)
+    ]
 
-        if errors > threshold:
-            errors_dict[category.name()] = errors
 
-    errors_dict["total"] = errors_total
-    return dict(sorted(errors_dict.items(), key=lambda item: item[1], reverse=True))
+def _summarize_rdb(rdb_path: pathlib.Path) -> dict[tuple[str, str], list]:
+    """Streams the items of an rdb file.
+
+    Returns a dict (category, cell) -> [count, xmin, ymin, xmax, ymax] where the
+    bounding box in um covers the geometric values of the items.
+    The XML is parsed incrementally and items are discarded once counted, so
+    memory does not grow with the number of markers.
+    """
+    summary: dict[tuple[str, str], list] = {}
+    categories: dict[str, str] = {}
+    items = None
+    for event, element in ElementTree.iterparse(str(rdb_path), events=("start", "end")):
+        if event == "start":
+            if element.tag == "items":
+                items = element
+            continue
+        if element.tag != "item" or items is None:
+            continue
+
+        path = element.findtext("category", "")
+        if path not in categories:
+            categories[path] = ".".join(_split_category(path))
+        key = (categories[path], element.findtext("cell", ""))
+        row = summary.setdefault(key, [0, math.inf, math.inf, -math.inf, -math.inf])
+        row[0] += 1
+        for value in element.iterfind("values/value"):
+            kind, _, text = (value.text or "").partition(":")
+            if kind.strip() not in _geometry_kinds:
+                continue
+            coordinates = _number_pattern.findall(text.partition(" w=")[0])
+            xs = [float(x) for x in coordinates[0::2]]
+            ys = [float(y) for y in coordinates[1::2]]
+            if xs and ys:
+                row[1] = min(row[1], *xs)
+                row[2] = min(row[2], *ys)
+                row[3] = max(row[3], *xs)
+                row[4] = max(row[4], *ys)
+        items.clear()
+    return summary
+
+
+def summarize_drc(
+    rdb_path: PathType, processes: int | None = None
+) -> dict[str, np.ndarray]:
+    """Returns a columnar summary of one rdb file or a directory of rdb files.
+
+    One row per file, category and cell, with the number of markers and
+    their bounding box in um (NaN for markers without geometry).
+    Rdb files are streamed, not loaded, and parsed in parallel.
+
+    Args:
+        rdb_path: Path to rdb file or directory of rdb files.
+        processes: number of processes. Defaults to the number of cores.
+
+    Returns:
+        dict of columns: file, category, cell, count, xmin, ymin, xmax, ymax.
+    """
+    rdb_files = _get_rdb_files(pathlib.Path(rdb_path))
+    summaries = _map_files(_summarize_rdb, rdb_files, processes)
+    rows = [
+        (rdb_file.stem, category, cell, *values)
+        for rdb_file, summary in zip(rdb_files, summaries)
+        for (category, cell), values in summary.items()
+    ]
+    columns = list(zip(*rows)) or [()] * len(summary_columns)
+    data = dict(zip(summary_columns, columns))
+    summary_data = {
+        name: np.array(data[name], dtype=object) for name in summary_columns[:3]
+    }
+    summary_data["count"] = np.array(data["count"], dtype=np.int64)
+    for name in summary_columns[4:]:
+        values = np.array(data[name], dtype=float)
+        values[~np.isfinite(values)] = np.nan
+        summary_data[name] = values
+    return summary_data
+
+
+def write_drc_summary(
+    rdb_path: PathType,
+    filepath: PathType,
+    processes: int | None = None,
+    table: str = "drc",
+) -> pathlib.Path:
+    """Writes the rdb summary to SQLite (.db, .sqlite) or Parquet (.parquet).
+
+    Rows are appended to an existing SQLite table, so reports of different runs
+    can be written to one database and diffed with SQL:
+
+    .. code::
+
+        SELECT category, cell, SUM(count) FROM drc WHERE file = 'run2'
+        GROUP BY category, cell
+
+    Args:
+        rdb_path: Path to rdb file or directory of rdb files.
+        filepath: output file.
+        processes: number of processes. Defaults to the number of cores.
+        table: SQLite table name.
+    """
+    filepath = pathlib.Path(filepath)
+    data = summarize_drc(rdb_path, processes=processes)
+
+    if filepath.suffix == ".parquet":
+        import pandas as pd
+
+        try:
+            pd.DataFrame(data).to_parquet(filepath, index=False)
+        except ImportError as e:
+            raise ImportError(
+                "Writing Parquet needs pyarrow: pip install pyarrow"
+            ) from e
+        return filepath
+
+    if not re.fullmatch(r"\w+", table):
+        raise ValueError(f"Invalid table name {table!r}")
+
+    rows = zip(
+        *(data[name].tolist() for name in summary_columns),
+    )
+    with closing(sqlite3.connect(filepath)) as connection, connection:
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(file TEXT, category TEXT, cell TEXT, count INTEGER, "
+            "xmin REAL, ymin REAL, xmax REAL, ymax REAL)"
+        )
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_index ON {table} (category, cell)"
+        )
+        connection.executemany(
+            f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (*row[:4], *(None if math.isnan(v) else v for v in row[4:]))
+                for row in rows
+            ],
+        )
+    return filepath
 
 
 def write_yaml(rdb_path: PathType, filepath: PathType, threshold: int = 0) -> None:
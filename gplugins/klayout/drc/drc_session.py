@@ -0,0 +1,298 @@
+"""Run many DRC rules in-process on a layout that is loaded only once.
+
+.. code::
+
+    from gplugins.klayout.drc.drc_session import DrcRule, DrcSession
+
+    session = DrcSession("chip.gds", mode="tiled", threads=8)
+    results = session.run(
+        [
+            DrcRule("width", layer=(1, 0), value=0.15),
+            DrcRule("space", layer=(1, 0), value=0.2),
+            DrcRule("inclusion", layer=(2, 0), other=(1, 0), value=0.1),
+            DrcRule("exclusion", layer=(1, 0), other=(3, 0), value=1.0),
+        ]
+    )
+    for result in results:
+        print(result.rule.label, result.count, f"{result.elapsed:.3f}s")
+    session.write_rdb(results, "chip.lyrdb")
+"""
+
+from __future__ import annotations
+
+import pathlib
+import time
+from dataclasses import dataclass
+from typing import Literal
+
+import klayout.db as pya
+import klayout.rdb as rdb
+import numpy as np
+from gdsfactory.component import Component
+from gdsfactory.config import get_number_of_cores
+from gdsfactory.typings import ComponentOrPath, PathType
+
+from gplugins.typings import NDArrayF
+
+checks = ("width", "space", "inclusion", "exclusion")
+modes = ("default", "tiled", "deep")
+valid_metrics = ("Square", "Euclidean", "Projection")
+
+
+@dataclass(frozen=True)
+class DrcRule:
+    """DRC rule.
+
+    Args:
+        check: width, space, inclusion or exclusion.
+        layer: layer to check. For inclusion, the layer that must be inside `other`.
+        value: minimum width, space, inclusion or exclusion in um.
+        other: second layer for inclusion (enclosing layer) and exclusion.
+        name: rule name. Defaults to a description of the rule.
+        ignore_angle_deg: edges forming an angle above this value are not checked.
+        whole_edges: if True, markers contain the whole edges.
+        metrics: Square, Euclidean or Projection.
+        min_projection: lower threshold of the projected length of one edge onto another.
+        max_projection: upper limit of the projected length of one edge onto another.
+    """
+
+    check: Literal["width", "space", "inclusion", "exclusion"]
+    layer: tuple[int, int]
+    value: float
+    other: tuple[int, int] | None = None
+    name: str | None = None
+    ignore_angle_deg: float = 80
+    whole_edges: bool = False
+    metrics: str = "Square"
+    min_projection: float | None = None
+    max_projection: float | None = None
+
+    def __post_init__(self) -> None:
+        """Validates the rule."""
+        if self.check not in checks:
+            raise ValueError(f"check = {self.check!r} not in {checks}")
+        if self.metrics not in valid_metrics:
+            raise ValueError(f"metrics = {self.metrics!r} not in {valid_metrics}")
+        if self.check in ("inclusion", "exclusion") and self.other is None:
+            raise ValueError(f"{self.check} rule needs the other layer")
+
+    @property
+    def label(self) -> str:
+        """Returns the rule name."""
+        if self.name:
+            return self.name
+        if self.other is None:
+            return f"{self.layer} {self.check} {self.value}um"
+        return f"{self.layer} {self.other} {self.check} {self.value}um"
+
+
+@dataclass
+class DrcResult:
+    """Violations of a rule.
+
+    Args:
+        rule: checked rule.
+        edge_pairs: violation markers in database units.
+        dbu: database unit in um.
+        elapsed: rule run time in seconds.
+    """
+
+    rule: DrcRule
+    edge_pairs: pya.EdgePairs
+    dbu: float
+    elapsed: float
+
+    @property
+    def count(self) -> int:
+        """Returns the number of markers, the same in every mode."""
+        return self.edge_pairs.count()
+
+    @property
+    def area(self) -> int:
+        """Returns the area of the violation polygons in dbu^2."""
+        return self.edge_pairs.polygons().area()
+
+    def markers(self) -> NDArrayF:
+        """Returns markers as an array (n, 2 edges, 2 points, xy) in um."""
+        markers = [
+            [
+                [[e.p1.x, e.p1.y], [e.p2.x, e.p2.y]]
+                for e in (edge_pair.first, edge_pair.second)
+            ]
+            for edge_pair in self.edge_pairs.each()
+        ]
+        return np.array(markers, dtype=float).reshape(-1, 2, 2, 2) * self.dbu
+
+
+def get_check_args(rule: DrcRule, dbu: float) -> tuple:
+    """Returns the KLayout check arguments of a rule in database units."""
+    return (
+        round(rule.value / dbu),
+        rule.whole_edges,
+        getattr(pya.Region, rule.metrics),
+        rule.ignore_angle_deg,
+        None if rule.min_projection is None else round(rule.min_projection / dbu),
+        None if rule.max_projection is None else round(rule.max_projection / dbu),
+    )
+
+
+def check_regions(
+    rule: DrcRule,
+    a: pya.Region,
+    b: pya.Region | None = None,
+    dbu: float = 0.001,
+) -> pya.EdgePairs:
+    """Runs a rule on regions and returns the violation markers.
+
+    Args:
+        rule: rule to check.
+        a: region of rule.layer.
+        b: region of rule.other for inclusion and exclusion rules.
+        dbu: database unit in um.
+    """
+    args = get_check_args(rule, dbu)
+    if rule.check == "width":
+        return a.width_check(*args)
+    if rule.check == "space":
+        return a.space_check(*args)
+    if rule.check == "inclusion":
+        return a.inside_check(b, *args)
+    return a.separation_check(b, *args)
+
+
+class DrcSession:
+    """Loads a layout once and runs DRC rules on cached merged regions.
+
+    Args:
+        gdspath: path to GDS or Component.
+        cellname: cell to check. Defaults to the top cell.
+        mode: default (flat), tiled (multithreaded tiles) or deep (hierarchical).
+        threads: number of threads for tiled and deep mode.
+        tile_size: tile size in um for tiled mode.
+    """
+
+    def __init__(
+        self,
+        gdspath: ComponentOrPath,
+        cellname: str | None = None,
+        mode: str = "default",
+        threads: int = get_number_of_cores(),
+        tile_size: float = 500,
+    ) -> None:
+        """Loads the layout."""
+        if mode not in modes:
+            raise ValueError(f"mode = {mode!r} not in {modes}")
+
+        if isinstance(gdspath, Component):
+            self.layout = gdspath.kcl.layout
+            self.cell = self.layout.cell(cellname) if cellname else gdspath.kdb_cell
+        else:
+            self.layout = pya.Layout()
+            self.layout.read(str(gdspath))
+            self.cell = (
+                self.layout.cell(cellname) if cellname else self.layout.top_cell()
+            )
+
+        self.mode = mode
+        self.threads = threads
+        self.tile_size = tile_size
+        self.dss = None
+        if mode == "deep":
+            self.dss = pya.DeepShapeStore()
+            self.dss.threads = threads
+        self._regions: dict[tuple[int, int], pya.Region] = {}
+
+    @property
+    def dbu(self) -> float:
+        """Returns the database unit in um."""
+        return self.layout.dbu
+
+    def region(self, layer: tuple[int, int]) -> pya.Region:
+        """Returns the merged region of a layer, cached for later rules."""
+        layer = tuple(layer)
+        if layer not in self._regions:
+            layer_index = self.layout.layer(*layer)
+            iterator = self.cell.begin_shapes_rec(layer_index)
+            if self.dss is None:
+                region = pya.Region(iterator)
+            else:
+                region = pya.Region(iterator, self.dss)
+            self._regions[layer] = region.merged()
+        return self._regions[layer]
+
+    def _run_flat(self, rule: DrcRule) -> pya.EdgePairs:
+        other = self.region(rule.other) if rule.other is not None else None
+        return check_regions(rule, self.region(rule.layer), other, dbu=self.dbu)
+
+    def _run_tiled(self, rule: DrcRule) -> pya.EdgePairs:
+        names = ("d", "whole_edges", "metrics", "ignore_angle", "min_p", "max_p")
+        expression = {
+            "width": "a.width_check",
+            "space": "a.space_check",
+            "inclusion": "a.inside_check",
+            "exclusion": "a.separation_check",
+        }[rule.check]
+        args = ", ".join(names if rule.other is None else ("b", *names))
+
+        edge_pairs = pya.EdgePairs()
+        tp = pya.TilingProcessor()
+        tp.dbu = self.dbu
+        tp.threads = self.threads
+        tp.tile_size(self.tile_size, self.tile_size)
+        # markers are found as long as both edges are within the tile border
+        tp.tile_border(rule.value, rule.value)
+        tp.input("a", self.region(rule.layer))
+        if rule.other is not None:
+            tp.input("b", self.region(rule.other))
+        for name, value in zip(names, get_check_args(rule, self.dbu)):
+            tp.var(name, value)
+        tp.output("markers", edge_pairs)
+        # tiles see whole polygons, so unclipped markers are exactly the flat
+        # ones, found once by every tile they reach into
+        tp.queue(f"_output(markers, {expression}({args}), false)")
+        tp.execute(rule.label)
+        return pya.EdgePairs(list(dict.fromkeys(edge_pairs.each())))
+
+    def run_rule(self, rule: DrcRule) -> DrcResult:
+        """Runs one rule and returns its violations and run time."""
+        start = time.perf_counter()
+        edge_pairs = (
+            self._run_tiled(rule) if self.mode == "tiled" else self._run_flat(rule)
+        )
+        return DrcResult(
+            rule=rule,
+            edge_pairs=edge_pairs,
+            dbu=self.dbu,
+            elapsed=time.perf_counter() - start,
+        )
+
+    def run(self, rules: list[DrcRule]) -> list[DrcResult]:
+        """Runs rules in order and returns one result per rule."""
+        return [self.run_rule(rule) for rule in rules]
+
+    def write_rdb(self, results: list[DrcResult], filepath: PathType) -> pathlib.Path:
+        """Writes results to a KLayout report database (.lyrdb)."""
+        report = rdb.ReportDatabase("DRC")
+        report.top_cell_name = self.cell.name
+        rdb_cell = report.create_cell(self.cell.name)
+        trans = pya.CplxTrans(self.dbu)
+        for result in results:
+            category = report.create_category(result.rule.label)
+            report.create_items(
+                rdb_cell.rdb_id(), category.rdb_id(), trans, result.edge_pairs
+            )
+        filepath = pathlib.Path(filepath)
+        report.save(str(filepath))
+        return filepath
+
+
+if __name__ == "__main__":
+    import gdsfactory as gf
+
+    gf.gpdk.PDK.activate()
+    c = gf.components.straight_array(spacing=0.12)
+    session = DrcSession(c, mode="tiled", threads=4, tile_size=5)
+    for result in session.run(
+        [DrcRule("space", layer=(1, 0), value=0.2), DrcRule("width", (1, 0), 0.6)]
+    ):
+        print(result.rule.label, result.count, result.area, f"{result.elapsed:.3f}s")
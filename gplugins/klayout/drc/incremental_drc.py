@@ -0,0 +1,239 @@
+"""Incremental hierarchical DRC with per-cell cached results.
+
+Every cell is fingerprinted from its shapes and its child placements (including
+the child fingerprints), so a fingerprint changes whenever anything below the
+cell changes. Violations are cached per cell fingerprint and rule, and a cell is
+only re-checked when its fingerprint is not in the cache.
+
+A cell's violations are its children's cached violations, transformed to the
+cell, plus a check of its *context*: the cell's own shapes and the regions where
+child instances come within a halo of each other. Child violations touching the
+context are dropped and recomputed there, so editing one subcircuit only
+re-checks that subcircuit, its ancestors' contexts and nothing else.
+
+.. code::
+
+    from gplugins.klayout.drc.drc_session import DrcRule
+    from gplugins.klayout.drc.incremental_drc import IncrementalDrc
+
+    drc = IncrementalDrc("chip.gds", cache_dir="drc_cache")
+    results = drc.run([DrcRule("space", layer=(1, 0), value=0.2)])
+    print(drc.checked_cells, drc.cache.stats)
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+
+import klayout.db as pya
+import numpy as np
+from gdsfactory.config import GDSDIR_TEMP, get_number_of_cores
+from gdsfactory.typings import ComponentOrPath, PathType
+
+from gplugins.common.utils.cache import DiskCache
+from gplugins.klayout.drc.drc_session import (
+    DrcResult,
+    DrcRule,
+    DrcSession,
+    check_regions,
+)
+
+
+def edge_pairs_to_array(edge_pairs: pya.EdgePairs) -> np.ndarray:
+    """Returns edge pairs as an (n, 8) integer array of edge coordinates."""
+    coordinates = [
+        (e.x1, e.y1, e.x2, e.y2, f.x1, f.y1, f.x2, f.y2)
+        for e, f in ((edge_pair.first, edge_pair.second) for edge_pair in edge_pairs)
+    ]
+    return np.array(coordinates, dtype=np.int64).reshape(-1, 8)
+
+
+def array_to_edge_pairs(array: np.ndarray) -> pya.EdgePairs:
+    """Returns edge pairs from an (n, 8) integer array of edge coordinates."""
+    edge_pairs = pya.EdgePairs()
+    for x1, y1, x2, y2, u1, v1, u2, v2 in array.tolist():
+        edge_pairs.insert(
+            pya.EdgePair(pya.Edge(x1, y1, x2, y2), pya.Edge(u1, v1, u2, v2))
+        )
+    return edge_pairs
+
+
+class IncrementalDrc:
+    """Runs DRC rules cell by cell, reusing cached results of unchanged cells.
+
+    Args:
+        gdspath: path to GDS or Component.
+        cache_dir: directory of the per-cell violation cache, shared across runs.
+            Defaults to GDSDIR_TEMP / "drc".
+        cellname: cell to check. Defaults to the top cell.
+        halo: context distance in um. Defaults to each rule's value.
+        deep: extract context regions in deep (hierarchical) mode.
+        threads: number of threads for deep mode.
+    """
+
+    def __init__(
+        self,
+        gdspath: ComponentOrPath,
+        cache_dir: PathType | None = None,
+        cellname: str | None = None,
+        halo: float | None = None,
+        deep: bool = True,
+        threads: int = get_number_of_cores(),
+    ) -> None:
+        """Loads the layout and opens the cache."""
+        self.session = DrcSession(
+            gdspath,
+            cellname=cellname,
+            mode="deep" if deep else "default",
+            threads=threads,
+        )
+        self.layout = self.session.layout
+        self.cell = self.session.cell
+        self.halo = halo
+        self.cache = DiskCache(cache_dir or GDSDIR_TEMP / "drc")
+        self.checked_cells: list[str] = []
+        self._fingerprints: dict[tuple, dict[int, str]] = {}
+
+    @property
+    def dbu(self) -> float:
+        """Returns the database unit in um."""
+        return self.layout.dbu
+
+    def get_fingerprints(self, layers: tuple[tuple[int, int], ...]) -> dict[int, str]:
+        """Returns a fingerprint for each cell index, considering only layers.
+
+        A fingerprint covers the cell shapes and the placements and fingerprints
+        of its children.
+        """
+        if layers in self._fingerprints:
+            return self._fingerprints[layers]
+
+        layer_indexes = [self.layout.layer(*layer) for layer in layers]
+        fingerprints: dict[int, str] = {}
+        for cell_index in self.layout.each_cell_bottom_up():
+            cell = self.layout.cell(cell_index)
+            h = hashlib.sha256()
+            for layer_index in layer_indexes:
+                polygons = sorted(str(p) for p in pya.Region(cell.shapes(layer_index)))
+                h.update("\n".join(polygons).encode())
+                h.update(b"\0")
+            placements = sorted(
+                f"{fingerprints[inst.cell_index]} {inst.cplx_trans} "
+                f"{inst.a} {inst.b} {inst.na} {inst.nb}"
+                for inst in cell.each_inst()
+            )
+            h.update("\n".join(placements).encode())
+            fingerprints[cell_index] = h.hexdigest()
+
+        self._fingerprints[layers] = fingerprints
+        return fingerprints
+
+    def _get_halo(self, rule: DrcRule) -> int:
+        halo = rule.value if self.halo is None else max(self.halo, rule.value)
+        return round(halo / self.dbu)
+
+    def _clipped_region(
+        self, cell: pya.Cell, layer: tuple[int, int], clip: pya.Region
+    ) -> pya.Region:
+        """Returns the flattened shapes of a cell on layer inside clip."""
+        iterator = pya.RecursiveShapeIterator(
+            self.layout, cell, self.layout.layer(*layer), clip, False
+        )
+        if self.session.dss is None:
+            region = pya.Region(iterator)
+        else:
+            region = pya.Region(iterator, self.session.dss)
+        return region & clip
+
+    def _check_cell(
+        self,
+        rule: DrcRule,
+        cell_index: int,
+        fingerprints: dict[int, str],
+        results: dict[int, pya.EdgePairs],
+    ) -> pya.EdgePairs:
+        """Returns the violations of a cell in cell coordinates."""
+        if cell_index in results:
+            return results[cell_index]
+
+        halo = self._get_halo(rule)
+        key = self.cache.get_key(fingerprints[cell_index], repr(rule), halo, self.dbu)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.stats.hits += 1
+            results[cell_index] = array_to_edge_pairs(cached)
+            return results[cell_index]
+        self.cache.stats.misses += 1
+
+        cell = self.layout.cell(cell_index)
+        layers = [rule.layer] if rule.other is None else [rule.layer, rule.other]
+        layer_indexes = [self.layout.layer(*layer) for layer in layers]
+
+        if cell.child_cells() == 0:
+            a = pya.Region(cell.shapes(layer_indexes[0]))
+            b = pya.Region(cell.shapes(layer_indexes[-1])) if rule.other else None
+            markers = check_regions(rule, a, b, dbu=self.dbu)
+        else:
+            markers = pya.EdgePairs()
+            boxes = pya.Region()
+            for inst in cell.each_inst():
+                child_markers = self._check_cell(
+                    rule, inst.cell_index, fingerprints, results
+                )
+                bbox = pya.Box()
+                for layer_index in layer_indexes:
+                    bbox += inst.cell.bbox(layer_index)
+                for trans in inst.cell_inst.each_cplx_trans():
+                    if not child_markers.is_empty():
+                        markers += child_markers.transformed(trans)
+                    if not bbox.empty():
+                        boxes.insert(bbox.transformed(trans).enlarged(halo, halo))
+
+            own = pya.Region()
+            for layer_index in layer_indexes:
+                own += pya.Region(cell.shapes(layer_index))
+
+            # own shapes and areas where two child instances are within the halo
+            context = own.sized(halo) + boxes.merged(False, 2)
+            context.merge()
+            if not context.is_empty():
+                clip = context.sized(2 * halo)
+                a = self._clipped_region(cell, rule.layer, clip)
+                b = (
+                    self._clipped_region(cell, rule.other, clip)
+                    if rule.other is not None
+                    else None
+                )
+                recomputed = pya.EdgePairs(
+                    list(check_regions(rule, a, b, dbu=self.dbu).each())
+                )
+                markers = markers.not_interacting(context)
+                markers += recomputed.interacting(context)
+
+        self.checked_cells.append(cell.name)
+        self.cache.set(key, edge_pairs_to_array(markers))
+        results[cell_index] = markers
+        return markers
+
+    def run_rule(self, rule: DrcRule) -> DrcResult:
+        """Runs one rule on the top cell, re-checking only changed cells."""
+        start = time.perf_counter()
+        layers = (rule.layer,) if rule.other is None else (rule.layer, rule.other)
+        fingerprints = self.get_fingerprints(layers)
+        edge_pairs = self._check_cell(rule, self.cell.cell_index(), fingerprints, {})
+        return DrcResult(
+            rule=rule,
+            edge_pairs=edge_pairs,
+            dbu=self.dbu,
+            elapsed=time.perf_counter() - start,
+        )
+
+    def run(self, rules: list[DrcRule]) -> list[DrcResult]:
+        """Runs rules in order and returns one result per rule.
+
+        `checked_cells` lists the cells that were not found in the cache.
+        """
+        self.checked_cells = []
+        return [self.run_rule(rule) for rule in rules]
@@ -1,45 +1,190 @@
+from dataclasses import dataclass
 from pathlib import Path
 
 import gdsfactory as gf
 import matplotlib.cm as cm
 import matplotlib.pyplot as plt
 import numpy as np
+import numpy.typing as npt
 from gdsfactory.config import get_number_of_cores
-from gdsfactory.typings import Layer
-from klayout.db import Box, Layout, Polygon, TileOutputReceiver, TilingProcessor
+from gdsfactory.typings import Layer, PathType
+from klayout.db import (
+    Box,
+    DBox,
+    LayerInfo,
+    LayerMap,
+    Layout,
+    LoadLayoutOptions,
+    Polygon,
+    TileOutputReceiver,
+    TilingProcessor,
+)
 
 from gplugins.typings import NDArrayF
 
 
-class DensityOutputReceiver(TileOutputReceiver):
-    def __init__(self) -> None:
-        """Output receiver for density data."""
+@dataclass
+class DensityMap:
+    """Tile densities of several layers on a common tile grid.
+
+    Attributes:
+        layers: layers in the order of the first axis of `density`.
+        tile_size: tile (width, height) in um.
+        x: tile center x coordinates in um, shape (nx,).
+        y: tile center y coordinates in um, shape (ny,).
+        density: tile densities, shape (len(layers), ny, nx).
+    """
+
+    layers: list[tuple[int, int]]
+    tile_size: tuple[float, float]
+    x: NDArrayF
+    y: NDArrayF
+    density: NDArrayF
+
+    def meshgrid(self, layer: Layer) -> tuple[NDArrayF, NDArrayF, NDArrayF]:
+        """Returns X, Y and density meshgrids of a layer for plotting."""
+        Xi, Yi = np.meshgrid(self.x, self.y)
+        return Xi, Yi, self.density[self.layers.index(tuple(layer))]
+
+
+class DensityGridReceiver(TileOutputReceiver):
+    def __init__(self, data: NDArrayF) -> None:
+        """Output receiver writing tile densities into a preallocated array.
+
+        No Python object is kept per tile.
+
+        Args:
+            data: (ny, nx) array, possibly memory-mapped, indexed by tile.
+        """
         super().__init__()
-        self.data: list[tuple[float, float, float]] = []
+        self.data = data
 
     def put(
         self, ix: int, iy: int, tile: Box, obj: float, dbu: float, clip: bool
     ) -> None:
-        """Put density data into the receiver.
-
-        Arguments:
-            ix: index position of the tile along the x-axis in a grid of tiles.
-            iy: index position of the tile along the y-axis in a grid of tiles.
-            tile: x-y boundaries of the tile (Klayout Box object)
-            obj: density value (for this task)
-            dbu: database units per user unit.
-            clip: flag indicating if the tile has been clipped.
-
-        Add data as:
-            (tile_center_x, tile_center_y, density)
-        """
-        self.data.append(
-            (
-                (tile.left * dbu + tile.right * dbu) / 2,
-                (tile.bottom * dbu + tile.top * dbu) / 2,
-                obj,
+        """Stores the density of tile (ix, iy)."""
+        self.data[iy, ix] = obj
+
+
+def _read_layout(gdspath: Path, layers: list[tuple[int, int]]) -> Layout:
+    """Reads only the given layers of a GDS file."""
+    layer_map = LayerMap()
+    for i, layer in enumerate(layers):
+        layer_map.map(LayerInfo(*layer), i)
+    options = LoadLayoutOptions()
+    options.layer_map = layer_map
+    options.create_other_layers = False
+
+    ly = Layout()
+    ly.read(str(gdspath), options)
+    return ly
+
+
+def _get_tile_grid(
+    bbox: DBox, tile_size: tuple[float, float]
+) -> tuple[tuple[float, float], int, int]:
+    """Returns the lower-left corner and number of tiles of a grid centered on bbox."""
+    if tile_size[0] > bbox.width() and tile_size[1] > bbox.height():
+        raise ValueError(
+            f"Too large tile size {tile_size} for bbox {(bbox.left, bbox.bottom), (bbox.right, bbox.top)}: reduce tile size (and merge later if needed)."
+        )
+    nx = max(1, int(np.ceil(bbox.width() / tile_size[0] - 1e-9)))
+    ny = max(1, int(np.ceil(bbox.height() / tile_size[1] - 1e-9)))
+    x0 = bbox.center().x - nx * tile_size[0] / 2
+    y0 = bbox.center().y - ny * tile_size[1] / 2
+    return (x0, y0), nx, ny
+
+
+def calculate_densities(
+    gdspath: Path,
+    layers: list[Layer],
+    cellname: str | None = None,
+    tile_sizes: list[tuple[float, float]] | None = None,
+    threads: int = get_number_of_cores(),
+    bbox: tuple[tuple[float, float], tuple[float, float]] | None = None,
+    dtype: npt.DTypeLike = np.float32,
+    dirpath: PathType | None = None,
+) -> list[DensityMap]:
+    """Calculates the density of several layers in a GDS file in a single pass.
+
+    The GDS is read once, keeping only the requested layers. For each tile size,
+    one density script per layer is queued on a single TilingProcessor, so all
+    layers are computed by one `execute` that walks the layout once.
+
+    Args:
+        gdspath: The path to the GDS file.
+        layers: The layers for which to calculate density (layer number, datatype).
+        cellname: The name of the cell to consider. Defaults to the top cell.
+        tile_sizes: tile sizes (width, height) in um. Defaults to [(200, 200)].
+        threads: The number of threads to use for processing.
+        bbox: ((xmin, ymin), (xmax, ymax)) to tile. Defaults to the bbox of the layers.
+        dtype: density array dtype.
+        dirpath: if set, density arrays are memory-mapped `.npy` files in this
+            directory (`density_{width}x{height}.npy`) instead of held in memory.
+
+    Returns:
+        list: one DensityMap per tile size, with a (layer, ny, nx) density array.
+    """
+    layers = [tuple(layer) for layer in layers]
+    tile_sizes = tile_sizes or [(200, 200)]
+
+    ly = _read_layout(gdspath, layers)
+    cell = ly.cell(cellname) if cellname else ly.top_cell()
+    layer_indexes = [ly.layer(*layer) for layer in layers]
+
+    if bbox is None:
+        dbbox = DBox()
+        for li in layer_indexes:
+            dbbox += cell.dbbox_per_layer(li)
+    else:
+        (xmin, ymin), (xmax, ymax) = bbox
+        dbbox = DBox(xmin, ymin, xmax, ymax)
+    if dbbox.empty():
+        raise ValueError(f"No shapes on layers {layers} in {gdspath}")
+
+    density_maps = []
+    for tile_size in tile_sizes:
+        (x0, y0), nx, ny = _get_tile_grid(dbbox, tile_size)
+        shape = (len(layers), ny, nx)
+        if dirpath is None:
+            density = np.zeros(shape, dtype=dtype)
+        else:
+            dirpath = Path(dirpath)
+            dirpath.mkdir(parents=True, exist_ok=True)
+            density = np.lib.format.open_memmap(
+                dirpath / f"density_{tile_size[0]}x{tile_size[1]}.npy",
+                mode="w+",
+                dtype=dtype,
+                shape=shape,
+            )
+
+        tp = TilingProcessor()
+        tp.dbu = ly.dbu
+        tp.tile_size(tile_size[0], tile_size[1])
+        tp.tile_origin(x0, y0)
+        tp.tiles(nx, ny)
+        tp.threads = threads
+        receivers = [DensityGridReceiver(data) for data in density]
+        for i, (li, receiver) in enumerate(zip(layer_indexes, receivers)):
+            tp.input(f"input{i}", cell.begin_shapes_rec(li))
+            tp.output(f"res{i}", receiver)
+            tp.queue(
+                f"_tile && (var d = to_f(input{i}.area(_tile.bbox)) / to_f(_tile.bbox.area); _output(res{i}, d))"
+            )
+        tp.execute("Density map")
+        if isinstance(density, np.memmap):
+            density.flush()
+
+        density_maps.append(
+            DensityMap(
+                layers=layers,
+                tile_size=tuple(tile_size),
+                x=x0 + tile_size[0] * (np.arange(nx) + 0.5),
+                y=y0 + tile_size[1] * (np.arange(ny) + 0.5),
+                density=density,
             )
         )
+    return density_maps
 
 
 def calculate_density(
@@ -53,6 +198,8 @@ def calculate_density(
 
     Process a GDS file to calculate the density of a specified layer. It divides the layout into tiles of a specified size, computes the density of the layer within each tile, and returns a (x,y,density) list of density data. The density is calculated as the area of the layer within a tile divided by the total area of the tile.
 
+    Use `calculate_densities` to get several layers and tile sizes as arrays in one pass.
+
     Args:
         gdspath (Path): The path to the GDS file.
         layer (Layer): The layer for which to calculate density (layer number, datatype).
@@ -63,35 +210,15 @@ def calculate_density(
     Returns:
         list: A list of tuples, each containing the center x-coordinate, center y-coordinate, and density of each tile.
     """
-    # Validate input
-    (xmin, ymin), (xmax, ymax) = get_gds_bbox(
-        gdspath=gdspath, layer=layer, cellname=cellname
-    )
-    if tile_size[0] > xmax - xmin and tile_size[1] > ymax - ymin:
-        raise ValueError(
-            f"Too large tile size {tile_size} for bbox {(xmin, ymin), (xmax, ymax)}: reduce tile size (and merge later if needed)."
-        )
-
-    # Get GDS
-    ly = Layout()
-    ly.read(str(gdspath))
-    li = ly.layer(layer[0], layer[1])
-    si = ly.top_cell().begin_shapes_rec(li)
-
-    # Setup and execute task
-    tp = TilingProcessor()
-    out_receiver = DensityOutputReceiver()
-    tp.output("res", out_receiver)
-    tp.input("input", si)
-    tp.dbu = ly.dbu
-    tp.tile_size(tile_size[0], tile_size[1])
-    tp.threads = threads
-    tp.queue(
-        "_tile && (var d = to_f(input.area(_tile.bbox)) / to_f(_tile.bbox.area); _output(res, d))"
+    (density_map,) = calculate_densities(
+        gdspath=gdspath,
+        layers=[layer],
+        cellname=cellname,
+        tile_sizes=[tile_size],
+        threads=threads,
     )
-    tp.execute("Density map")
-
-    return out_receiver.data
+    Xi, Yi, Zi = density_map.meshgrid(layer)
+    return list(zip(Xi.ravel().tolist(), Yi.ravel().tolist(), Zi.ravel().tolist()))
 
 
 def get_layer_polygons(
@@ -134,60 +261,16 @@ def get_gds_bbox(
     return (component.xmin, component.ymin), (component.xmax, component.ymax)
 
 
-def extend_grid_and_density_to_bbox(
-    x: NDArrayF,
-    y: NDArrayF,
-    density: NDArrayF,
-    bbox: tuple[tuple[float, float], tuple[float, float]],
-) -> tuple[NDArrayF, NDArrayF, NDArrayF]:
-    """Extends the grid and pads the density arrays with zeros to cover the entire bounding box.
-
-    Args:
-        x (NDArrayF): Current x coordinates.
-        y (NDArrayF): Current y coordinates.
-        density (NDArrayF): Density values corresponding to the x and y coordinates.
-        bbox (tuple): Bounding box specified as ((xmin, ymin), (xmax, ymax)).
-
-    Returns:
-        tuple: Updated unique_x, unique_y, x, y, and density arrays.
-    """
-    (xmin, ymin), (xmax, ymax) = bbox
-
-    unique_x = np.unique(x)
-    unique_y = np.unique(y)
-
-    x_spacing = unique_x[1] - unique_x[0]
-    y_spacing = unique_y[1] - unique_y[0]
-
-    # Extend unique_x and unique_y to cover the full bbox range
-    while unique_x[0] > xmin + x_spacing / 2:
-        unique_x = np.insert(unique_x, 0, unique_x[0] - x_spacing)
-    while unique_x[-1] < xmax - x_spacing / 2:
-        unique_x = np.append(unique_x, unique_x[-1] + x_spacing)
-    while unique_y[0] > ymin + y_spacing / 2:
-        unique_y = np.insert(unique_y, 0, unique_y[0] - y_spacing)
-    while unique_y[-1] < ymax - y_spacing / 2:
-        unique_y = np.append(unique_y, unique_y[-1] + y_spacing)
-
-    # Generate all combinations of new x and y coordinates
-    new_x, new_y = np.meshgrid(unique_x, unique_y)
-    new_x = new_x.flatten()
-    new_y = new_y.flatten()
-
-    # Filter out the original x, y pairs
-    original_xy = set(zip(x, y))
-    new_xy = set(zip(new_x, new_y)) - original_xy
-
-    # Extend x, y, and density arrays with new combinations
-    x_extension, y_extension = zip(*new_xy) if new_xy else ([], [])
-    density_extension = [0] * len(x_extension)
-
-    # Update x, y, and density arrays with extensions
-    x = np.concatenate((x, np.array(x_extension)))
-    y = np.concatenate((y, np.array(y_extension)))
-    density = np.concatenate((density, np.array(density_extension)))
-
-    return x, y, density
+def _extend_axis(unique: NDArrayF, vmin: float, vmax: float) -> NDArrayF:
+    """Extends evenly spaced tile centers so that they cover [vmin, vmax]."""
+    if len(unique) < 2:
+        return unique
+    spacing = unique[1] - unique[0]
+    n_before = max(0, int(np.ceil((unique[0] - vmin) / spacing - 0.5 - 1e-9)))
+    n_after = max(0, int(np.ceil((vmax - unique[-1]) / spacing - 0.5 - 1e-9)))
+    before = unique[0] - spacing * np.arange(n_before, 0, -1)
+    after = unique[-1] + spacing * np.arange(1, n_after + 1)
+    return np.concatenate((before, unique, after))
 
 
 def density_data_to_meshgrid(
@@ -203,33 +286,26 @@ def density_data_to_meshgrid(
     Returns:
         Tuple[NDArrayF, NDArrayF, NDArrayF]: Three 2D numpy arrays representing the X coordinates, Y coordinates, and density values on a meshgrid.
     """
-    # Extract x, y, and density values
-    x, y, density = zip(*density_data)
-
-    # Convert to numpy arrays for plotting
-    x_array = np.array(x)
-    y_array = np.array(y)
-    density_array = np.array(density)
-
-    if bbox is not None:
-        x_array, y_array, density_array = extend_grid_and_density_to_bbox(
-            x_array, y_array, density_array, bbox
-        )
+    x_array, y_array, density_array = np.asarray(density_data, dtype=float).T
 
     # Determine unique x and y coordinates for grid
     unique_x = np.unique(x_array)
     unique_y = np.unique(y_array)
 
+    # Pad the grid with empty tiles up to the bbox
+    if bbox is not None:
+        (xmin, ymin), (xmax, ymax) = bbox
+        unique_x = _extend_axis(unique_x, xmin, xmax)
+        unique_y = _extend_axis(unique_y, ymin, ymax)
+
     # Create a grid for plotting
     Xi, Yi = np.meshgrid(unique_x, unique_y)
 
     # Map density values to the grid
     Zi = np.zeros_like(Xi)
-    for i, (x_val, y_val) in enumerate(zip(x_array, y_array)):
-        xi_index = np.where(unique_x == x_val)[0][0]
-        yi_index = np.where(unique_y == y_val)[0][0]
-        Zi[yi_index, xi_index] = density_array[i]
-
+    Zi[np.searchsorted(unique_y, y_array), np.searchsorted(unique_x, x_array)] = (
+        density_array
+    )
     return Xi, Yi, Zi
 
 
@@ -250,51 +326,35 @@ def estimate_weighted_global_density(
     Returns:
         float: Mean density value.
     """
+    if bbox is None:
+        return float(np.mean(Zi))
+
     (xmin, ymin), (xmax, ymax) = bbox
 
-    total_weighted_density = 0
-    total_weight = 0
-
-    # Calculate the spacing between grid points
-    xi_spacing = np.unique(np.diff(Xi[0, :]))[0]
-    yi_spacing = np.unique(np.diff(Yi[:, 0]))[0]
-
-    # Calculate half spacing for overlap calculation
-    half_xi_spacing = xi_spacing / 2
-    half_yi_spacing = yi_spacing / 2
-
-    # Iterate over each grid point to calculate weighted density
-    for i in range(Xi.shape[0]):
-        for j in range(Xi.shape[1]):
-            # Calculate the center of each tile
-            x_center = Xi[i, j]
-            y_center = Yi[i, j]
-
-            # Calculate the overlap between the bbox and the tile
-            x_overlap = max(
-                0,
-                min(x_center + half_xi_spacing, xmax)
-                - max(x_center - half_xi_spacing, xmin),
-            )
-            y_overlap = max(
-                0,
-                min(y_center + half_yi_spacing, ymax)
-                - max(y_center - half_yi_spacing, ymin),
-            )
-            overlap_area = x_overlap * y_overlap
+    # Calculate half the spacing between grid points
+    half_xi_spacing = np.unique(np.diff(Xi[0, :]))[0] / 2
+    half_yi_spacing = np.unique(np.diff(Yi[:, 0]))[0] / 2
 
-            # Calculate the weighted density
-            if overlap_area > 0:
-                total_weighted_density += Zi[i, j] * overlap_area
-                total_weight += overlap_area
+    # Overlap area between the bbox and each tile
+    x_overlap = np.clip(
+        np.minimum(Xi[0, :] + half_xi_spacing, xmax)
+        - np.maximum(Xi[0, :] - half_xi_spacing, xmin),
+        0,
+        None,
+    )
+    y_overlap = np.clip(
+        np.minimum(Yi[:, 0] + half_yi_spacing, ymax)
+        - np.maximum(Yi[:, 0] - half_yi_spacing, ymin),
+        0,
+        None,
+    )
+    overlap_area = np.outer(y_overlap, x_overlap)
 
     # Calculate the weighted average density
+    total_weight = overlap_area.sum()
     if total_weight > 0:
-        weighted_average_density = total_weighted_density / total_weight
-    else:
-        weighted_average_density = 0
-
-    return weighted_average_density
+        return float((Zi * overlap_area).sum() / total_weight)
+    return 0
 
 
 def plot_density_heatmap(
@@ -321,28 +381,24 @@ def plot_density_heatmap(
         visualize_with_full_gds (bool, optional): Flag indicating whether to consider the full extent of the GDS file for plotting. Defaults to True.
         visualize_polygons (bool, optional): Flag indicating whether to overlay the actual layer polygons on top of the heatmap for reference. Defaults to False.
     """
-    density_data = calculate_density(
+    gds_bbox = get_gds_bbox(gdspath, cellname=cellname)
+    (density_map,) = calculate_densities(
         gdspath=gdspath,
         cellname=cellname,
-        layer=layer,
-        tile_size=tile_size,
+        layers=[layer],
+        tile_sizes=[tile_size],
         threads=threads,
+        bbox=gds_bbox if visualize_with_full_gds else None,
     )
-
-    Xi, Yi, Zi = density_data_to_meshgrid(
-        density_data=density_data,
-        bbox=get_gds_bbox(gdspath, cellname=cellname)
-        if visualize_with_full_gds
-        else None,
-    )
+    Xi, Yi, Zi = density_map.meshgrid(layer)
 
     # Plot the heatmap
     plt.figure(figsize=(10, 8))
     plt.pcolormesh(Xi, Yi, Zi, shading="auto", cmap=cmap, alpha=0.5, edgecolor="k")
-    for i, val in enumerate(Zi.flatten()):
+    for x, y, val in zip(Xi.ravel(), Yi.ravel(), Zi.ravel()):
         plt.text(
-            Xi.flatten()[i],
-            Yi.flatten()[i],
+            x,
+            y,
             f"{val * 100:2.0f}%",
             ha="center",
             va="center",
@@ -355,7 +411,7 @@ def plot_density_heatmap(
             x, y = polygon[:, 0], polygon[:, 1]
             plt.fill(x, y, fill=False, edgecolor="r", hatch="/", linewidth=2)
     if visualize_with_full_gds:
-        (xmin, ymin), (xmax, ymax) = get_gds_bbox(gdspath, cellname=cellname)
+        (xmin, ymin), (xmax, ymax) = gds_bbox
         plt.plot(
             [xmin, xmax, xmax, xmin, xmin],
             [ymin, ymin, ymax, ymax, ymin],
@@ -367,9 +423,7 @@ def plot_density_heatmap(
     plt.xlabel("X (um)")
     plt.ylabel("Y (um)")
     if visualize_with_full_gds:
-        estimate = estimate_weighted_global_density(
-            Xi, Yi, Zi, bbox=get_gds_bbox(gdspath, cellname=cellname)
-        )
+        estimate = estimate_weighted_global_density(Xi, Yi, Zi, bbox=gds_bbox)
         plt.title(
             title
             or f"Layer: {layer}, tile size: {tile_size}, total density ~{estimate * 100:1.2f}%"
@@ -1,17 +1,74 @@
+import filecmp
+import hashlib
+import os
+import pathlib
+import shutil
+import tempfile
 from typing import Any
 
 import gdsfactory as gf
 import kfactory as kf
+import klayout
 import klayout.db as kdb
 from gdsfactory.typings import PathType
 
 from gplugins.common.config import PATH
 
 
+def _get_file_hash(filepath: PathType, chunk_size: int = 2**20) -> str:
+    """Returns the sha256 of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _write_pdk_tech(tech_dir: pathlib.Path) -> pathlib.Path:
+    """Writes the active PDK KLayout technology, only touching files that changed."""
+    tech_dir.mkdir(exist_ok=True, parents=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        gf.get_active_pdk().klayout_technology.write_tech(tmp)
+        for path in pathlib.Path(tmp).rglob("*"):
+            dest = tech_dir / path.relative_to(tmp)
+            if path.is_dir():
+                dest.mkdir(exist_ok=True)
+            elif not dest.exists() or not filecmp.cmp(path, dest, shallow=False):
+                shutil.copyfile(path, dest)
+    return tech_dir / "tech.lyt"
+
+
+def get_l2n_key(
+    gdspath: PathType,
+    klayout_tech_path: PathType,
+    include_labels: bool = True,
+) -> str:
+    """Returns the cache key of an extraction.
+
+    Combines the GDS content hash, the technology file hash and everything else
+    the extraction depends on.
+
+    Args:
+        gdspath: Path to the GDS file.
+        klayout_tech_path: Path to the klayout technology file.
+        include_labels: Whether labels are included in the netlist.
+    """
+    layers = sorted(
+        (layer.name, layer.layer, layer.datatype)
+        for layer in gf.get_active_pdk().layers
+    )
+    h = hashlib.sha256()
+    h.update(_get_file_hash(gdspath).encode())
+    h.update(_get_file_hash(klayout_tech_path).encode())
+    h.update(repr((layers, include_labels, klayout.__version__)).encode())
+    return h.hexdigest()
+
+
 def get_l2n(
     gdspath: PathType,
     klayout_tech_path: PathType | None = None,
     include_labels: bool = True,
+    cache_dir: PathType | None = None,
 ) -> kdb.LayoutToNetlist:
     """Get the layout to netlist object from a given GDS and klayout technology file.
 
@@ -19,20 +76,46 @@ def get_l2n(
         gdspath: Path to the GDS file.
         klayout_tech_path: Path to the klayout technology file.
         include_labels: Whether to include labels in the netlist connected as individual nets.
+        cache_dir: if set, extraction results are stored there as `.l2n` files
+            keyed by GDS and technology content, and read back instead of
+            extracting again when nothing changed.
 
     Returns:
         kdb.LayoutToNetlist: The layout to netlist object.
 
     """
+    if not klayout_tech_path:
+        klayout_tech_path = _write_pdk_tech(PATH.klayout)
+
+    if cache_dir is None:
+        return _extract_l2n(gdspath, klayout_tech_path, include_labels)
+
+    cache_dir = pathlib.Path(cache_dir)
+    cache_dir.mkdir(exist_ok=True, parents=True)
+    key = get_l2n_key(gdspath, klayout_tech_path, include_labels=include_labels)
+    filepath = cache_dir / f"{key}.l2n"
+
+    if filepath.exists():
+        l2n = kdb.LayoutToNetlist()
+        l2n.read(str(filepath))
+        return l2n
+
+    l2n = _extract_l2n(gdspath, klayout_tech_path, include_labels)
+    tmp = filepath.with_suffix(f".{os.getpid()}.tmp")
+    l2n.write_l2n(str(tmp))
+    os.replace(tmp, filepath)
+    return l2n
+
+
+def _extract_l2n(
+    gdspath: PathType,
+    klayout_tech_path: PathType,
+    include_labels: bool = True,
+) -> kdb.LayoutToNetlist:
+    """Extracts connectivity from a GDS with a klayout technology file."""
     lib = kf.KCLayout(str(gdspath))
     Tech = kdb.Technology()
 
-    tech_dir = PATH.klayout
-    tech_dir.mkdir(exist_ok=True, parents=True)
-    if not klayout_tech_path:
-        gf.get_active_pdk().klayout_technology.write_tech(tech_dir)
-        klayout_tech_path = tech_dir / "tech.lyt"
-
     # klayout tech path is now assumed to contain a `tech.lyt`` file to use
     Tech.load(str(klayout_tech_path))
     technology = Tech
@@ -100,7 +183,7 @@ def get_netlist(
 
     Args:
         gdspath: Path to the GDS file.
-        kwargs: kwargs for get_l2n
+        kwargs: kwargs for get_l2n, such as cache_dir.
 
     Returns:
         kdb.Netlist: The SPICE netlist of the GDS file.
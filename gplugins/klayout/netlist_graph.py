@@ -1,11 +1,14 @@
 import itertools
-from collections.abc import Callable
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass, field
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 from typing import Any
 
 import klayout.db as kdb
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 from gdsfactory import logger
 from gdsfactory.typings import PathType
 from klayout.db import NetlistSpiceReaderDelegate
@@ -22,6 +25,47 @@ def _get_device_name(device: kdb.Device) -> str:
     return f"{device.device_class().name}_{device.expanded_name()}"
 
 
+def _get_top_circuits(
+    netlist: kdb.Netlist, top_cell: str | None = None
+) -> Sequence[kdb.Circuit]:
+    """Returns the top circuits of a netlist, or only `top_cell` if given."""
+    top_circuits = list(
+        itertools.islice(netlist.each_circuit_top_down(), netlist.top_circuit_count())
+    )
+
+    if top_cell:
+        try:
+            top_circuits = (
+                next(
+                    c for c in top_circuits if c.name.casefold() == top_cell.casefold()
+                ),
+            )
+        except StopIteration as e:
+            available_top_cells = [cell.name for cell in top_circuits]
+            raise ValueError(
+                f"{top_cell=!r} not found in the netlist. Available top cells: {available_top_cells!r}"
+            ) from e
+    return top_circuits
+
+
+def _get_device_parameters(
+    device: kdb.Device,
+    spice_reader_instance: NetlistSpiceReaderDelegateWithStrings | None = None,
+) -> dict[str, Any]:
+    """Returns the parameters of a device, with strings restored from the reader."""
+    return {
+        parameter.name: (
+            spice_reader_instance.integer_to_string_map.get(
+                int(device.parameter(parameter.name)),
+                device.parameter(parameter.name),
+            )
+            if spice_reader_instance
+            else device.parameter(parameter.name)
+        )
+        for parameter in device.device_class().parameter_definitions()
+    }
+
+
 def netlist_to_networkx(
     netlist: kdb.Netlist,
     include_labels: bool = True,
@@ -42,44 +86,13 @@ def netlist_to_networkx(
     """
     G = nx.Graph()
     netlist.flatten()
-
-    top_circuits = list(
-        itertools.islice(netlist.each_circuit_top_down(), netlist.top_circuit_count())
-    )
-
-    if top_cell:
-        try:
-            top_circuits = (
-                next(
-                    c for c in top_circuits if c.name.casefold() == top_cell.casefold()
-                ),
-            )
-        except StopIteration as e:
-            available_top_cells = [cell.name for cell in top_circuits]
-            raise ValueError(
-                f"{top_cell=!r} not found in the netlist. Available top cells: {available_top_cells!r}"
-            ) from e
+    top_circuits = _get_top_circuits(netlist, top_cell)
 
     all_used_nets = set()
     for circuit in top_circuits:
         for device in circuit.each_device():
-            # Gather properties of Device class
-            device_class = device.device_class()
-            parameter_definitions = device_class.parameter_definitions()
-            terminal_definitions = device_class.terminal_definitions()
-
-            # Gather values for specific Device instance
-            parameters = {
-                parameter.name: (
-                    spice_reader_instance.integer_to_string_map.get(
-                        int(device.parameter(parameter.name)),
-                        device.parameter(parameter.name),
-                    )
-                    if spice_reader_instance
-                    else device.parameter(parameter.name)
-                )
-                for parameter in parameter_definitions
-            }
+            terminal_definitions = device.device_class().terminal_definitions()
+            parameters = _get_device_parameters(device, spice_reader_instance)
             nets = [
                 device.net_for_terminal(terminal.name)
                 for terminal in terminal_definitions
@@ -106,25 +119,198 @@ def netlist_to_networkx(
     return G
 
 
-def networkx_from_spice(
-    filepath: PathType,
+@dataclass
+class NetlistGraph:
+    """Compact connectivity of a flattened netlist.
+
+    Nodes are the devices followed by the nets. Device parameters are stored as
+    one array per parameter name, with NaN (or None for strings) where a device
+    class does not define that parameter.
+
+    Attributes:
+        nodes: node names, devices first then nets.
+        n_devices: number of devices.
+        adjacency: symmetric CSR adjacency matrix between nodes. Without labels
+            the nets are left out and devices sharing a net are connected.
+        device_class: device class name of each device.
+        parameters: device parameter columns, each of length n_devices.
+    """
+
+    nodes: np.ndarray
+    n_devices: int
+    adjacency: sp.csr_array
+    device_class: np.ndarray
+    parameters: dict[str, np.ndarray] = field(default_factory=dict)
+
+    @property
+    def is_net(self) -> np.ndarray:
+        """Returns a boolean mask of the net nodes."""
+        return np.arange(len(self.nodes)) >= self.n_devices
+
+    def to_networkx(self) -> nx.Graph:
+        """Returns the same graph as :func:`netlist_to_networkx`."""
+        G = nx.Graph()
+        for i, name in enumerate(self.nodes[: self.n_devices]):
+            G.add_node(
+                name,
+                **{
+                    key: value
+                    for key, column in self.parameters.items()
+                    if (value := column[i]) is not None
+                    and not (isinstance(value, float) and np.isnan(value))
+                },
+            )
+        G.add_nodes_from(self.nodes[self.n_devices :], is_net=True)
+        upper = sp.triu(self.adjacency, k=1).tocoo()
+        G.add_edges_from(zip(self.nodes[upper.row], self.nodes[upper.col]))
+        return G
+
+
+def netlist_to_sparse(
+    netlist: kdb.Netlist,
     include_labels: bool = True,
     top_cell: str | None = None,
-    spice_reader: type[NetlistSpiceReaderDelegate]
-    | NetlistSpiceReaderDelegate = GdsfactorySpiceReader,
-    **kwargs: Any,
+    spice_reader_instance: NetlistSpiceReaderDelegateWithStrings | None = None,
+) -> NetlistGraph:
+    """Convert a KLayout DB `Netlist` to a sparse adjacency matrix in one pass.
+
+    Uses far less memory than :func:`netlist_to_networkx` for large extractions.
+    Call :meth:`NetlistGraph.to_networkx` where a NetworkX graph is needed.
+
+    Args:
+        netlist: The KLayout DB `Netlist` to convert.
+        include_labels: Whether to include net nodes. Otherwise devices sharing a net are connected directly.
+        top_cell: The name of the top cell to consider. Defaults to all top cells.
+        spice_reader_instance: The KLayout Spice reader that was used for parsing SPICE netlists.
+            Used for fetching string parameter values from a stored mapping.
+    """
+    netlist.flatten()
+    top_circuits = _get_top_circuits(netlist, top_cell)
+
+    device_names: list[str] = []
+    device_classes: list[str] = []
+    parameters: dict[str, list[Any]] = {}
+    net_index: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+
+    for circuit in top_circuits:
+        for device in circuit.each_device():
+            i = len(device_names)
+            device_names.append(_get_device_name(device))
+            device_classes.append(device.device_class().name)
+            for key, value in _get_device_parameters(
+                device, spice_reader_instance
+            ).items():
+                parameters.setdefault(key, [None] * i).append(value)
+            for column in parameters.values():
+                if len(column) == i:
+                    column.append(None)
+
+            for terminal in device.device_class().terminal_definitions():
+                net = device.net_for_terminal(terminal.name)
+                if net is None:
+                    continue
+                rows.append(i)
+                cols.append(net_index.setdefault(net.expanded_name(), len(net_index)))
+
+    n_devices = len(device_names)
+    incidence = sp.csr_array(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(n_devices, len(net_index)),
+    )
+    incidence.data[:] = 1  # devices with several terminals on the same net
+
+    if include_labels:
+        nodes = np.array(device_names + list(net_index), dtype=object)
+        adjacency = sp.block_array([[None, incidence], [incidence.T, None]])
+    else:
+        nodes = np.array(device_names, dtype=object)
+        adjacency = incidence @ incidence.T
+        adjacency.setdiag(0)
+        adjacency.eliminate_zeros()
+        adjacency.data[:] = 1
+
+    columns = {}
+    for key, column in parameters.items():
+        column = np.array(column, dtype=object)
+        numeric = all(v is None or isinstance(v, int | float) for v in column)
+        if numeric:
+            column = np.array([np.nan if v is None else v for v in column], float)
+        columns[key] = column
+
+    return NetlistGraph(
+        nodes=nodes,
+        n_devices=n_devices,
+        adjacency=sp.csr_array(adjacency, dtype=np.int8),
+        device_class=np.array(device_classes, dtype=object),
+        parameters=columns,
+    )
+
+
+def contract_degree_two_nodes(
+    G: nx.Graph,
+    nodes_to_reduce: Collection[str],
+    sum_parameters: Collection[str] = ("length",),
+    copy: bool = True,
 ) -> nx.Graph:
-    """Returns a networkx Graph from a SPICE netlist file or KLayout LayoutToNetlist.
+    """Contracts chains of degree-2 nodes into single edges in linear time.
+
+    Each node whose name contains any of ``nodes_to_reduce`` and that has exactly two
+    neighbours is removed and its neighbours are connected directly. Removing a node
+    can lower the degree of its neighbours, so they are revisited until no node can
+    be contracted.
+
+    Numeric ``sum_parameters`` of the contracted nodes, e.g. waveguide lengths, are
+    summed onto the new edge together with those of previously contracted edges. If
+    the neighbours are already connected, the existing edge is kept as is.
 
     Args:
-        filepath: Path to the KLayout LayoutToNetlist file or a SPICE netlist.
-            File extensions should be `.l2n` and `.spice`, respectively.
-        include_labels: Whether to include labels in the graph connected to corresponding cells.
-        top_cell: The name of the top cell to consider for the NetworkX graph. Defaults to all top cells.
-        spice_reader: The KLayout Spice reader to use for parsing SPICE netlists.
-        kwargs: kwargs for spice_reader
+        G: graph, e.g. from :func:`netlist_to_networkx`.
+        nodes_to_reduce: node names to reduce, compared with the Python ``in`` operator.
+        sum_parameters: node parameters to aggregate onto contracted edges.
+        copy: contract a copy of the graph instead of modifying it in place.
     """
-    spice_reader_instance = None
+    if copy:
+        G = G.copy()
+
+    def _removable(node: str) -> bool:
+        return G.degree[node] == 2 and any(e in node for e in nodes_to_reduce)
+
+    candidates = [node for node in G.nodes if _removable(node)]
+    while candidates:
+        node = candidates.pop()
+        if node not in G or not _removable(node):
+            continue
+
+        u, v = G.neighbors(node)
+        data = {}
+        for parameter in sum_parameters:
+            values = [
+                G.nodes[node].get(parameter),
+                G.edges[u, node].get(parameter),
+                G.edges[node, v].get(parameter),
+            ]
+            values = [value for value in values if isinstance(value, int | float)]
+            if values:
+                data[parameter] = sum(values)
+
+        G.remove_node(node)
+        if G.has_edge(u, v):
+            # u and v each lost a neighbour and may now be contractible
+            candidates.extend(n for n in (u, v) if _removable(n))
+        else:
+            G.add_edge(u, v, **data)
+
+    return G
+
+
+def _read_netlist(
+    filepath: PathType,
+    spice_reader: type[NetlistSpiceReaderDelegate]
+    | NetlistSpiceReaderDelegate = GdsfactorySpiceReader,
+) -> tuple[kdb.Netlist, NetlistSpiceReaderDelegate | None]:
+    """Returns the netlist of a SPICE or LayoutToNetlist file and the SPICE reader used."""
     match Path(filepath).suffix:
         case ".l2n" | ".txt":
             l2n = kdb.LayoutToNetlist()
@@ -135,13 +321,8 @@ def networkx_from_spice(
             pkg = gplugins.vlsir.kdb_vlsir(netlist, domain="gplugins.klayout.example")
             with NamedTemporaryFile("w+", suffix=".sp") as fp:
                 gplugins.vlsir.export_netlist(pkg, dest=fp, fmt="spice")
-                return networkx_from_spice(
-                    fp.name,
-                    include_labels=include_labels,
-                    top_cell=top_cell,
-                    spice_reader=spice_reader,
-                    **kwargs,
-                )
+                fp.flush()
+                return _read_netlist(fp.name, spice_reader=spice_reader)
 
         case ".cir" | ".sp" | ".spi" | ".spice":
             reader = kdb.NetlistSpiceReader(
@@ -151,11 +332,33 @@ def networkx_from_spice(
             )
             netlist = kdb.Netlist()
             netlist.read(str(filepath), reader)
+            return netlist, spice_reader_instance
         case _:
             logger.warning("Assuming file is KLayout native LayoutToNetlist file")
             l2n = kdb.LayoutToNetlist()
             l2n.read(str(filepath))
-            netlist = l2n.netlist()
+            return l2n.netlist(), None
+
+
+def networkx_from_spice(
+    filepath: PathType,
+    include_labels: bool = True,
+    top_cell: str | None = None,
+    spice_reader: type[NetlistSpiceReaderDelegate]
+    | NetlistSpiceReaderDelegate = GdsfactorySpiceReader,
+    **kwargs: Any,
+) -> nx.Graph:
+    """Returns a networkx Graph from a SPICE netlist file or KLayout LayoutToNetlist.
+
+    Args:
+        filepath: Path to the KLayout LayoutToNetlist file or a SPICE netlist.
+            File extensions should be `.l2n` and `.spice`, respectively.
+        include_labels: Whether to include labels in the graph connected to corresponding cells.
+        top_cell: The name of the top cell to consider for the NetworkX graph. Defaults to all top cells.
+        spice_reader: The KLayout Spice reader to use for parsing SPICE netlists.
+        kwargs: kwargs for spice_reader
+    """
+    netlist, spice_reader_instance = _read_netlist(filepath, spice_reader)
 
     # Creating a graph for the connectivity
     return netlist_to_networkx(
@@ -164,3 +367,28 @@ def networkx_from_spice(
         top_cell=top_cell,
         spice_reader_instance=spice_reader_instance,
     )
+
+
+def sparse_from_spice(
+    filepath: PathType,
+    include_labels: bool = True,
+    top_cell: str | None = None,
+    spice_reader: type[NetlistSpiceReaderDelegate]
+    | NetlistSpiceReaderDelegate = GdsfactorySpiceReader,
+) -> NetlistGraph:
+    """Returns a sparse NetlistGraph from a SPICE netlist file or KLayout LayoutToNetlist.
+
+    Args:
+        filepath: Path to the KLayout LayoutToNetlist file or a SPICE netlist.
+            File extensions should be `.l2n` and `.spice`, respectively.
+        include_labels: Whether to include net nodes in the graph.
+        top_cell: The name of the top cell to consider. Defaults to all top cells.
+        spice_reader: The KLayout Spice reader to use for parsing SPICE netlists.
+    """
+    netlist, spice_reader_instance = _read_netlist(filepath, spice_reader)
+    return netlist_to_sparse(
+        netlist,
+        include_labels=include_labels,
+        top_cell=top_cell,
+        spice_reader_instance=spice_reader_instance,
+    )
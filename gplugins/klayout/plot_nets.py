@@ -1,5 +1,4 @@
 from collections.abc import Collection
-from itertools import combinations
 
 import matplotlib.pyplot as plt
 import networkx as nx
@@ -7,7 +6,10 @@ from gdsfactory.typings import PathType
 from klayout.db import NetlistSpiceReaderDelegate
 from matplotlib.figure import Figure
 
-from gplugins.klayout.netlist_graph import networkx_from_spice
+from gplugins.klayout.netlist_graph import (
+    contract_degree_two_nodes,
+    networkx_from_spice,
+)
 from gplugins.klayout.netlist_spice_reader import (
     GdsfactorySpiceReader,
 )
@@ -30,7 +32,7 @@ def plot_nets(
         include_labels: Whether to include net labels in the graph connected to corresponding cells.
         top_cell: The name of the top cell to consider for the NetworkX graph. Defaults to all top cells.
         nodes_to_reduce: Nodes to reduce to a single edge. Comparison made with Python ``in`` operator.
-            Helpful for reducing trivial waveguide elements.
+            Helpful for reducing trivial waveguide elements. See :func:`contract_degree_two_nodes`.
         spice_reader: The KLayout Spice reader to use for parsing SPICE netlists.
     """
     G_connectivity = networkx_from_spice(
@@ -41,23 +43,9 @@ def plot_nets(
     )
 
     if nodes_to_reduce:
-
-        def _removal_condition(node: str, degree: int) -> bool:
-            return degree == 2 and any(e in node for e in nodes_to_reduce)
-
-        while any(
-            _removal_condition(node, degree) for node, degree in G_connectivity.degree
-        ):
-            G_connectivity_tmp = G_connectivity.copy()
-            for node, degree in G_connectivity.degree:
-                if _removal_condition(node, degree):
-                    connected_to_node = [e[1] for e in G_connectivity.edges(node)]
-                    node_pairs_to_connect = list(combinations(connected_to_node, r=2))
-                    for pair in node_pairs_to_connect:
-                        G_connectivity_tmp.add_edge(pair[0], pair[1])
-                    G_connectivity_tmp.remove_node(node)
-                    break
-            G_connectivity = G_connectivity_tmp
+        G_connectivity = contract_degree_two_nodes(
+            G_connectivity, nodes_to_reduce=nodes_to_reduce, copy=False
+        )
 
     # Plotting the graph
     if interactive:
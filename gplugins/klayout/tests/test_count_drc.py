@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import sqlite3
+
+import klayout.db as pya
+import numpy as np
+from klayout import rdb
+
+from gplugins.klayout.drc.count_drc import (
+    _split_category,
+    count_drc,
+    summarize_drc,
+    write_drc_summary,
+)
+
+
+def write_report(filepath, n: int, offset: float = 0) -> None:
+    """Writes a report with n space markers, 2 width boxes and a nested category."""
+    report = rdb.ReportDatabase("DRC")
+    top = report.create_cell("TOP")
+    sub = report.create_cell("SUB")
+    space = report.create_category("space 'm1'")
+    width = report.create_category("width")
+    nested = report.create_category(width, "min.0.1")
+    for i in range(n):
+        item = report.create_item(top.rdb_id(), space.rdb_id())
+        item.add_value(
+            pya.DEdgePair(
+                pya.DEdge(offset + i, 0, offset + i, 1),
+                pya.DEdge(offset + i + 0.1, 1, offset + i + 0.1, 0),
+            )
+        )
+    for x in (0, 5):
+        item = report.create_item(sub.rdb_id(), width.rdb_id())
+        item.add_value(pya.DBox(x, -2, x + 1, 3))
+    item = report.create_item(sub.rdb_id(), nested.rdb_id())
+    item.add_value(1.5)
+    report.save(str(filepath))
+
+
+def test_split_category() -> None:
+    assert _split_category("width") == ["width"]
+    assert _split_category(r"'space \'m1\''.'min.0.1'") == ["space 'm1'", "min.0.1"]
+
+
+def test_count_drc(tmp_path) -> None:
+    write_report(tmp_path / "a.lyrdb", n=10)
+    write_report(tmp_path / "b.rdb", n=3)
+
+    assert count_drc(tmp_path / "a.lyrdb") == {
+        "total": 13,
+        "space 'm1'": 10,
+        "width": 2,
+        "width.min.0.1": 1,
+    }
+    assert count_drc(tmp_path, threshold=2, processes=2) == {
+        "a": {"total": 13, "space 'm1'": 10},
+        "b": {"total": 6, "space 'm1'": 3},
+    }
+
+
+def test_summarize_drc(tmp_path) -> None:
+    write_report(tmp_path / "a.lyrdb", n=10, offset=1)
+    data = summarize_drc(tmp_path / "a.lyrdb")
+    rows = {
+        (category, cell): i
+        for i, (category, cell) in enumerate(zip(data["category"], data["cell"]))
+    }
+    i = rows["space 'm1'", "TOP"]
+    assert data["count"][i] == 10
+    np.testing.assert_allclose(
+        [data[name][i] for name in ("xmin", "ymin", "xmax", "ymax")], [1, 0, 10.1, 1]
+    )
+    i = rows["width", "SUB"]
+    np.testing.assert_allclose(
+        [data[name][i] for name in ("xmin", "ymin", "xmax", "ymax")], [0, -2, 6, 3]
+    )
+    assert np.isnan(data["xmin"][rows["width.min.0.1", "SUB"]])
+
+
+def test_write_drc_summary_sqlite(tmp_path) -> None:
+    for name, n in (("run1", 10), ("run2", 4)):
+        write_report(tmp_path / f"{name}.rdb", n=n)
+    filepath = write_drc_summary(tmp_path, tmp_path / "drc.sqlite", processes=2)
+
+    with sqlite3.connect(filepath) as connection:
+        rows = connection.execute(
+            "SELECT file, SUM(count) FROM drc WHERE category = ? GROUP BY file",
+            ("space 'm1'",),
+        ).fetchall()
+    assert sorted(rows) == [("run1", 10), ("run2", 4)]
+
+
+def test_summarize_drc_benchmark(tmp_path) -> None:
+    """Streams a report with many markers without loading it."""
+    write_report(tmp_path / "big.lyrdb", n=50_000)
+    data = summarize_drc(tmp_path / "big.lyrdb")
+    assert data["count"].sum() == 50_003
@@ -0,0 +1,75 @@
+import gdsfactory as gf
+import pytest
+from gdsfactory.generic_tech.layer_map import LAYER
+from kfactory import kdb
+
+import gplugins.klayout.dataprep as dp
+
+
+@pytest.fixture
+def gdspath():
+    c = gf.Component()
+    ring = c << gf.components.coupler_ring()
+    c << gf.components.bbox(ring, layer=LAYER.FLOORPLAN)
+    array = c << gf.components.array(
+        gf.components.straight(length=5), columns=4, rows=3, column_pitch=8
+    )
+    array.movey(-20)
+    return c.write_gds()
+
+
+def flat_area(gdspath, layer: tuple[int, int]) -> int:
+    layout = kdb.Layout()
+    layout.read(str(gdspath))
+    iterator = layout.top_cell().begin_shapes_rec(layout.layer(*layer))
+    return kdb.Region(iterator).merged().area()
+
+
+def test_lazy_records_and_reuses(gdspath) -> None:
+    d = dp.LazyRegionCollection(gdspath, threads=2)
+    core = d[LAYER.WG] + 2
+    assert d[LAYER.WG] + 2 is core
+    assert d[LAYER.WG] | d[LAYER.FLOORPLAN] is d[LAYER.FLOORPLAN] + d[LAYER.WG]
+
+    d[LAYER.SLAB90] = core
+    d[LAYER.DEEP_ETCH] = (d[LAYER.WG] + 2) - d[LAYER.WG]
+    assert d.executed == 0
+
+    regions = d.evaluate()
+    # WG, WG + 2 and (WG + 2) - WG, the shared sizing is executed once
+    assert d.executed == 3
+    assert all(region.is_deep() for region in regions.values())
+
+    d[LAYER.N] = core & d[LAYER.FLOORPLAN]
+    d.evaluate()
+    assert d.executed == 5
+
+
+def test_lazy_matches_eager(gdspath, tmp_path) -> None:
+    d = dp.LazyRegionCollection(gdspath)
+    d[LAYER.SLAB90] = d[LAYER.WG] + 2
+    d[LAYER.DEEP_ETCH] = d[LAYER.SLAB90] - d[LAYER.WG]
+    d[LAYER.N] = (d[LAYER.WG] + d[LAYER.FLOORPLAN]) - d[LAYER.FLOORPLAN]
+    lazy_gds = tmp_path / "lazy.gds"
+    d.write_gds(lazy_gds)
+
+    e = dp.RegionCollection(gdspath)
+    e[LAYER.SLAB90] = e[LAYER.WG] + 2
+    e[LAYER.DEEP_ETCH] = e[LAYER.SLAB90] - e[LAYER.WG]
+    eager_gds = tmp_path / "eager.gds"
+    e.write_gds(eager_gds)
+
+    for layer in (LAYER.WG, LAYER.SLAB90, LAYER.DEEP_ETCH):
+        assert flat_area(lazy_gds, layer) == pytest.approx(
+            flat_area(eager_gds, layer), rel=1e-5
+        )
+    # only the 12 straights (5 x 0.5 um) are outside the floorplan
+    assert flat_area(lazy_gds, LAYER.N) == 12 * 5000 * 500
+
+
+def test_lazy_invalid_operands(gdspath) -> None:
+    d = dp.LazyRegionCollection(gdspath)
+    with pytest.raises(ValueError):
+        d[LAYER.WG] + "invalid_type"
+    with pytest.raises(ValueError):
+        d[LAYER.WG] = kdb.Region()
@@ -93,6 +93,48 @@ def test_RegionCollection_init(region_collection) -> None:
     assert region_collection[(1, 0)]
 
 
+@pytest.fixture
+def box_array() -> kdb.Region:
+    r = kdb.Region()
+    for i in range(20):
+        for j in range(20):
+            r.insert(kdb.Box(i * 2000, j * 2000, i * 2000 + 1000, j * 2000 + 1500))
+    return r
+
+
+def test_tiled_matches_flat(box_array) -> None:
+    tiling = dp.Tiling(tile_size=7, threads=2)
+    grown = dp.size(box_array, 0.6)
+    for flat, tiled in (
+        (dp.size(box_array, 0.6), dp.size(box_array, 0.6, tiling=tiling)),
+        (dp.size(grown, -0.3), dp.size(grown, -0.3, tiling=tiling)),
+        (dp.boolean_or(box_array, grown), dp.boolean_or(box_array, grown, tiling)),
+        (dp.boolean_not(grown, box_array), dp.boolean_not(grown, box_array, tiling)),
+    ):
+        assert tiled.area() == flat.merged().area()
+        assert (tiled ^ flat).is_empty()
+
+
+def test_RegionCollection_tiled(region_collection) -> None:
+    expected = (region_collection[LAYER.WG] + 2) - region_collection[LAYER.WG]
+    tiled = dp.RegionCollection(region_collection.lib.name, tile_size=10, threads=2)
+    tiled[LAYER.SLAB90] = tiled[LAYER.WG] + 2
+    assert tiled[LAYER.SLAB90].tiling is tiled.tiling
+
+    result = tiled[LAYER.SLAB90] - tiled[LAYER.WG]
+    assert result.tiling is tiled.tiling
+    # off-grid edges crossing tile boundaries leave dbu-sized slivers
+    assert result.area() == pytest.approx(expected.area(), rel=1e-6)
+    assert (result ^ expected).area() < 1e-5 * expected.area()
+
+
+def test_benchmark_tiling() -> None:
+    timings = dp.benchmark_tiling(
+        columns=50, rows=50, tiling=dp.Tiling(tile_size=20, threads=2)
+    )
+    assert set(timings) == {"flat", "tiled"}
+
+
 if __name__ == "__main__":
     import pathlib
 
@@ -6,6 +6,7 @@ import pytest
 from gdsfactory.config import PATH
 
 from gplugins.klayout.get_density import (
+    calculate_densities,
     calculate_density,
     density_data_to_meshgrid,
     get_gds_bbox,
@@ -73,3 +74,38 @@ def test_calculate_density(layer, tile_size, expected_densities) -> None:
         # Get density meshgrid
         Xi, Yi, Zi = density_data_to_meshgrid(density_data=density_data, bbox=bbox)
         np.testing.assert_allclose(Zi, expected_densities, rtol=1e-3)
+
+
+def test_calculate_densities() -> None:
+    gdspath = PATH.test_data / "test_gds_density1.gds"
+    component_test_density1().write_gds(gdspath)
+
+    layers = [(1, 0), (2, 0)]
+    density_maps = calculate_densities(
+        gdspath=gdspath, layers=layers, tile_sizes=[(20, 20), (50, 50)]
+    )
+    assert [density_map.density.shape for density_map in density_maps] == [
+        (2, 8, 5),
+        (2, 3, 2),
+    ]
+
+    # area is preserved and the grid is shared by all layers
+    for density_map in density_maps:
+        tile_area = density_map.tile_size[0] * density_map.tile_size[1]
+        np.testing.assert_allclose(
+            density_map.density.sum(axis=(1, 2)) * tile_area,
+            [100 * 150, 50 * 50 + 25 * 25],
+        )
+    np.testing.assert_allclose(density_maps[1].density[0], expected_densities[1])
+
+
+def test_calculate_densities_memmap(tmp_path) -> None:
+    gdspath = PATH.test_data / "test_gds_density1.gds"
+    component_test_density1().write_gds(gdspath)
+
+    (density_map,) = calculate_densities(
+        gdspath=gdspath, layers=[(1, 0)], tile_sizes=[(50, 50)], dirpath=tmp_path
+    )
+    assert density_map.density.dtype == np.float32
+    density = np.load(tmp_path / "density_50x50.npy")
+    np.testing.assert_allclose(density[0], expected_densities[1])
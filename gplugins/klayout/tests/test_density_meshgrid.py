@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from gplugins.klayout.get_density import (
+    density_data_to_meshgrid,
+    estimate_weighted_global_density,
+)
+
+
+def synthetic_density_data(
+    nx: int, ny: int, tile_size: float = 10.0, seed: int = 0
+) -> tuple[list[tuple[float, float, float]], np.ndarray]:
+    """Returns shuffled (x, y, density) tiles and the expected density grid."""
+    rng = np.random.default_rng(seed)
+    x = tile_size * (np.arange(nx) + 0.5)
+    y = tile_size * (np.arange(ny) + 0.5)
+    X, Y = np.meshgrid(x, y)
+    Z = rng.random(X.shape)
+    data = list(zip(X.ravel(), Y.ravel(), Z.ravel()))
+    order = rng.permutation(len(data))
+    return [data[i] for i in order], Z
+
+
+def reference_weighted_density(Xi, Yi, Zi, bbox) -> float:
+    """Tile by tile reference implementation."""
+    (xmin, ymin), (xmax, ymax) = bbox
+    dx = (Xi[0, 1] - Xi[0, 0]) / 2
+    dy = (Yi[1, 0] - Yi[0, 0]) / 2
+    total_density = 0.0
+    total_weight = 0.0
+    for (i, j), z in np.ndenumerate(Zi):
+        overlap_x = max(0, min(Xi[i, j] + dx, xmax) - max(Xi[i, j] - dx, xmin))
+        overlap_y = max(0, min(Yi[i, j] + dy, ymax) - max(Yi[i, j] - dy, ymin))
+        total_density += z * overlap_x * overlap_y
+        total_weight += overlap_x * overlap_y
+    return total_density / total_weight
+
+
+def test_density_data_to_meshgrid() -> None:
+    data, Z = synthetic_density_data(nx=7, ny=5)
+    Xi, Yi, Zi = density_data_to_meshgrid(data)
+    assert Zi.shape == (5, 7)
+    np.testing.assert_allclose(Zi, Z)
+    np.testing.assert_allclose(Xi[0], 10 * (np.arange(7) + 0.5))
+    np.testing.assert_allclose(Yi[:, 0], 10 * (np.arange(5) + 0.5))
+
+
+def test_density_data_to_meshgrid_bbox() -> None:
+    data, Z = synthetic_density_data(nx=7, ny=5)
+    bbox = ((-25, -12), (70, 76))
+    Xi, Yi, Zi = density_data_to_meshgrid(data, bbox=bbox)
+
+    # 3 tiles are added to the left, 2 below and 3 above
+    assert Zi.shape == (10, 10)
+    np.testing.assert_allclose(Xi[0, 0], -25)
+    np.testing.assert_allclose(Yi[0, 0], -15)
+    np.testing.assert_allclose(Yi[-1, 0], 75)
+    np.testing.assert_allclose(Zi[2:7, 3:], Z)
+    assert Zi.sum() == pytest.approx(Z.sum())
+
+
+@pytest.mark.parametrize(
+    "bbox", [((0, 0), (70, 50)), ((-25, -12), (70, 76)), ((13, 7), (41, 33))]
+)
+def test_estimate_weighted_global_density_reference(bbox) -> None:
+    data, _ = synthetic_density_data(nx=7, ny=5)
+    Xi, Yi, Zi = density_data_to_meshgrid(data, bbox=bbox)
+    assert estimate_weighted_global_density(Xi, Yi, Zi, bbox=bbox) == pytest.approx(
+        reference_weighted_density(Xi, Yi, Zi, bbox)
+    )
+
+
+@pytest.mark.skipif(
+    not os.environ.get("GPLUGINS_BENCHMARK"),
+    reason="wall clock benchmark, set GPLUGINS_BENCHMARK=1 to run",
+)
+def test_density_benchmark_large_grid() -> None:
+    """1M tiles should be gridded and averaged in well under a few seconds."""
+    nx = ny = 1000
+    data, Z = synthetic_density_data(nx=nx, ny=ny)
+    bbox = ((-100, -100), (10 * nx + 100, 10 * ny + 100))
+
+    start = time.perf_counter()
+    Xi, Yi, Zi = density_data_to_meshgrid(data, bbox=bbox)
+    density = estimate_weighted_global_density(Xi, Yi, Zi, bbox=bbox)
+    elapsed = time.perf_counter() - start
+
+    assert Zi.shape == (ny + 20, nx + 20)
+    assert density == pytest.approx(Z.sum() / (nx + 20) / (ny + 20))
+    assert elapsed < 10, f"{elapsed=:.2f}s for {nx * ny} tiles"
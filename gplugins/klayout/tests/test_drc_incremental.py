@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import klayout.db as kdb
+import pytest
+
+from gplugins.klayout.drc.drc_session import DrcRule, DrcSession
+from gplugins.klayout.drc.incremental_drc import IncrementalDrc
+
+rules = [
+    DrcRule("width", layer=(1, 0), value=0.3),
+    DrcRule("space", layer=(1, 0), value=0.5),
+    DrcRule("exclusion", layer=(1, 0), other=(2, 0), value=0.5),
+]
+
+
+def write_layout(gdspath, gap: int = 400, b_space: int = 300) -> None:
+    """Writes TOP with an array of A, two B and a top-level shape.
+
+    A has a narrow shape, B has two shapes `b_space` apart, and one B instance
+    is `gap` away from an A instance.
+    """
+    layout = kdb.Layout()
+    layout.dbu = 0.001
+    layer1 = layout.layer(1, 0)
+    layer2 = layout.layer(2, 0)
+
+    top = layout.create_cell("TOP")
+    a = layout.create_cell("A")
+    b = layout.create_cell("B")
+    a.shapes(layer1).insert(kdb.Box(0, 0, 1000, 1000))
+    a.shapes(layer1).insert(kdb.Box(2000, 0, 2200, 1000))
+    b.shapes(layer1).insert(kdb.Box(0, 0, 1000, 1000))
+    b.shapes(layer1).insert(kdb.Box(1000 + b_space, 0, 2300 + b_space, 1000))
+
+    top.insert(
+        kdb.CellInstArray(
+            a.cell_index(),
+            kdb.Trans(0, 0),
+            kdb.Vector(5000, 0),
+            kdb.Vector(0, 5000),
+            3,
+            2,
+        )
+    )
+    top.insert(kdb.CellInstArray(b.cell_index(), kdb.Trans(0, 10000)))
+    top.insert(
+        kdb.CellInstArray(b.cell_index(), kdb.Trans(kdb.Trans.R90, 13200 + gap, 0))
+    )
+    top.shapes(layer2).insert(kdb.Box(20000, 0, 21000, 1000))
+    top.shapes(layer1).insert(kdb.Box(21300, 0, 22000, 1000))
+    layout.write(str(gdspath))
+
+
+def assert_same_violations(incremental, flat) -> None:
+    incremental_polygons = incremental.edge_pairs.polygons().merged()
+    flat_polygons = flat.edge_pairs.polygons().merged()
+    assert (incremental_polygons ^ flat_polygons).is_empty()
+
+
+@pytest.mark.parametrize("deep", [True, False])
+def test_incremental_drc(tmp_path, deep: bool) -> None:
+    gdspath = tmp_path / "chip.gds"
+    cache_dir = tmp_path / "cache"
+    write_layout(gdspath)
+
+    drc = IncrementalDrc(gdspath, cache_dir=cache_dir, deep=deep)
+    results = drc.run(rules)
+    assert all(result.count > 0 for result in results)
+    for incremental, flat in zip(results, DrcSession(gdspath).run(rules)):
+        assert_same_violations(incremental, flat)
+    assert set(drc.checked_cells) == {"A", "B", "TOP"}
+
+    # nothing changed: everything comes from the cache
+    drc = IncrementalDrc(gdspath, cache_dir=cache_dir, deep=deep)
+    cached_results = drc.run(rules)
+    assert drc.checked_cells == []
+    for cached, result in zip(cached_results, results):
+        assert cached.area == result.area
+
+    # editing B only re-checks B and its parent
+    write_layout(gdspath, b_space=600)
+    drc = IncrementalDrc(gdspath, cache_dir=cache_dir, deep=deep)
+    results = drc.run(rules)
+    assert "A" not in drc.checked_cells
+    assert set(drc.checked_cells) == {"B", "TOP"}
+    for incremental, flat in zip(results, DrcSession(gdspath).run(rules)):
+        assert_same_violations(incremental, flat)
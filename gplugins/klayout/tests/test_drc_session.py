@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import gdsfactory as gf
+import pytest
+
+from gplugins.klayout.drc.check_space import check_space
+from gplugins.klayout.drc.check_width import check_width
+from gplugins.klayout.drc.drc_session import DrcRule, DrcSession
+
+
+@gf.cell
+def component_drc_session() -> gf.Component:
+    c = gf.Component()
+    c << gf.components.straight_array(spacing=0.12)
+    r1 = c << gf.components.rectangle(size=(0.5, 0.5), layer=(2, 0))
+    r2 = c << gf.components.rectangle(size=(0.4, 0.4), layer=(3, 0))
+    r3 = c << gf.components.rectangle(size=(0.5, 0.5), layer=(4, 0))
+    r1.dmove((-10, 0))
+    r2.dmove((-9.95, 0.05))
+    r3.dmove((-9.4, 0))
+    return c
+
+
+rules = [
+    DrcRule("width", layer=(1, 0), value=0.6),
+    DrcRule("space", layer=(1, 0), value=0.2),
+    DrcRule("space", layer=(1, 0), value=0.1),
+    DrcRule("inclusion", layer=(3, 0), other=(2, 0), value=0.1),
+    DrcRule("exclusion", layer=(2, 0), other=(4, 0), value=0.2),
+]
+expected_violations = [True, True, False, True, True]
+
+
+@pytest.mark.parametrize("mode", ["default", "tiled", "deep"])
+def test_drc_session(mode: str) -> None:
+    c = component_drc_session()
+    session = DrcSession(c.write_gds(), mode=mode, threads=2, tile_size=5)
+    results = session.run(rules)
+
+    assert [result.count > 0 for result in results] == expected_violations
+    assert results[1].area == check_space(c, min_space=0.2)
+    assert all(result.elapsed >= 0 for result in results)
+    assert len(session._regions) == 4, "each layer is loaded once"
+
+    markers = results[3].markers()
+    assert markers.shape == (results[3].count, 2, 2, 2)
+    assert markers[..., 0].min() >= -10
+
+
+@pytest.mark.parametrize("tile_size", [1, 3, 7.3])
+def test_drc_session_tiled_count(tile_size: float) -> None:
+    """Markers crossing tile borders are counted once, as in flat mode."""
+    c = gf.Component()
+    c << gf.components.array(
+        gf.components.straight_array(n=3, spacing=0.12, length=4),
+        columns=10,
+        rows=10,
+        column_pitch=3.9,
+        row_pitch=1.5,
+    )
+    gdspath = c.write_gds()
+    flat = DrcSession(gdspath).run(rules[:2])
+    tiled = DrcSession(gdspath, mode="tiled", threads=2, tile_size=tile_size).run(
+        rules[:2]
+    )
+    assert [result.count for result in tiled] == [result.count for result in flat]
+    assert [result.area for result in tiled] == [result.area for result in flat]
+
+
+def test_drc_session_component(tmp_path) -> None:
+    c = component_drc_session()
+    session = DrcSession(c)
+    (result,) = session.run([rules[0]])
+    assert result.count == check_width(c, min_width=0.6, layer=(1, 0))
+
+    filepath = session.write_rdb([result], tmp_path / "drc.lyrdb")
+    assert filepath.exists()
+
+
+def test_drc_rule_validation() -> None:
+    with pytest.raises(ValueError):
+        DrcRule("inclusion", layer=(1, 0), value=0.1)
+    with pytest.raises(ValueError):
+        DrcRule("width", layer=(1, 0), value=0.1, metrics="Manhattan")
@@ -0,0 +1,26 @@
+from gdsfactory.samples.demo.lvs import pads_correct, pads_shorted
+
+from gplugins.klayout import get_netlist as get_netlist_module
+from gplugins.klayout.get_netlist import get_l2n, get_netlist
+
+
+def test_get_l2n_cache(tmp_path, monkeypatch) -> None:
+    gdspath = pads_correct().write_gds(gdsdir=tmp_path)
+    cache_dir = tmp_path / "l2n"
+
+    netlist = get_netlist(gdspath, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.l2n"))) == 1
+
+    def _extract_l2n(*args, **kwargs):
+        raise AssertionError("extraction should be read from the cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(get_netlist_module, "_extract_l2n", _extract_l2n)
+        cached_netlist = get_netlist(gdspath, cache_dir=cache_dir)
+    assert cached_netlist.to_s() == netlist.to_s()
+
+    # a different layout is a cache miss
+    gdspath = pads_shorted().write_gds(gdsdir=tmp_path)
+    l2n = get_l2n(gdspath, cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.l2n"))) == 2
+    assert l2n.netlist().to_s() != netlist.to_s()
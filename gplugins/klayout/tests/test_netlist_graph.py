@@ -0,0 +1,122 @@
+from itertools import combinations
+
+import klayout.db as kdb
+import networkx as nx
+import numpy as np
+import pytest
+
+from gplugins.klayout.netlist_graph import (
+    contract_degree_two_nodes,
+    netlist_to_networkx,
+    netlist_to_sparse,
+)
+
+
+def reduce_nodes_reference(G: nx.Graph, nodes_to_reduce: set[str]) -> nx.Graph:
+    """Node by node reduction previously done in `plot_nets`."""
+
+    def _removal_condition(node: str, degree: int) -> bool:
+        return degree == 2 and any(e in node for e in nodes_to_reduce)
+
+    while any(_removal_condition(node, degree) for node, degree in G.degree):
+        G_tmp = G.copy()
+        for node, degree in G.degree:
+            if _removal_condition(node, degree):
+                for pair in combinations([e[1] for e in G.edges(node)], r=2):
+                    G_tmp.add_edge(*pair)
+                G_tmp.remove_node(node)
+                break
+        G = G_tmp
+    return G
+
+
+def waveguide_chain(n: int, length: float = 10.0) -> nx.Graph:
+    """Two pads connected through `n` straight waveguides and nets."""
+    G = nx.Graph()
+    G.add_node("pad_0")
+    G.add_node(f"pad_{n}")
+    previous = "pad_0"
+    for i in range(n):
+        G.add_node(f"straight_{i}", length=length)
+        G.add_edge(previous, f"straight_{i}")
+        previous = f"straight_{i}"
+    G.add_edge(previous, f"pad_{n}")
+    return G
+
+
+def test_contract_chain_sums_length() -> None:
+    G = waveguide_chain(5)
+    G_reduced = contract_degree_two_nodes(G, nodes_to_reduce={"straight"})
+    assert list(G_reduced.edges(data=True)) == [("pad_0", "pad_5", {"length": 50})]
+    assert len(G) == 7, "input graph is not modified"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_contract_matches_reference(seed: int) -> None:
+    G = nx.relabel_nodes(
+        nx.gnm_random_graph(60, 70, seed=seed),
+        lambda i: f"straight_{i}" if i % 3 else f"net_{i}",
+    )
+    G_reduced = contract_degree_two_nodes(G, nodes_to_reduce={"straight"})
+    G_reference = reduce_nodes_reference(G, {"straight"})
+    assert set(G_reduced.nodes) == set(G_reference.nodes)
+    assert {frozenset(e) for e in G_reduced.edges} == {
+        frozenset(e) for e in G_reference.edges
+    }
+
+
+def test_contract_large_chain() -> None:
+    n = 100_000
+    G = contract_degree_two_nodes(waveguide_chain(n, length=1), {"straight"})
+    assert G.number_of_nodes() == 2
+    assert G.edges["pad_0", f"pad_{n}"]["length"] == n
+
+
+def random_netlist(n_devices: int = 50, n_nets: int = 20, seed: int = 0) -> kdb.Netlist:
+    """Flat netlist of two-terminal straights and three-terminal splitters."""
+    rng = np.random.default_rng(seed)
+    netlist = kdb.Netlist()
+
+    straight = kdb.DeviceClass()
+    straight.name = "straight"
+    splitter = kdb.DeviceClass()
+    splitter.name = "splitter"
+    for device_class, terminals in ((straight, 2), (splitter, 3)):
+        for i in range(terminals):
+            device_class.add_terminal(kdb.DeviceTerminalDefinition(f"o{i + 1}"))
+        netlist.add(device_class)
+    straight.add_parameter(kdb.DeviceParameterDefinition("length", "", 0.0))
+    splitter.add_parameter(kdb.DeviceParameterDefinition("ratio", "", 0.5))
+
+    circuit = kdb.Circuit()
+    circuit.name = "TOP"
+    netlist.add(circuit)
+    nets = [circuit.create_net(f"net{i}") for i in range(n_nets)]
+    for i in range(n_devices):
+        if i % 4:
+            device = circuit.create_device(straight, f"s{i}")
+            device.set_parameter("length", float(rng.integers(1, 100)))
+            terminals = ("o1", "o2")
+        else:
+            device = circuit.create_device(splitter, f"y{i}")
+            terminals = ("o1", "o2", "o3")
+        for terminal in terminals:
+            device.connect_terminal(terminal, nets[rng.integers(n_nets)])
+    return netlist
+
+
+@pytest.mark.parametrize("include_labels", [True, False])
+def test_netlist_to_sparse(include_labels: bool) -> None:
+    netlist = random_netlist()
+    G = netlist_to_networkx(netlist.dup(), include_labels=include_labels)
+    graph = netlist_to_sparse(netlist.dup(), include_labels=include_labels)
+
+    assert graph.n_devices == 50
+    assert (graph.adjacency != graph.adjacency.T).nnz == 0
+    assert np.nansum(graph.parameters["length"]) == sum(
+        data.get("length", 0) for _, data in G.nodes(data=True)
+    )
+
+    G_sparse = graph.to_networkx()
+    assert dict(G_sparse.nodes(data=True)) == dict(G.nodes(data=True))
+    assert {frozenset(e) for e in G_sparse.edges} == {frozenset(e) for e in G.edges}
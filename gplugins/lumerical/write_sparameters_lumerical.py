@@ -21,6 +21,10 @@ from gdsfactory.technology import LayerStack
 from gplugins.common.utils.get_sparameters_path import (
     get_sparameters_path_lumerical as get_sparameters_path,
 )
+from gplugins.common.utils.get_sparameters_path import (
+    load_sparameters,
+    save_sparameters,
+)
 
 if TYPE_CHECKING:
     from gdsfactory.typings import ComponentSpec, MaterialSpec, PathType
@@ -253,9 +257,10 @@ def write_sparameters_lumerical(
     filepath_fsp = filepath.with_suffix(".fsp")
     fspdir = filepath.parent / f"{filepath.stem}_s-parametersweep"
 
-    if run and filepath_npz.exists() and not overwrite:
+    sp = load_sparameters(filepath_npz) if run and not overwrite else None
+    if sp is not None:
         logger.info(f"Reading Sparameters from {filepath_npz.absolute()!r}")
-        return np.load(filepath_npz)
+        return sp
 
     if not run and session is None:
         print(run_false_warning)
@@ -469,7 +474,7 @@ def write_sparameters_lumerical(
         logger.info(f"wrote sparameters to {str(filepath)!r}")
 
         sp["wavelengths"] = sp.pop("lambda").flatten() * 1e6
-        np.savez_compressed(filepath, **sp)
+        save_sparameters(filepath_npz, sp, component=component.name, tool="lumerical")
 
         # keys = [key for key in sp.keys() if key.startswith("S")]
         # ra = {
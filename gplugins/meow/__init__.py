@@ -1,5 +1,16 @@
-from gplugins.meow.meow_eme import MEOW
+from typing import TYPE_CHECKING
 
-__all__ = [
-    "MEOW",
-]
+from gplugins.common.utils.lazy import attach
+
+__all__ = ["MEOW"]
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        "MEOW": "gplugins.meow.meow_eme:MEOW",
+    },
+    exports=__all__,
+)
+
+if TYPE_CHECKING:
+    from gplugins.meow.meow_eme import MEOW
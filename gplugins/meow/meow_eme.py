@@ -20,6 +20,10 @@ from tqdm.auto import tqdm
 from gplugins.common.utils.get_sparameters_path import (
     get_sparameters_path_meow as get_sparameters_path,
 )
+from gplugins.common.utils.get_sparameters_path import (
+    load_sparameters,
+    save_sparameters,
+)
 
 
 def list_unique_layer_stack_z(
@@ -407,23 +411,20 @@ class MEOW:
 
     def compute_sparameters(self) -> dict[str, np.ndarray]:
         """Returns Sparameters using EME."""
-        if self.filepath.exists():
-            if not self.overwrite:
-                logger.info(f"Simulation loaded from {self.filepath!r}")
-                sp = dict(np.load(self.filepath))
-
-                def rename(p):
-                    return p.replace("o1", "left").replace("o2", "right")
-
-                sdict = {
-                    tuple(rename(p) for p in k.split(",")): np.asarray(v)
-                    for k, v in sp.items()
-                }
-                S, self.port_map = sax.sdense(sdict)
-                self.S = np.asarray(S).view(np.ndarray)
-                return sp
-            else:
-                self.filepath.unlink()
+        sp = None if self.overwrite else load_sparameters(self.filepath)
+        if sp is not None:
+            logger.info(f"Simulation loaded from {self.filepath!r}")
+
+            def rename(p):
+                return p.replace("o1", "left").replace("o2", "right")
+
+            sdict = {
+                tuple(rename(p) for p in k.split(",")): np.asarray(v)
+                for k, v in sp.items()
+            }
+            S, self.port_map = sax.sdense(sdict)
+            self.S = np.asarray(S).view(np.ndarray)
+            return sp
 
         start = time.time()
 
@@ -440,7 +441,7 @@ class MEOW:
             f"{rename(p1)},{rename(p2)}": np.asarray(v) for (p1, p2), v in sdict.items()
         }
 
-        np.savez_compressed(self.filepath, **sp)
+        save_sparameters(self.filepath, sp, component=self.component.name, tool="meow")
 
         end = time.time()
 
@@ -1,6 +1,21 @@
 from __future__ import annotations
 
-from gplugins.sax import models, read
-from gplugins.sax.plot_model import plot_model
+from typing import TYPE_CHECKING
+
+from gplugins.common.utils.lazy import attach
 
 __all__ = ["models", "plot_model", "read"]
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        "models": "gplugins.sax.models",
+        "plot_model": "gplugins.sax.plot_model:plot_model",
+        "read": "gplugins.sax.read",
+    },
+    exports=__all__,
+)
+
+if TYPE_CHECKING:
+    from gplugins.sax import models, read
+    from gplugins.sax.plot_model import plot_model
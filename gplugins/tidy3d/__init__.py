@@ -1,18 +1,6 @@
-from gplugins.tidy3d import materials, modes
-from gplugins.tidy3d.component import (
-    Tidy3DComponent,
-    material_name_to_medium,
-    write_sparameters,
-    write_sparameters_batch,
-)
-from gplugins.tidy3d.get_simulation_grating_coupler import (
-    get_simulation_grating_coupler,
-)
-from gplugins.tidy3d.write_sparameters_grating_coupler import (
-    plot_simulation,
-    write_sparameters_grating_coupler,
-    write_sparameters_grating_coupler_batch,
-)
+from typing import TYPE_CHECKING
+
+from gplugins.common.utils.lazy import attach
 
 __all__ = [
     "Tidy3DComponent",
@@ -26,3 +14,37 @@ __all__ = [
     "write_sparameters_grating_coupler",
     "write_sparameters_grating_coupler_batch",
 ]
+
+__getattr__, __dir__ = attach(
+    __name__,
+    {
+        "Tidy3DComponent": "gplugins.tidy3d.component:Tidy3DComponent",
+        "get_simulation_grating_coupler": "gplugins.tidy3d.get_simulation_grating_coupler:get_simulation_grating_coupler",
+        "material_name_to_medium": "gplugins.tidy3d.component:material_name_to_medium",
+        "materials": "gplugins.tidy3d.materials",
+        "modes": "gplugins.tidy3d.modes",
+        "plot_simulation": "gplugins.tidy3d.write_sparameters_grating_coupler:plot_simulation",
+        "write_sparameters": "gplugins.tidy3d.component:write_sparameters",
+        "write_sparameters_batch": "gplugins.tidy3d.component:write_sparameters_batch",
+        "write_sparameters_grating_coupler": "gplugins.tidy3d.write_sparameters_grating_coupler:write_sparameters_grating_coupler",
+        "write_sparameters_grating_coupler_batch": "gplugins.tidy3d.write_sparameters_grating_coupler:write_sparameters_grating_coupler_batch",
+    },
+    exports=__all__,
+)
+
+if TYPE_CHECKING:
+    from gplugins.tidy3d import materials, modes
+    from gplugins.tidy3d.component import (
+        Tidy3DComponent,
+        material_name_to_medium,
+        write_sparameters,
+        write_sparameters_batch,
+    )
+    from gplugins.tidy3d.get_simulation_grating_coupler import (
+        get_simulation_grating_coupler,
+    )
+    from gplugins.tidy3d.write_sparameters_grating_coupler import (
+        plot_simulation,
+        write_sparameters_grating_coupler,
+        write_sparameters_grating_coupler_batch,
+    )
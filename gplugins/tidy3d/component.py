@@ -32,6 +32,8 @@ from tidy3d.components.types import Symmetry
 from tidy3d.plugins.smatrix import ComponentModeler, Port
 
 from gplugins.common.base_models.component import LayeredComponentBase
+from gplugins.common.utils.effective_index import get_effective_index_component
+from gplugins.common.utils.port_symmetries import get_symmetries
 from gplugins.tidy3d.get_results import _executor
 from gplugins.tidy3d.types import (
     Sparameters,
@@ -430,7 +432,7 @@ def write_sparameters(
     extra_monitors: tuple[Any, ...] | None = None,
     mode_spec: td.ModeSpec = td.ModeSpec(num_modes=1, filter_pol="te"),
     boundary_spec: td.BoundarySpec = td.BoundarySpec.all_sides(boundary=td.PML()),
-    symmetry: tuple[Symmetry, Symmetry, Symmetry] = (0, 0, 0),
+    symmetry: tuple[Symmetry, Symmetry, Symmetry] | str = (0, 0, 0),
     run_time: float = 1e-12,
     shutoff: float = 1e-5,
     folder_name: str = "default",
@@ -445,6 +447,7 @@ def write_sparameters(
     plot_epsilon: bool = False,
     filepath: PathType | None = None,
     overwrite: bool = False,
+    effective_index: bool = False,
     **kwargs: Any,
 ) -> Sparameters:
     """Writes the S-parameters for a component.
@@ -475,6 +478,10 @@ def write_sparameters(
         boundary_spec: The boundary specification for the ComponentModeler.
             Defaults to td.BoundarySpec.all_sides(boundary=td.PML()).
         symmetry (tuple[Symmetry, Symmetry, Symmetry], optional): The symmetry for the simulation. Defaults to (0,0,0).
+            "auto" detects the component symmetries and, unless given, sets run_only to the ports
+            needed, element_mappings to copy the equal S-parameters and the in-plane symmetry
+            for mirror planes that map every excited port to itself. With more than one
+            mode no symmetry is used, since higher order modes can be odd under a mirror.
         run_time: The run time for the ComponentModeler.
         shutoff: The shutoff value for the ComponentModeler. Defaults to 1e-5.
         folder_name: The folder name for the ComponentModeler in flexcompute website. Defaults to "default".
@@ -489,11 +496,61 @@ def write_sparameters(
         plot_epsilon: whether to plot epsilon. Defaults to False.
         filepath: Optional file path for the S-parameters. If None, uses hash of simulation.
         overwrite: Whether to overwrite existing S-parameters. Defaults to False.
+        effective_index: Whether to run a 2D simulation of the effective index reduction of the
+            component and layer stack, for fast first-pass S-parameters. Each region is replaced by
+            the slab mode index of its vertical profile at the center wavelength, with the slab
+            polarization of mode_spec.filter_pol ("te" unless it is "tm"). Defaults to False.
         kwargs: Additional keyword arguments for the tidy3d Simulation constructor.
 
     """
     layer_stack = layer_stack or get_layer_stack()
 
+    if effective_index:
+        clad = layer_stack.layers.get("clad")
+
+        def get_index(name: str, wavelength: float) -> float:
+            eps = material_mapping[name].eps_model(td.C_0 / wavelength)
+            return float(np.real(np.sqrt(eps)))
+
+        component, reduced_stack, neffs = get_effective_index_component(
+            component,
+            layer_stack=layer_stack,
+            get_index=get_index,
+            wavelength=wavelength,
+            clad_material=clad.material if clad else "sio2",
+            # the in-plane E of the 2D "te" mode is parallel to the film
+            polarization="tm" if mode_spec.filter_pol == "tm" else "te",
+        )
+        material_mapping = material_mapping | {
+            f"neff_{name}": td.Medium(name=f"neff_{name}", permittivity=neff**2)
+            for name, neff in neffs.items()
+        }
+        film = next(iter(reduced_stack.layers.values()))
+        if clad:
+            reduced_stack.layers["clad"] = clad.model_copy(
+                update=dict(
+                    zmin=film.zmin,
+                    thickness=film.thickness,
+                    mesh_order=len(reduced_stack.layers) + 1,
+                )
+            )
+        layer_stack = reduced_stack
+        center_z = film.zmin + film.thickness / 2
+        sim_size_z = 0
+
+    if symmetry == "auto" and mode_spec.num_modes > 1:
+        # higher order modes can be odd under a mirror
+        symmetry = (0, 0, 0)
+    elif symmetry == "auto":
+        detected = get_symmetries(component)
+        run_only = run_only or tuple((name, 0) for name in detected.port_source_names)
+        port_source_names = [name for name, _ in run_only]
+        # only copy S-parameters computed by the excitations that run
+        element_mappings = element_mappings or detected.get_tidy3d_element_mappings(
+            port_source_names
+        )
+        symmetry = detected.get_tidy3d_symmetry(port_source_names)
+
     c = Tidy3DComponent(
         component=component,
         layer_stack=layer_stack,
@@ -7,7 +7,6 @@ from collections.abc import Awaitable
 import gdsfactory as gf
 import matplotlib as mpl
 import matplotlib.pyplot as plt
-import numpy as np
 import tidy3d as td
 import yaml
 from gdsfactory import logger
@@ -23,6 +22,10 @@ from gdsfactory.typings import (
 from gplugins.common.utils.get_sparameters_path import (
     get_sparameters_path_tidy3d as get_sparameters_path,
 )
+from gplugins.common.utils.get_sparameters_path import (
+    load_sparameters,
+    save_sparameters,
+)
 from gplugins.tidy3d.get_results import _executor, get_results
 from gplugins.tidy3d.get_simulation_grating_coupler import (
     get_simulation_grating_coupler,
@@ -162,9 +165,10 @@ def write_sparameters_grating_coupler(
     filepath = pathlib.Path(filepath).with_suffix(".npz")
     filepath_sim_settings = filepath.with_suffix(".yml")
 
-    if filepath.exists() and not overwrite and run:
+    sp = load_sparameters(filepath) if not overwrite and run else None
+    if sp is not None:
         logger.info(f"Simulation loaded from {filepath!r}")
-        return dict(np.load(filepath))
+        return sp
 
     sim = get_simulation_grating_coupler(
         component,
@@ -220,7 +224,7 @@ def write_sparameters_grating_coupler(
     sp[key] = t
 
     end = time.time()
-    np.savez_compressed(filepath, **sp)
+    save_sparameters(filepath, sp, component=component.name, tool="tidy3d")
     kwargs.update(compute_time_seconds=end - start)
     kwargs.update(compute_time_minutes=(end - start) / 60)
 